@@ -1,576 +1,1116 @@
 #!/usr/bin/env python3
 """
 Simple SQL-based test data population script
+
+Runs in two phases: generate_all_data() draws every random value from one
+seeded numpy Generator and returns plain row lists (foreign keys are indexes
+into the users/exercises/workouts/groups lists), then load_all_data() writes
+them to PostgreSQL and resolves those indexes to the generated ids.
 """
 
+import numpy as np
 import psycopg2
-import random
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+import io
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 
 # Database connection
 DB_URL = "postgresql://wojciechkowalinski@localhost/workoutbuddy"
 
+# Seed for the data generator; the same seed and base time give the same data
+DEFAULT_SEED = 0
+
+# Rows per execute_values statement (the psycopg2 default is 100). PostgreSQL
+# caps a statement at 65535 bind parameters; 500 rows of the widest table here
+# (users, 16 columns) is 8000 values, well inside that even though
+# execute_values interpolates client-side, while keeping each statement's
+# parse/plan cost bounded. user_stats and workout_exercises use COPY instead.
+EXECUTE_VALUES_PAGE_SIZE = 500
+
+# Serialized once; every test exercise has no secondary muscles
+EMPTY_JSON_LIST = json.dumps([])
+
+# PostgreSQL binary COPY framing: signature, flags and header-extension length
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+PGCOPY_NULL = struct.pack(">i", -1)
+PG_EPOCH = datetime(2000, 1, 1)
+
+# Target tables in foreign-key order (parents before children)
+STAGED_TABLES = (
+    "users",
+    "exercises",
+    "challenges",
+    "privacy_settings",
+    "workouts",
+    "workout_exercises",
+    "friendships",
+    "user_goals",
+    "user_stats",
+    "user_reports",
+    "user_blocks",
+    "recommendation_feedback",
+    "accountability_checkins",
+    "community_groups",
+    "community_memberships",
+)
+
+# Every load goes into an UNLOGGED <table>_stage copy first (no WAL writes).
+# LIKE ... INCLUDING DEFAULTS keeps the serial id defaults, so staged rows
+# draw ids from the real tables' sequences, and foreign keys are not copied,
+# so they are only checked once, when the staged rows are published.
+SQL_DROP_STAGE = "DROP TABLE IF EXISTS {table}_stage"
+SQL_CREATE_STAGE = (
+    "CREATE UNLOGGED TABLE {table}_stage "
+    "(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+)
+SQL_PUBLISH_STAGE = (
+    "INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_stage"
+)
+# Generated columns cannot be inserted into, so publish only the plain ones
+SQL_INSERTABLE_COLUMNS = """
+SELECT column_name
+FROM information_schema.columns
+WHERE table_schema = current_schema() AND table_name = %s AND is_generated = 'NEVER'
+ORDER BY ordinal_position
+"""
+
+# SQL statements, kept in one place for review. VALUES %s is expanded by
+# execute_values; the *_TEMPLATE strings carry the per-row enum casts.
+SQL_INSERT_USERS = """
+INSERT INTO users_stage (email, username, hashed_password, full_name, is_active, is_verified,
+    age, height, weight, fitness_goal, experience_level, unit_system, height_unit, weight_unit, created_at, updated_at)
+VALUES %s
+RETURNING id
+"""
+USERS_TEMPLATE = (
+    "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::fitnessgoal, %s::experiencelevel, %s::unit_system, %s::height_unit, %s::weight_unit, %s, %s)"
+)
+
+SQL_INSERT_EXERCISES = """
+INSERT INTO exercises_stage (name, description, primary_muscle, equipment, exercise_type, difficulty, mets,
+    secondary_muscles, is_distance_based, is_time_based, instructions, tips)
+VALUES %s
+RETURNING id
+"""
+EXERCISES_TEMPLATE = (
+    "(%s, %s, %s::musclegroup, %s::equipment, %s::exercisetype, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+SQL_INSERT_CHALLENGES = """
+INSERT INTO challenges_stage (title, description, challenge_type, target_value, target_unit,
+    reward_points, is_public, start_date, end_date, status, created_by)
+VALUES %s
+"""
+CHALLENGES_TEMPLATE = (
+    "(%s, %s, %s::challengetype, %s, %s, %s, %s, %s, %s, %s::challengestatus, %s)"
+)
+
+SQL_INSERT_PRIVACY_SETTINGS = """
+INSERT INTO privacy_settings_stage (user_id, show_profile, show_workouts, show_stats, allow_friend_requests)
+VALUES %s
+"""
+
+SQL_INSERT_WORKOUTS = """
+INSERT INTO workouts_stage (user_id, name, description, scheduled_date, started_at, completed_at,
+    status, total_duration, calories_burned, notes)
+VALUES %s
+RETURNING id
+"""
+WORKOUTS_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s::workoutstatus, %s, %s, %s)"
+
+SQL_COPY_WORKOUT_EXERCISES = """
+COPY workout_exercises_stage (workout_id, exercise_id, "order", sets, reps,
+    weight, rest_time, actual_reps, actual_weight,
+    weight_unit, distance_unit, notes)
+FROM STDIN
+"""
+
+SQL_INSERT_FRIENDSHIPS = """
+INSERT INTO friendships_stage (user_id, friend_id, is_accepted, accepted_at)
+VALUES %s
+"""
+
+SQL_INSERT_USER_GOALS = """
+INSERT INTO user_goals_stage (user_id, goal_type, target_value, current_value, target_date, is_achieved, achieved_at)
+VALUES %s
+"""
+
+SQL_COPY_USER_STATS = """
+COPY user_stats_stage (user_id, date, weight, body_fat_percentage, muscle_mass,
+    total_workouts, total_weight_lifted, total_cardio_distance,
+    total_calories_burned, weight_unit, distance_unit, personal_records)
+FROM STDIN WITH (FORMAT BINARY)
+"""
+
+SQL_INSERT_USER_REPORTS = """
+INSERT INTO user_reports_stage (reporter_id, reported_id, reason, description, created_at, resolved)
+VALUES %s
+"""
+USER_REPORTS_TEMPLATE = "(%s, %s, %s::reportreasonenum, %s, %s, %s)"
+
+SQL_INSERT_USER_BLOCKS = """
+INSERT INTO user_blocks_stage (blocker_id, blocked_id, created_at)
+VALUES %s
+"""
+
+SQL_INSERT_RECOMMENDATION_FEEDBACK = """
+INSERT INTO recommendation_feedback_stage (user_id, recommendation_id, feedback, rating, created_at)
+VALUES %s
+"""
+
+SQL_INSERT_ACCOUNTABILITY_CHECKINS = """
+INSERT INTO accountability_checkins_stage (user_id, date, note, completed)
+VALUES %s
+"""
+
+SQL_INSERT_COMMUNITY_GROUPS = """
+INSERT INTO community_groups_stage (name, description, created_at)
+VALUES %s
+RETURNING id
+"""
+
+SQL_INSERT_COMMUNITY_MEMBERSHIPS = """
+INSERT INTO community_memberships_stage (user_id, group_id, joined_at, is_admin)
+VALUES %s
+"""
+
+# (email, username, full_name, age, height, weight, fitness_goal,
+#  experience_level, unit_system, height_unit, weight_unit)
+TEST_USERS = [
+    (
+        "test_new_user@example.com",
+        "test_fitness_newbie",
+        "Alex Johnson",
+        24,
+        170.0,
+        75.0,
+        "GENERAL_FITNESS",
+        "BEGINNER",
+        "METRIC",
+        "CM",
+        "KG",
+    ),
+    (
+        "test_active_user@example.com",
+        "test_workout_warrior",
+        "Sarah Chen",
+        28,
+        165.0,
+        62.0,
+        "WEIGHT_LOSS",
+        "INTERMEDIATE",
+        "METRIC",
+        "CM",
+        "KG",
+    ),
+    (
+        "test_social_user@example.com",
+        "test_gym_buddy",
+        "Mike Rodriguez",
+        32,
+        180.0,
+        85.0,
+        "STRENGTH",
+        "ADVANCED",
+        "IMPERIAL",
+        "FEET_INCHES",
+        "LBS",
+    ),
+    (
+        "test_premium_user@example.com",
+        "test_fitness_pro",
+        "Emma Thompson",
+        26,
+        168.0,
+        58.0,
+        "ATHLETIC_PERFORMANCE",
+        "EXPERT",
+        "METRIC",
+        "CM",
+        "KG",
+    ),
+    (
+        "test_retention_user@example.com",
+        "test_consistent_fit",
+        "David Kim",
+        35,
+        175.0,
+        78.0,
+        "ENDURANCE",
+        "INTERMEDIATE",
+        "METRIC",
+        "CM",
+        "KG",
+    ),
+    (
+        "test_safety_user@example.com",
+        "test_private_fit",
+        "Lisa Park",
+        29,
+        162.0,
+        55.0,
+        "MUSCLE_GAIN",
+        "BEGINNER",
+        "METRIC",
+        "CM",
+        "KG",
+    ),
+]
+
+# (name, description, primary_muscle, equipment, exercise_type, difficulty, mets)
+TEST_EXERCISES = [
+    (
+        "test_barbell_bench_press",
+        "Classic chest exercise",
+        "CHEST",
+        "BARBELL",
+        "STRENGTH",
+        3,
+        5.0,
+    ),
+    (
+        "test_squat",
+        "Fundamental leg exercise",
+        "LEGS",
+        "BARBELL",
+        "STRENGTH",
+        3,
+        6.0,
+    ),
+    (
+        "test_deadlift",
+        "Full body strength exercise",
+        "BACK",
+        "BARBELL",
+        "STRENGTH",
+        4,
+        7.0,
+    ),
+    (
+        "test_dumbbell_curl",
+        "Bicep isolation exercise",
+        "BICEPS",
+        "DUMBBELL",
+        "STRENGTH",
+        1,
+        3.0,
+    ),
+    (
+        "test_push_up",
+        "Bodyweight chest exercise",
+        "CHEST",
+        "BODYWEIGHT",
+        "STRENGTH",
+        2,
+        4.0,
+    ),
+    (
+        "test_running",
+        "Cardiovascular exercise",
+        "CARDIO",
+        "NONE",
+        "CARDIO",
+        2,
+        8.0,
+    ),
+    (
+        "test_cycling",
+        "Low-impact cardio",
+        "CARDIO",
+        "CARDIO_MACHINE",
+        "CARDIO",
+        1,
+        6.0,
+    ),
+    (
+        "test_stretching",
+        "General flexibility",
+        "CORE",
+        "NONE",
+        "FLEXIBILITY",
+        1,
+        2.0,
+    ),
+]
+
+# (title, description, challenge_type, target_value, target_unit,
+#  reward_points, is_public)
+TEST_CHALLENGES = [
+    (
+        "test_30_day_pushup_challenge",
+        "Complete 30 days of pushups",
+        "WORKOUT",
+        30,
+        "days",
+        500,
+        True,
+    ),
+    (
+        "test_5k_running_challenge",
+        "Run 5km in under 25 minutes",
+        "WORKOUT",
+        5.0,
+        "km",
+        300,
+        True,
+    ),
+    (
+        "test_weight_loss_challenge",
+        "Lose 5kg in 8 weeks",
+        "NUTRITION",
+        5.0,
+        "kg",
+        800,
+        False,
+    ),
+]
+
+# Friendships as (user index, friend index) into TEST_USERS
+TEST_FRIENDSHIPS = [
+    (0, 1),  # newbie -> warrior
+    (1, 2),  # warrior -> buddy
+    (2, 3),  # buddy -> pro
+    (3, 4),  # pro -> consistent
+]
+
+TEST_GOALS = [
+    ("test_bench_press_max", 100.0, "kg"),
+    ("test_squat_max", 150.0, "kg"),
+    ("test_5k_time", 25.0, "minutes"),
+    ("test_weight_loss", 5.0, "kg"),
+]
+
+REPORT_REASONS = ["SPAM", "ABUSE", "HARASSMENT", "OTHER"]
+
+FEEDBACK_MESSAGES = [
+    "Great recommendation, really helped with my workout!",
+    "This exercise was too difficult for my level",
+    "Perfect difficulty and equipment availability",
+]
+
+CHECKIN_MESSAGES = [
+    "Feeling motivated today!",
+    "Had a great workout session",
+    "Struggling with consistency this week",
+]
+
+TEST_GROUPS = [
+    ("test_beginner_fitness", "Support group for fitness beginners"),
+    ("test_strength_training", "Advanced strength training community"),
+    ("test_running_club", "Running and endurance training group"),
+]
+
 
 def hash_password(password: str) -> str:
     """Simple password hash for testing"""
     return f"$2b$12$test_hash_{password}"
 
 
-def populate_test_data():
-    """Populate database with test data using direct SQL"""
+def pg_int4(value):
+    return struct.pack(">ii", 4, value)
 
-    conn = psycopg2.connect(DB_URL)
-    cur = conn.cursor()
 
-    try:
-        # Create test users
-        test_users = [
-            (
-                "test_new_user@example.com",
-                "test_fitness_newbie",
-                "Alex Johnson",
-                24,
-                170.0,
-                75.0,
-                "GENERAL_FITNESS",
-                "BEGINNER",
-                "METRIC",
-                "CM",
-                "KG",
-            ),
-            (
-                "test_active_user@example.com",
-                "test_workout_warrior",
-                "Sarah Chen",
-                28,
-                165.0,
-                62.0,
-                "WEIGHT_LOSS",
-                "INTERMEDIATE",
-                "METRIC",
-                "CM",
-                "KG",
-            ),
-            (
-                "test_social_user@example.com",
-                "test_gym_buddy",
-                "Mike Rodriguez",
-                32,
-                180.0,
-                85.0,
-                "STRENGTH",
-                "ADVANCED",
-                "IMPERIAL",
-                "FEET_INCHES",
-                "LBS",
-            ),
-            (
-                "test_premium_user@example.com",
-                "test_fitness_pro",
-                "Emma Thompson",
-                26,
-                168.0,
-                58.0,
-                "ATHLETIC_PERFORMANCE",
-                "EXPERT",
-                "METRIC",
-                "CM",
-                "KG",
-            ),
-            (
-                "test_retention_user@example.com",
-                "test_consistent_fit",
-                "David Kim",
-                35,
-                175.0,
-                78.0,
-                "ENDURANCE",
-                "INTERMEDIATE",
-                "METRIC",
-                "CM",
-                "KG",
-            ),
+def pg_float8(value):
+    return struct.pack(">id", 8, value)
+
+
+def pg_timestamp(value):
+    """Encode a naive datetime as microseconds since the PostgreSQL epoch"""
+    delta = value - PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack(">iq", 8, micros)
+
+
+def pg_text(value):
+    """Encode text (also accepted by enum columns) as length-prefixed UTF-8"""
+    data = value.encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+
+# Column encoders for the user_stats COPY, in COPY column order
+USER_STATS_COPY_ENCODERS = (
+    pg_int4,  # user_id
+    pg_timestamp,  # date
+    pg_float8,  # weight
+    pg_float8,  # body_fat_percentage
+    pg_float8,  # muscle_mass
+    pg_int4,  # total_workouts
+    pg_float8,  # total_weight_lifted
+    pg_float8,  # total_cardio_distance
+    pg_float8,  # total_calories_burned
+    pg_text,  # weight_unit
+    pg_text,  # distance_unit
+    pg_text,  # personal_records
+)
+
+
+def copy_text_field(value):
+    """Render one value in COPY text format, escaping the delimiter characters"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def text_copy_buffer(rows):
+    """Build a tab-separated buffer for COPY ... FROM STDIN (text format)"""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(copy_text_field(value) for value in row))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+def binary_copy_buffer(rows, encoders):
+    """Pack rows into a buffer for COPY ... FROM STDIN WITH (FORMAT BINARY)"""
+    buf = io.BytesIO()
+    buf.write(PGCOPY_HEADER)
+    field_count = struct.pack(">h", len(encoders))
+    for row in rows:
+        buf.write(field_count)
+        for encode, value in zip(encoders, row):
+            buf.write(PGCOPY_NULL if value is None else encode(value))
+    buf.write(PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+def sample_distinct_pairs(rng, n, count):
+    """Draw `count` index pairs (a, b) from range(n) with a != b in vectorized passes"""
+    idx = rng.integers(0, n, size=(count, 2))
+    same = idx[:, 0] == idx[:, 1]
+    while same.any():
+        idx[same] = rng.integers(0, n, size=(int(same.sum()), 2))
+        same = idx[:, 0] == idx[:, 1]
+    return [(int(a), int(b)) for a, b in idx]
+
+
+def days_before(now, days):
+    """Map an array of day offsets to datetimes before `now`"""
+    return [now - timedelta(days=int(d)) for d in days]
+
+
+def generate_all_data(seed=DEFAULT_SEED, now=None):
+    """Generate every test row without touching the database
+
+    All randomness comes from one numpy Generator seeded with `seed`, and all
+    dates are offsets from `now`, so the output is reproducible. Foreign keys
+    are stored as list indexes (`user_idx`, `exercise_idx`, `workout_idx`,
+    `group_idx`) and resolved to database ids by load_all_data().
+    """
+    rng = np.random.default_rng(seed)
+    if now is None:
+        now = datetime.now()
+    n_users = len(TEST_USERS)
+    data = {"now": now}
+
+    # users: (email, username, hashed_password, full_name, is_active,
+    #         is_verified, age, height, weight, fitness_goal, experience_level,
+    #         unit_system, height_unit, weight_unit, created_at, updated_at)
+    data["users"] = [
+        (
+            user[0],
+            user[1],
+            hash_password("testpassword123"),
+            user[2],
+            True,
+            True,
+            *user[3:],
+            now,
+            now,
+        )
+        for user in TEST_USERS
+    ]
+
+    # exercises: (name, description, primary_muscle, equipment, exercise_type,
+    #             difficulty, mets, secondary_muscles, is_distance_based,
+    #             is_time_based, instructions, tips)
+    data["exercises"] = [
+        (
+            *exercise,
+            EMPTY_JSON_LIST,
+            False,
+            False,
+            f"Test instructions for {exercise[0]}",
+            f"Test tips for {exercise[0]}",
+        )
+        for exercise in TEST_EXERCISES
+    ]
+
+    # challenges: (... TEST_CHALLENGES fields, start_date, end_date, status,
+    #              creator user_idx)
+    n_challenges = len(TEST_CHALLENGES)
+    start_offsets = rng.integers(1, 31, size=n_challenges)
+    lengths = rng.integers(7, 61, size=n_challenges)
+    creators = rng.integers(0, n_users, size=n_challenges)
+    data["challenges"] = []
+    for challenge, start_date, length, creator in zip(
+        TEST_CHALLENGES, days_before(now, start_offsets), lengths, creators
+    ):
+        end_date = start_date + timedelta(days=int(length))
+        data["challenges"].append(
+            (*challenge, start_date, end_date, "ACTIVE", int(creator))
+        )
+
+    # privacy_settings: (user_idx, show_profile, show_workouts, show_stats,
+    #                    allow_friend_requests)
+    data["privacy_settings"] = [
+        (user_idx, True, True, True, True) for user_idx in range(n_users)
+    ]
+
+    # workouts: 2-5 per user
+    # (user_idx, name, description, scheduled_date, started_at, completed_at,
+    #  status, total_duration, calories_burned)
+    workouts_per_user = rng.integers(2, 6, size=n_users)
+    n_workouts = int(workouts_per_user.sum())
+    workout_users = np.repeat(np.arange(n_users), workouts_per_user)
+    workout_seq = np.concatenate([np.arange(k) for k in workouts_per_user])
+    workout_days_ago = rng.integers(1, 31, size=n_workouts)
+    start_hours = rng.integers(6, 21, size=n_workouts)
+    durations = rng.integers(45, 91, size=n_workouts)
+    calories = rng.integers(200, 601, size=n_workouts)
+    data["workouts"] = []
+    for user_idx, i, workout_date, hour, minutes, kcal in zip(
+        workout_users.tolist(),
+        workout_seq.tolist(),
+        days_before(now, workout_days_ago),
+        start_hours.tolist(),
+        durations.tolist(),
+        calories.tolist(),
+    ):
+        started_at = workout_date.replace(hour=hour)
+        completed_at = started_at + timedelta(minutes=minutes)
+        data["workouts"].append(
             (
-                "test_safety_user@example.com",
-                "test_private_fit",
-                "Lisa Park",
-                29,
-                162.0,
-                55.0,
-                "MUSCLE_GAIN",
-                "BEGINNER",
-                "METRIC",
-                "CM",
-                "KG",
-            ),
-        ]
+                user_idx,
+                f"Test Workout {i+1}",
+                f"Test workout description {i+1}",
+                workout_date,
+                started_at,
+                completed_at,
+                "COMPLETED",
+                minutes,
+                kcal,
+            )
+        )
 
-        print("Creating test users...")
-        user_ids = []
-        for user_data in test_users:
-            cur.execute(
-                """
-                INSERT INTO users (email, username, hashed_password, full_name, is_active, is_verified, 
-                                 age, height, weight, fitness_goal, experience_level, unit_system, height_unit, weight_unit, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::fitnessgoal, %s::experiencelevel, %s::unit_system, %s::height_unit, %s::weight_unit, %s, %s)
-                RETURNING id
-            """,
-                (
-                    user_data[0],
-                    user_data[1],
-                    hash_password("testpassword123"),
-                    user_data[2],
-                    True,
-                    True,
-                    user_data[3],
-                    user_data[4],
-                    user_data[5],
-                    user_data[6],
-                    user_data[7],
-                    user_data[8],
-                    user_data[9],
-                    user_data[10],
-                    datetime.now(),
-                    datetime.now(),
-                ),
+    # workout_exercises: 2-3 distinct exercises per workout
+    # (workout_idx, exercise_idx, order, sets, reps, weight, rest_time,
+    #  actual_reps, actual_weight, weight_unit, distance_unit, notes)
+    exercises_per_workout = rng.integers(2, 4, size=n_workouts)
+    n_workout_exercises = int(exercises_per_workout.sum())
+    sets = rng.integers(2, 5, size=n_workout_exercises).tolist()
+    reps = rng.integers(8, 16, size=n_workout_exercises).tolist()
+    weights = rng.integers(20, 101, size=n_workout_exercises).tolist()
+    rests = rng.integers(60, 181, size=n_workout_exercises).tolist()
+    actual_reps = rng.integers(8, 16, size=n_workout_exercises).tolist()
+    actual_weights = rng.integers(20, 101, size=n_workout_exercises).tolist()
+    # One vectorized draw without replacement for every workout: argsort of a
+    # (workouts x exercises) uniform matrix gives an independent random
+    # permutation per row, and each row keeps its first k entries.
+    n_exercises = len(TEST_EXERCISES)
+    exercises_per_workout = np.minimum(exercises_per_workout, n_exercises)
+    max_k = int(exercises_per_workout.max())
+    shuffled = np.argsort(rng.random((n_workouts, n_exercises)), axis=1)[:, :max_k]
+    keep = np.arange(max_k) < exercises_per_workout[:, None]
+    workout_idx_col = np.broadcast_to(np.arange(n_workouts)[:, None], keep.shape)[keep]
+    exercise_idx_col = shuffled[keep]
+    order_col = np.broadcast_to(np.arange(1, max_k + 1), keep.shape)[keep]
+    data["workout_exercises"] = [
+        (
+            workout_idx,
+            exercise_idx,
+            order,
+            sets[row],
+            f"{reps[row]}",
+            f"{weights[row]}",
+            rests[row],
+            f"{actual_reps[row]}",
+            f"{actual_weights[row]}",
+            "KG",
+            "KM",
+            f"Test exercise {order}",
+        )
+        for row, (workout_idx, exercise_idx, order) in enumerate(
+            zip(
+                workout_idx_col.tolist(),
+                exercise_idx_col.tolist(),
+                order_col.tolist(),
             )
-            user_id = cur.fetchone()[0]
-            user_ids.append(user_id)
-            print(f"Created user: {user_data[1]} (ID: {user_id})")
+        )
+    ]
 
-        # Create test exercises
-        print("\nCreating test exercises...")
-        exercise_data = [
-            (
-                "test_barbell_bench_press",
-                "Classic chest exercise",
-                "CHEST",
-                "BARBELL",
-                "STRENGTH",
-                3,
-                5.0,
-            ),
-            (
-                "test_squat",
-                "Fundamental leg exercise",
-                "LEGS",
-                "BARBELL",
-                "STRENGTH",
-                3,
-                6.0,
-            ),
-            (
-                "test_deadlift",
-                "Full body strength exercise",
-                "BACK",
-                "BARBELL",
-                "STRENGTH",
-                4,
-                7.0,
-            ),
-            (
-                "test_dumbbell_curl",
-                "Bicep isolation exercise",
-                "BICEPS",
-                "DUMBBELL",
-                "STRENGTH",
-                1,
-                3.0,
-            ),
-            (
-                "test_push_up",
-                "Bodyweight chest exercise",
-                "CHEST",
-                "BODYWEIGHT",
-                "STRENGTH",
-                2,
-                4.0,
-            ),
-            (
-                "test_running",
-                "Cardiovascular exercise",
-                "CARDIO",
-                "NONE",
-                "CARDIO",
-                2,
-                8.0,
-            ),
-            (
-                "test_cycling",
-                "Low-impact cardio",
-                "CARDIO",
-                "CARDIO_MACHINE",
-                "CARDIO",
-                1,
-                6.0,
-            ),
-            (
-                "test_stretching",
-                "General flexibility",
-                "CORE",
-                "NONE",
-                "FLEXIBILITY",
-                1,
-                2.0,
-            ),
-        ]
+    # friendships: (user_idx, friend user_idx, is_accepted, accepted_at)
+    accepted_days_ago = rng.integers(1, 31, size=len(TEST_FRIENDSHIPS))
+    data["friendships"] = [
+        (user_idx, friend_idx, True, accepted_at)
+        for (user_idx, friend_idx), accepted_at in zip(
+            TEST_FRIENDSHIPS, days_before(now, accepted_days_ago)
+        )
+    ]
 
-        exercise_ids = []
-        for exercise in exercise_data:
-            cur.execute(
-                """
-                INSERT INTO exercises (name, description, primary_muscle, equipment, exercise_type, difficulty, mets, 
-                                     secondary_muscles, is_distance_based, is_time_based, instructions, tips)
-                VALUES (%s, %s, %s::musclegroup, %s::equipment, %s::exercisetype, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """,
+    # user_goals: 1-2 per user
+    # (user_idx, goal_type, target_value, current_value, target_date,
+    #  is_achieved, achieved_at)
+    data["goals"] = []
+    for user_idx, num_goals in enumerate(rng.integers(1, 3, size=n_users).tolist()):
+        selected = rng.choice(
+            len(TEST_GOALS), size=min(num_goals, len(TEST_GOALS)), replace=False
+        )
+        for goal_idx in selected.tolist():
+            goal = TEST_GOALS[goal_idx]
+            target_date = now + timedelta(days=int(rng.integers(30, 181)))
+            current_value = goal[1] * float(rng.uniform(0.3, 0.8))
+            is_achieved = bool(rng.random() < 0.2)
+            achieved_at = (
+                now - timedelta(days=int(rng.integers(1, 31)))
+                if is_achieved
+                else None
+            )
+            data["goals"].append(
                 (
-                    exercise[0],
-                    exercise[1],
-                    exercise[2],
-                    exercise[3],
-                    exercise[4],
-                    exercise[5],
-                    exercise[6],
-                    json.dumps([]),
-                    False,
-                    False,
-                    f"Test instructions for {exercise[0]}",
-                    f"Test tips for {exercise[0]}",
-                ),
+                    user_idx,
+                    goal[0],
+                    goal[1],
+                    current_value,
+                    target_date,
+                    is_achieved,
+                    achieved_at,
+                )
             )
-            exercise_id = cur.fetchone()[0]
-            exercise_ids.append(exercise_id)
-            print(f"Created exercise: {exercise[0]} (ID: {exercise_id})")
 
-        # Create test workouts
-        print("\nCreating test workouts...")
-        workout_count = 0
-        for user_id in user_ids:
-            # Create 2-5 workouts per user
-            num_workouts = random.randint(2, 5)
-            for i in range(num_workouts):
-                days_ago = random.randint(1, 30)
-                workout_date = datetime.now() - timedelta(days=days_ago)
-                started_at = workout_date.replace(hour=random.randint(6, 20))
-                completed_at = started_at + timedelta(minutes=random.randint(45, 90))
-
-                cur.execute(
-                    """
-                    INSERT INTO workouts (user_id, name, description, scheduled_date, started_at, completed_at, 
-                                        status, total_duration, calories_burned, notes)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s::workoutstatus, %s, %s, %s)
-                    RETURNING id
-                """,
-                    (
-                        user_id,
-                        f"Test Workout {i+1}",
-                        f"Test workout description {i+1}",
-                        workout_date,
-                        started_at,
-                        completed_at,
-                        "COMPLETED",
-                        (completed_at - started_at).seconds // 60,
-                        random.randint(200, 600),
-                        f"Test workout for user {user_id}",
-                    ),
-                )
-                workout_id = cur.fetchone()[0]
-                workout_count += 1
+    # user_stats: last 7 days, 70% chance per day
+    # (user_idx, date, weight, body_fat_percentage, muscle_mass, total_workouts,
+    #  total_weight_lifted, total_cardio_distance, total_calories_burned,
+    #  weight_unit, distance_unit, personal_records)
+    # One Bernoulli draw per (user, day) slot; only the kept slots get values
+    stat_days = np.tile(np.arange(7, 0, -1), n_users)
+    stat_users = np.repeat(np.arange(n_users), 7)
+    stat_mask = rng.random(stat_users.size) < 0.7  # 70% chance of having stats
+    n_stats = int(stat_mask.sum())
+    stat_weights = 70.0 + rng.uniform(-2.0, 2.0, size=n_stats)
+    data["user_stats"] = [
+        (
+            user_idx,
+            now - timedelta(days=days_ago),
+            weight,
+            body_fat,
+            weight * muscle_ratio,
+            total_workouts,
+            float(lifted),
+            distance,
+            float(kcal),
+            "KG",
+            "KM",
+            json.dumps({"test_bench_press": bench_press}),
+        )
+        for (
+            user_idx,
+            days_ago,
+            weight,
+            body_fat,
+            muscle_ratio,
+            total_workouts,
+            lifted,
+            distance,
+            kcal,
+            bench_press,
+        ) in zip(
+            stat_users[stat_mask].tolist(),
+            stat_days[stat_mask].tolist(),
+            stat_weights.tolist(),
+            rng.uniform(10.0, 25.0, size=n_stats).tolist(),
+            rng.uniform(0.3, 0.5, size=n_stats).tolist(),
+            rng.integers(0, 4, size=n_stats).tolist(),
+            rng.integers(0, 2001, size=n_stats).tolist(),
+            rng.uniform(0, 10.0, size=n_stats).tolist(),
+            rng.integers(100, 801, size=n_stats).tolist(),
+            rng.integers(40, 121, size=n_stats).tolist(),
+        )
+    ]
 
-                # Add 2-3 exercises to each workout
-                num_exercises = random.randint(2, 3)
-                selected_exercises = random.sample(
-                    exercise_ids, min(num_exercises, len(exercise_ids))
+    # user_reports: (reporter user_idx, reported user_idx, reason, description,
+    #                created_at, resolved)
+    report_pairs = sample_distinct_pairs(rng, n_users, 2)
+    reasons = rng.integers(0, len(REPORT_REASONS), size=len(report_pairs))
+    reported_days_ago = rng.integers(1, 31, size=len(report_pairs))
+    resolved = rng.random(len(report_pairs)) < 0.5
+    data["reports"] = [
+        (
+            reporter_idx,
+            reported_idx,
+            REPORT_REASONS[reason],
+            f"Test report {i+1}",
+            created_at,
+            is_resolved,
+        )
+        for i, ((reporter_idx, reported_idx), reason, created_at, is_resolved) in (
+            enumerate(
+                zip(
+                    report_pairs,
+                    reasons.tolist(),
+                    days_before(now, reported_days_ago),
+                    resolved.tolist(),
                 )
+            )
+        )
+    ]
 
-                for j, exercise_id in enumerate(selected_exercises):
-                    cur.execute(
-                        """
-                        INSERT INTO workout_exercises (workout_id, exercise_id, "order", sets, reps, 
-                                                     weight, rest_time, actual_reps, actual_weight, 
-                                                     weight_unit, distance_unit, notes)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::weight_unit, %s::distance_unit, %s)
-                    """,
-                        (
-                            workout_id,
-                            exercise_id,
-                            j + 1,
-                            random.randint(2, 4),
-                            f"{random.randint(8, 15)}",
-                            f"{random.randint(20, 100)}",
-                            random.randint(60, 180),
-                            f"{random.randint(8, 15)}",
-                            f"{random.randint(20, 100)}",
-                            "KG",
-                            "KM",
-                            f"Test exercise {j+1}",
-                        ),
-                    )
-
-        print(f"Created {workout_count} test workouts")
-
-        # Create test challenges
-        print("\nCreating test challenges...")
-        challenge_data = [
-            (
-                "test_30_day_pushup_challenge",
-                "Complete 30 days of pushups",
-                "WORKOUT",
-                30,
-                "days",
-                500,
-                True,
-            ),
-            (
-                "test_5k_running_challenge",
-                "Run 5km in under 25 minutes",
-                "WORKOUT",
-                5.0,
-                "km",
-                300,
-                True,
-            ),
-            (
-                "test_weight_loss_challenge",
-                "Lose 5kg in 8 weeks",
-                "NUTRITION",
-                5.0,
-                "kg",
-                800,
-                False,
-            ),
-        ]
+    # user_blocks: (blocker user_idx, blocked user_idx, created_at)
+    block_pairs = sample_distinct_pairs(rng, n_users, 1)
+    blocked_days_ago = rng.integers(1, 61, size=len(block_pairs))
+    data["blocks"] = [
+        (blocker_idx, blocked_idx, created_at)
+        for (blocker_idx, blocked_idx), created_at in zip(
+            block_pairs, days_before(now, blocked_days_ago)
+        )
+    ]
 
-        for challenge in challenge_data:
-            start_date = datetime.now() - timedelta(days=random.randint(1, 30))
-            end_date = start_date + timedelta(days=random.randint(7, 60))
+    # recommendation_feedback: 1-3 per user
+    # (user_idx, sequence number, feedback, rating, created_at)
+    feedback_per_user = rng.integers(1, 4, size=n_users)
+    n_feedback = int(feedback_per_user.sum())
+    feedback_users = np.repeat(np.arange(n_users), feedback_per_user)
+    feedback_seq = np.concatenate([np.arange(k) for k in feedback_per_user])
+    messages = rng.integers(0, len(FEEDBACK_MESSAGES), size=n_feedback)
+    ratings = rng.uniform(1.0, 5.0, size=n_feedback)
+    feedback_days_ago = rng.integers(1, 91, size=n_feedback)
+    data["feedback"] = [
+        (user_idx, i, FEEDBACK_MESSAGES[message], rating, created_at)
+        for user_idx, i, message, rating, created_at in zip(
+            feedback_users.tolist(),
+            feedback_seq.tolist(),
+            messages.tolist(),
+            ratings.tolist(),
+            days_before(now, feedback_days_ago),
+        )
+    ]
 
-            cur.execute(
-                """
-                INSERT INTO challenges (title, description, challenge_type, target_value, target_unit,
-                                      reward_points, is_public, start_date, end_date, status, created_by)
-                VALUES (%s, %s, %s::challengetype, %s, %s, %s, %s, %s, %s, %s::challengestatus, %s)
-            """,
+    # accountability_checkins: last 7 days, 40% chance per day
+    # (user_idx, date, note, completed)
+    checkin_days = np.tile(np.arange(7, 0, -1), n_users)
+    checkin_users = np.repeat(np.arange(n_users), 7)
+    checkin_mask = rng.random(checkin_users.size) < 0.4  # 40% chance of check-in
+    n_checkins = int(checkin_mask.sum())
+    data["checkins"] = [
+        (
+            user_idx,
+            now - timedelta(days=days_ago),
+            CHECKIN_MESSAGES[message],
+            completed,
+        )
+        for user_idx, days_ago, message, completed in zip(
+            checkin_users[checkin_mask].tolist(),
+            checkin_days[checkin_mask].tolist(),
+            rng.integers(0, len(CHECKIN_MESSAGES), size=n_checkins).tolist(),
+            (rng.random(n_checkins) < 0.5).tolist(),
+        )
+    ]
+
+    # community_groups: (name, description, created_at)
+    group_days_ago = rng.integers(1, 366, size=len(TEST_GROUPS))
+    data["groups"] = [
+        (*group, created_at)
+        for group, created_at in zip(TEST_GROUPS, days_before(now, group_days_ago))
+    ]
+
+    # community_memberships: each user joins 1-2 groups
+    # (user_idx, group_idx, joined_at, is_admin)
+    data["memberships"] = []
+    for user_idx, num_groups in enumerate(rng.integers(1, 3, size=n_users).tolist()):
+        selected = rng.choice(
+            len(TEST_GROUPS), size=min(num_groups, len(TEST_GROUPS)), replace=False
+        )
+        for group_idx in selected.tolist():
+            data["memberships"].append(
                 (
-                    challenge[0],
-                    challenge[1],
-                    challenge[2],
-                    challenge[3],
-                    challenge[4],
-                    challenge[5],
-                    challenge[6],
-                    start_date,
-                    end_date,
-                    "ACTIVE",
-                    random.choice(user_ids),
-                ),
+                    user_idx,
+                    group_idx,
+                    now - timedelta(days=int(rng.integers(1, 181))),
+                    bool(rng.random() < 0.1),  # 10% chance of being admin
+                )
             )
 
-        print("Created 3 test challenges")
+    return data
 
-        # Create test friendships
-        print("\nCreating test friendships...")
-        friendship_pairs = [
-            (user_ids[0], user_ids[1]),  # newbie -> warrior
-            (user_ids[1], user_ids[2]),  # warrior -> buddy
-            (user_ids[2], user_ids[3]),  # buddy -> pro
-            (user_ids[3], user_ids[4]),  # pro -> consistent
+
+def load_exercises(cur, exercise_rows):
+    """Insert the test exercise catalog and return the new exercise ids"""
+    print("\nCreating test exercises...")
+    returned = execute_values(
+        cur,
+        SQL_INSERT_EXERCISES,
+        exercise_rows,
+        template=EXERCISES_TEMPLATE,
+        page_size=EXECUTE_VALUES_PAGE_SIZE,
+        fetch=True,
+    )
+    exercise_ids = [row[0] for row in returned]
+    print(f"Created {len(exercise_ids)} test exercises")
+
+    return exercise_ids
+
+
+def load_challenges(cur, challenge_rows):
+    """Insert the test challenges"""
+    print("\nCreating test challenges...")
+    execute_values(
+        cur,
+        SQL_INSERT_CHALLENGES,
+        challenge_rows,
+        template=CHALLENGES_TEMPLATE,
+        page_size=EXECUTE_VALUES_PAGE_SIZE,
+    )
+
+    print(f"Created {len(challenge_rows)} test challenges")
+
+
+def load_privacy_settings(cur, privacy_rows):
+    """Insert default privacy settings for every test user"""
+    execute_values(
+        cur,
+        SQL_INSERT_PRIVACY_SETTINGS,
+        privacy_rows,
+        page_size=EXECUTE_VALUES_PAGE_SIZE,
+    )
+
+
+def run_with_pooled_connection(pool, task, *args):
+    """Run `task(cur, *args)` on a connection from `pool` and commit it"""
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            result = task(cur, *args)
+        conn.commit()
+        return result
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def create_staging_tables(cur):
+    """(Re)create an empty UNLOGGED staging copy of every target table"""
+    for table in STAGED_TABLES:
+        cur.execute(SQL_DROP_STAGE.format(table=table))
+        cur.execute(SQL_CREATE_STAGE.format(table=table))
+
+
+def drop_staging_tables(cur):
+    """Drop every staging table"""
+    for table in reversed(STAGED_TABLES):
+        cur.execute(SQL_DROP_STAGE.format(table=table))
+
+
+def publish_staging_tables(cur):
+    """Copy every staging table into its target table, parents first"""
+    for table in STAGED_TABLES:
+        cur.execute(SQL_INSERTABLE_COLUMNS, (table,))
+        columns = ", ".join(f'"{row[0]}"' for row in cur.fetchall())
+        cur.execute(SQL_PUBLISH_STAGE.format(table=table, columns=columns))
+
+
+def load_all_data(conn, data, dsn=DB_URL):
+    """Write the output of generate_all_data() to the database
+
+    Rows are loaded into UNLOGGED staging tables, which carry no foreign keys,
+    then published to the real tables with one INSERT ... SELECT per table.
+    The pooled worker connections commit their staged rows themselves; the
+    publish step and the staging cleanup are left for the caller to commit.
+    """
+    cur = conn.cursor()
+    # The staging tables must exist for the worker connections too
+    create_staging_tables(cur)
+    conn.commit()
+    try:
+        print("Creating test users...")
+        # fetch=True returns the RETURNING rows of every page in input order
+        returned = execute_values(
+            cur,
+            SQL_INSERT_USERS,
+            data["users"],
+            template=USERS_TEMPLATE,
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+            fetch=True,
+        )
+        user_ids = [row[0] for row in returned]
+        print(f"Created {len(user_ids)} test users")
+
+        challenge_rows = [
+            (*challenge[:-1], user_ids[challenge[-1]])
+            for challenge in data["challenges"]
+        ]
+        privacy_rows = [
+            (user_ids[user_idx], *flags)
+            for user_idx, *flags in data["privacy_settings"]
         ]
 
-        for user1_id, user2_id in friendship_pairs:
-            cur.execute(
-                """
-                INSERT INTO friendships (user_id, friend_id, is_accepted, accepted_at)
-                VALUES (%s, %s, %s, %s)
-            """,
-                (
-                    user1_id,
-                    user2_id,
-                    True,
-                    datetime.now() - timedelta(days=random.randint(1, 30)),
-                ),
+        # Exercises, challenges and privacy settings only depend on users, so
+        # they are loaded concurrently, each on its own pooled connection.
+        pool = ThreadedConnectionPool(minconn=1, maxconn=8, dsn=dsn)
+        try:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                exercises_future = executor.submit(
+                    run_with_pooled_connection,
+                    pool,
+                    load_exercises,
+                    data["exercises"],
+                )
+                challenges_future = executor.submit(
+                    run_with_pooled_connection,
+                    pool,
+                    load_challenges,
+                    challenge_rows,
+                )
+                privacy_future = executor.submit(
+                    run_with_pooled_connection,
+                    pool,
+                    load_privacy_settings,
+                    privacy_rows,
+                )
+                exercise_ids = exercises_future.result()
+                challenges_future.result()
+                privacy_future.result()
+        finally:
+            pool.closeall()
+
+        # Create test workouts
+        print("\nCreating test workouts...")
+        workout_rows = [
+            (
+                user_ids[user_idx],
+                *workout,
+                f"Test workout for user {user_ids[user_idx]}",
             )
+            for user_idx, *workout in data["workouts"]
+        ]
+        returned = execute_values(
+            cur,
+            SQL_INSERT_WORKOUTS,
+            workout_rows,
+            template=WORKOUTS_TEMPLATE,
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+            fetch=True,
+        )
+        workout_ids = [row[0] for row in returned]
+
+        workout_exercise_rows = [
+            (workout_ids[workout_idx], exercise_ids[exercise_idx], *details)
+            for workout_idx, exercise_idx, *details in data["workout_exercises"]
+        ]
+        # COPY takes the enum labels as plain text, no per-row ::enum casts
+        cur.copy_expert(
+            SQL_COPY_WORKOUT_EXERCISES,
+            text_copy_buffer(workout_exercise_rows),
+        )
+
+        print(f"Created {len(workout_ids)} test workouts")
+
+        # Create test friendships
+        print("\nCreating test friendships...")
+        execute_values(
+            cur,
+            SQL_INSERT_FRIENDSHIPS,
+            [
+                (user_ids[user_idx], user_ids[friend_idx], *friendship)
+                for user_idx, friend_idx, *friendship in data["friendships"]
+            ],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
-        print("Created 4 test friendships")
+        print(f"Created {len(data['friendships'])} test friendships")
 
         # Create test goals
         print("\nCreating test goals...")
-        goal_data = [
-            ("test_bench_press_max", 100.0, "kg"),
-            ("test_squat_max", 150.0, "kg"),
-            ("test_5k_time", 25.0, "minutes"),
-            ("test_weight_loss", 5.0, "kg"),
-        ]
-
-        for user_id in user_ids:
-            # Create 1-2 goals per user
-            num_goals = random.randint(1, 2)
-            selected_goals = random.sample(goal_data, min(num_goals, len(goal_data)))
-
-            for goal in selected_goals:
-                target_date = datetime.now() + timedelta(days=random.randint(30, 180))
-                current_value = goal[1] * random.uniform(0.3, 0.8)
-                is_achieved = random.random() < 0.2
-
-                cur.execute(
-                    """
-                    INSERT INTO user_goals (user_id, goal_type, target_value, current_value, target_date, is_achieved, achieved_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        user_id,
-                        goal[0],
-                        goal[1],
-                        current_value,
-                        target_date,
-                        is_achieved,
-                        (
-                            datetime.now() - timedelta(days=random.randint(1, 30))
-                            if is_achieved
-                            else None
-                        ),
-                    ),
-                )
+        execute_values(
+            cur,
+            SQL_INSERT_USER_GOALS,
+            [(user_ids[user_idx], *goal) for user_idx, *goal in data["goals"]],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         print("Created test goals")
 
         # Create test user stats
         print("\nCreating test user stats...")
-        for user_id in user_ids:
-            # Create stats for the last 7 days
-            for days_ago in range(7, 0, -1):
-                if random.random() < 0.7:  # 70% chance of having stats
-                    stat_date = datetime.now() - timedelta(days=days_ago)
-                    weight = 70.0 + random.uniform(-2.0, 2.0)
-
-                    cur.execute(
-                        """
-                        INSERT INTO user_stats (user_id, date, weight, body_fat_percentage, muscle_mass,
-                                              total_workouts, total_weight_lifted, total_cardio_distance,
-                                              total_calories_burned, weight_unit, distance_unit, personal_records)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::weight_unit, %s::distance_unit, %s)
-                    """,
-                        (
-                            user_id,
-                            stat_date,
-                            weight,
-                            random.uniform(10.0, 25.0),
-                            weight * random.uniform(0.3, 0.5),
-                            random.randint(0, 3),
-                            random.randint(0, 2000),
-                            random.uniform(0, 10.0),
-                            random.randint(100, 800),
-                            "KG",
-                            "KM",
-                            json.dumps({"test_bench_press": random.randint(40, 120)}),
-                        ),
-                    )
+        stat_rows = [
+            (user_ids[user_idx], *stats) for user_idx, *stats in data["user_stats"]
+        ]
+        cur.copy_expert(
+            SQL_COPY_USER_STATS,
+            binary_copy_buffer(stat_rows, USER_STATS_COPY_ENCODERS),
+        )
 
         print("Created test user stats")
 
         # Create test safety data
         print("\nCreating test safety data...")
 
-        # Privacy settings
-        for user_id in user_ids:
-            cur.execute(
-                """
-                INSERT INTO privacy_settings (user_id, show_profile, show_workouts, show_stats, allow_friend_requests)
-                VALUES (%s, %s, %s, %s, %s)
-            """,
-                (user_id, True, True, True, True),
-            )
-
         # User reports
-        for i in range(2):
-            reporter_id = random.choice(user_ids)
-            reported_id = random.choice([uid for uid in user_ids if uid != reporter_id])
-
-            cur.execute(
-                """
-                INSERT INTO user_reports (reporter_id, reported_id, reason, description, created_at, resolved)
-                VALUES (%s, %s, %s::reportreasonenum, %s, %s, %s)
-            """,
-                (
-                    reporter_id,
-                    reported_id,
-                    random.choice(["SPAM", "ABUSE", "HARASSMENT", "OTHER"]),
-                    f"Test report {i+1}",
-                    datetime.now() - timedelta(days=random.randint(1, 30)),
-                    random.choice([True, False]),
-                ),
-            )
+        execute_values(
+            cur,
+            SQL_INSERT_USER_REPORTS,
+            [
+                (user_ids[reporter_idx], user_ids[reported_idx], *report)
+                for reporter_idx, reported_idx, *report in data["reports"]
+            ],
+            template=USER_REPORTS_TEMPLATE,
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         # User blocks
-        for i in range(1):
-            blocker_id = random.choice(user_ids)
-            blocked_id = random.choice([uid for uid in user_ids if uid != blocker_id])
-
-            cur.execute(
-                """
-                INSERT INTO user_blocks (blocker_id, blocked_id, created_at)
-                VALUES (%s, %s, %s)
-            """,
-                (
-                    blocker_id,
-                    blocked_id,
-                    datetime.now() - timedelta(days=random.randint(1, 60)),
-                ),
-            )
+        execute_values(
+            cur,
+            SQL_INSERT_USER_BLOCKS,
+            [
+                (user_ids[blocker_idx], user_ids[blocked_idx], created_at)
+                for blocker_idx, blocked_idx, created_at in data["blocks"]
+            ],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         print("Created test safety data")
 
         # Create test ML feedback
         print("\nCreating test ML feedback...")
-        feedback_messages = [
-            "Great recommendation, really helped with my workout!",
-            "This exercise was too difficult for my level",
-            "Perfect difficulty and equipment availability",
-        ]
-
-        for user_id in user_ids:
-            for i in range(random.randint(1, 3)):
-                cur.execute(
-                    """
-                    INSERT INTO recommendation_feedback (user_id, recommendation_id, feedback, rating, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """,
-                    (
-                        user_id,
-                        f"test_rec_{user_id}_{i}",
-                        random.choice(feedback_messages),
-                        random.uniform(1.0, 5.0),
-                        datetime.now() - timedelta(days=random.randint(1, 90)),
-                    ),
+        execute_values(
+            cur,
+            SQL_INSERT_RECOMMENDATION_FEEDBACK,
+            [
+                (
+                    user_ids[user_idx],
+                    f"test_rec_{user_ids[user_idx]}_{i}",
+                    feedback,
+                    rating,
+                    created_at,
                 )
+                for user_idx, i, feedback, rating, created_at in data["feedback"]
+            ],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         print("Created test ML feedback")
 
         # Create test check-ins
         print("\nCreating test accountability check-ins...")
-        checkin_messages = [
-            "Feeling motivated today!",
-            "Had a great workout session",
-            "Struggling with consistency this week",
-        ]
-
-        for user_id in user_ids:
-            for days_ago in range(7, 0, -1):
-                if random.random() < 0.4:  # 40% chance of check-in
-                    cur.execute(
-                        """
-                        INSERT INTO accountability_checkins (user_id, date, note, completed)
-                        VALUES (%s, %s, %s, %s)
-                    """,
-                        (
-                            user_id,
-                            datetime.now() - timedelta(days=days_ago),
-                            random.choice(checkin_messages),
-                            random.choice([True, False]),
-                        ),
-                    )
+        execute_values(
+            cur,
+            SQL_INSERT_ACCOUNTABILITY_CHECKINS,
+            [(user_ids[user_idx], *checkin) for user_idx, *checkin in data["checkins"]],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         print("Created test accountability check-ins")
 
@@ -578,69 +1118,71 @@ def populate_test_data():
         print("\nCreating test community data...")
 
         # Community groups
-        group_data = [
-            ("test_beginner_fitness", "Support group for fitness beginners"),
-            ("test_strength_training", "Advanced strength training community"),
-            ("test_running_club", "Running and endurance training group"),
-        ]
-
-        group_ids = []
-        for group in group_data:
-            cur.execute(
-                """
-                INSERT INTO community_groups (name, description, created_at)
-                VALUES (%s, %s, %s)
-                RETURNING id
-            """,
-                (
-                    group[0],
-                    group[1],
-                    datetime.now() - timedelta(days=random.randint(1, 365)),
-                ),
-            )
-            group_ids.append(cur.fetchone()[0])
+        returned = execute_values(
+            cur,
+            SQL_INSERT_COMMUNITY_GROUPS,
+            data["groups"],
+            fetch=True,
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
+        group_ids = [row[0] for row in returned]
 
         # Community memberships
-        for user_id in user_ids:
-            # Each user joins 1-2 groups
-            num_groups = random.randint(1, 2)
-            selected_groups = random.sample(group_ids, min(num_groups, len(group_ids)))
-
-            for group_id in selected_groups:
-                cur.execute(
-                    """
-                    INSERT INTO community_memberships (user_id, group_id, joined_at, is_admin)
-                    VALUES (%s, %s, %s, %s)
-                """,
-                    (
-                        user_id,
-                        group_id,
-                        datetime.now() - timedelta(days=random.randint(1, 180)),
-                        random.random() < 0.1,  # 10% chance of being admin
-                    ),
-                )
+        execute_values(
+            cur,
+            SQL_INSERT_COMMUNITY_MEMBERSHIPS,
+            [
+                (user_ids[user_idx], group_ids[group_idx], *membership)
+                for user_idx, group_idx, *membership in data["memberships"]
+            ],
+            page_size=EXECUTE_VALUES_PAGE_SIZE,
+        )
 
         print("Created test community data")
 
+        # One INSERT ... SELECT per table moves the staged rows in, in FK order
+        publish_staging_tables(cur)
+        drop_staging_tables(cur)
+    except Exception:
+        conn.rollback()
+        drop_staging_tables(cur)
+        conn.commit()
+        raise
+    finally:
+        cur.close()
+
+
+def populate_test_data(seed=DEFAULT_SEED):
+    """Populate database with test data using direct SQL"""
+
+    data = generate_all_data(seed)
+    conn = psycopg2.connect(DB_URL)
+
+    try:
+        load_all_data(conn, data)
+
         # Commit all changes
         conn.commit()
 
         print("\n✅ Test data population completed successfully!")
         print(f"\n📊 Summary:")
-        print(f"   • Users: {len(user_ids)}")
-        print(f"   • Exercises: {len(exercise_ids)}")
-        print(f"   • Workouts: {workout_count}")
-        print(f"   • Challenges: 3")
-        print(f"   • Friendships: 4")
-        print(f"   • Goals: {len(user_ids) * 2}")
-        print(f"   • User Stats: {len(user_ids) * 5}")
+        print(f"   • Users: {len(data['users'])}")
+        print(f"   • Exercises: {len(data['exercises'])}")
+        print(f"   • Workouts: {len(data['workouts'])}")
+        print(f"   • Challenges: {len(data['challenges'])}")
+        print(f"   • Friendships: {len(data['friendships'])}")
+        print(f"   • Goals: {len(data['goals'])}")
+        print(f"   • User Stats: {len(data['user_stats'])}")
         print(f"   • Safety Data: Privacy settings, reports, blocks")
-        print(f"   • ML Feedback: {len(user_ids) * 2}")
-        print(f"   • Accountability Check-ins: {len(user_ids) * 3}")
-        print(f"   • Community: 3 groups, {len(user_ids) * 1.5} memberships")
+        print(f"   • ML Feedback: {len(data['feedback'])}")
+        print(f"   • Accountability Check-ins: {len(data['checkins'])}")
+        print(
+            f"   • Community: {len(data['groups'])} groups, "
+            f"{len(data['memberships'])} memberships"
+        )
 
         print(f"\n🔑 Test User Credentials:")
-        for i, user_data in enumerate(test_users):
+        for user_data in TEST_USERS:
             print(f"   • {user_data[1]}: testpassword123")
 
         print(
@@ -660,7 +1202,6 @@ def populate_test_data():
         conn.rollback()
         raise
     finally:
-        cur.close()
         conn.close()
 
 
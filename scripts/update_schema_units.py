@@ -28,348 +28,455 @@ DATABASE_URL = os.getenv(
 engine = create_engine(DATABASE_URL)
 
 
-def create_unit_enums():
+def create_unit_enums(conn):
     """Create unit preference enums"""
 
-    with engine.connect() as conn:
-        # Create unit preference enum
-        conn.execute(
-            text(
-                """
-            DO $$ BEGIN
-                CREATE TYPE unit_system AS ENUM ('METRIC', 'IMPERIAL');
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """
-            )
+    conn.execute(
+        text(
+            """
+        -- Create unit preference enum
+        DO $$ BEGIN
+            CREATE TYPE unit_system AS ENUM ('METRIC', 'IMPERIAL');
+        EXCEPTION
+            WHEN duplicate_object THEN null;
+        END $$;
+
+        -- Create weight unit enum
+        DO $$ BEGIN
+            CREATE TYPE weight_unit AS ENUM ('KG', 'LBS');
+        EXCEPTION
+            WHEN duplicate_object THEN null;
+        END $$;
+
+        -- Create height unit enum
+        DO $$ BEGIN
+            CREATE TYPE height_unit AS ENUM ('CM', 'INCHES', 'FEET_INCHES');
+        EXCEPTION
+            WHEN duplicate_object THEN null;
+        END $$;
+
+        -- Create distance unit enum
+        DO $$ BEGIN
+            CREATE TYPE distance_unit AS ENUM ('KM', 'MILES', 'METERS');
+        EXCEPTION
+            WHEN duplicate_object THEN null;
+        END $$;
+    """
         )
+    )
 
-        # Create weight unit enum
-        conn.execute(
-            text(
-                """
-            DO $$ BEGIN
-                CREATE TYPE weight_unit AS ENUM ('KG', 'LBS');
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """
-            )
+    print("✅ Created unit enums")
+
+
+def update_users_table(conn):
+    """Update users table to support unit preferences"""
+
+    conn.execute(
+        text(
+            """
+        -- Add unit preference columns
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS unit_system unit_system DEFAULT 'METRIC',
+        ADD COLUMN IF NOT EXISTS height_unit height_unit DEFAULT 'CM',
+        ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG';
+
+        -- Persist the metric values once at write time
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS height_cm DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN height_unit = 'INCHES' THEN height * 2.54
+                WHEN height_unit = 'FEET_INCHES' THEN height * 30.48
+                ELSE height
+            END
+        ) STORED,
+        ADD COLUMN IF NOT EXISTS weight_kg DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN weight_unit = 'LBS' THEN weight * 0.45359237
+                ELSE weight
+            END
+        ) STORED;
+
+        -- Add comments for clarity
+        COMMENT ON COLUMN users.unit_system IS 'User preference for unit system (METRIC/IMPERIAL)';
+        COMMENT ON COLUMN users.height_unit IS 'Unit for height measurements (CM/INCHES/FEET_INCHES)';
+        COMMENT ON COLUMN users.weight_unit IS 'Unit for weight measurements (KG/LBS)';
+    """
         )
+    )
 
-        # Create height unit enum
-        conn.execute(
-            text(
-                """
-            DO $$ BEGIN
-                CREATE TYPE height_unit AS ENUM ('CM', 'INCHES', 'FEET_INCHES');
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """
-            )
+    print("✅ Updated users table with unit preferences")
+
+
+def update_user_stats_table(conn):
+    """Update user_stats table to support unit tracking"""
+
+    conn.execute(
+        text(
+            """
+        -- Add unit columns
+        ALTER TABLE user_stats
+        ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG',
+        ADD COLUMN IF NOT EXISTS distance_unit distance_unit DEFAULT 'KM';
+
+        -- Persist the metric values once at write time
+        ALTER TABLE user_stats
+        ADD COLUMN IF NOT EXISTS weight_kg DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN weight_unit = 'LBS' THEN weight * 0.45359237
+                ELSE weight
+            END
+        ) STORED,
+        ADD COLUMN IF NOT EXISTS total_cardio_distance_km DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN distance_unit = 'MILES' THEN total_cardio_distance * 1.609344
+                ELSE total_cardio_distance
+            END
+        ) STORED;
+
+        -- Add comments
+        COMMENT ON COLUMN user_stats.weight_unit IS 'Unit for weight measurements in this record';
+        COMMENT ON COLUMN user_stats.distance_unit IS 'Unit for distance measurements in this record';
+    """
         )
+    )
+
+    print("✅ Updated user_stats table with unit tracking")
 
-        # Create distance unit enum
-        conn.execute(
-            text(
-                """
+
+def update_workout_exercises_table(conn):
+    """Update workout_exercises table to support unit preferences"""
+
+    conn.execute(
+        text(
+            """
+        -- Add unit columns
+        ALTER TABLE workout_exercises
+        ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG',
+        ADD COLUMN IF NOT EXISTS distance_unit distance_unit DEFAULT 'METERS';
+
+        -- Persist the metric values once at write time. weight is a free-form
+        -- string ("60,65,70"), so only single numeric values get a weight_kg.
+        ALTER TABLE workout_exercises
+        ADD COLUMN IF NOT EXISTS weight_kg DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN weight !~ '^ *[0-9]+([.][0-9]+)? *$' THEN NULL
+                WHEN weight_unit = 'LBS'
+                    THEN CAST(weight AS DOUBLE PRECISION) * 0.45359237
+                ELSE CAST(weight AS DOUBLE PRECISION)
+            END
+        ) STORED,
+        -- Same name and values as the old workout_exercises_metric view column
+        ADD COLUMN IF NOT EXISTS distance_meters DOUBLE PRECISION GENERATED ALWAYS AS (
+            CASE
+                WHEN distance_unit = 'MILES' THEN distance * 1.609344
+                ELSE distance
+            END
+        ) STORED;
+
+        -- Add comments
+        COMMENT ON COLUMN workout_exercises.weight_unit IS 'Unit for weight in this exercise';
+        COMMENT ON COLUMN workout_exercises.distance_unit IS 'Unit for distance in this exercise';
+    """
+        )
+    )
+
+    print("✅ Updated workout_exercises table with unit support")
+
+
+def create_unit_conversion_functions(conn):
+    """Create PostgreSQL functions for unit conversions
+
+    Plain SQL IMMUTABLE functions so the planner can inline them into the
+    calling expression instead of running a PL/pgSQL call per row.
+    """
+
+    conn.execute(
+        text(
+            """
+        -- Weight conversion functions
+        CREATE OR REPLACE FUNCTION lbs_to_kg(lbs DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT lbs * 0.45359237 $$;
+
+        CREATE OR REPLACE FUNCTION kg_to_lbs(kg DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT kg * 2.20462262 $$;
+
+        -- Height conversion functions
+        CREATE OR REPLACE FUNCTION inches_to_cm(inches DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT inches * 2.54 $$;
+
+        CREATE OR REPLACE FUNCTION cm_to_inches(cm DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT cm / 2.54 $$;
+
+        -- Distance conversion functions
+        CREATE OR REPLACE FUNCTION miles_to_km(miles DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT miles * 1.609344 $$;
+
+        CREATE OR REPLACE FUNCTION km_to_miles(km DOUBLE PRECISION)
+        RETURNS DOUBLE PRECISION
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT km / 1.609344 $$;
+    """
+        )
+    )
+
+    print("✅ Created unit conversion functions")
+
+
+USERS_METRIC_COLUMNS = [
+    "id",
+    "email",
+    "username",
+    "full_name",
+    "is_active",
+    "is_verified",
+    "age",
+    "height_cm",
+    "weight_kg",
+    "fitness_goal",
+    "experience_level",
+    "unit_system",
+    "height_unit",
+    "weight_unit",
+    "created_at",
+    "updated_at",
+]
+
+USER_STATS_METRIC_COLUMNS = [
+    "id",
+    "user_id",
+    "date",
+    "weight_kg",
+    "body_fat_percentage",
+    "muscle_mass",
+    "total_workouts",
+    "total_weight_lifted",
+    "total_cardio_distance_km",
+    "total_calories_burned",
+    "personal_records",
+    "weight_unit",
+    "distance_unit",
+]
+
+WORKOUT_EXERCISES_METRIC_COLUMNS = [
+    "id",
+    "workout_id",
+    "exercise_id",
+    '"order"',
+    "sets",
+    "reps",
+    "weight_kg",
+    "duration",
+    "distance_meters",
+    "speed",
+    "incline",
+    "rest_time",
+    "actual_reps",
+    "actual_weight",
+    "notes",
+    "weight_unit",
+    "distance_unit",
+]
+
+
+def drop_relation_sql(name):
+    """SQL that drops ``name`` whether it is a view, materialized view or table"""
+
+    return f"""
             DO $$ BEGIN
-                CREATE TYPE distance_unit AS ENUM ('KM', 'MILES', 'METERS');
+                EXECUTE (
+                    SELECT CASE relkind
+                        WHEN 'v' THEN 'DROP VIEW '
+                        WHEN 'm' THEN 'DROP MATERIALIZED VIEW '
+                        ELSE 'DROP TABLE '
+                    END || '{name} CASCADE'
+                    FROM pg_class
+                    WHERE oid = to_regclass('{name}')
+                );
             EXCEPTION
-                WHEN duplicate_object THEN null;
+                WHEN null_value_not_allowed THEN null;
             END $$;
         """
-            )
-        )
-
-        conn.commit()
-        print("✅ Created unit enums")
 
 
-def update_users_table():
-    """Update users table to support unit preferences"""
+def drop_refresh_trigger_sql(name, table):
+    """SQL that drops the refresh trigger left from when ``name`` was a
+    materialized view, so writes to ``table`` stop refreshing a dropped view
+    """
 
-    with engine.connect() as conn:
-        # Add unit preference columns
-        conn.execute(
-            text(
-                """
-            ALTER TABLE users
-            ADD COLUMN IF NOT EXISTS unit_system unit_system DEFAULT 'METRIC',
-            ADD COLUMN IF NOT EXISTS height_unit height_unit DEFAULT 'CM',
-            ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG';
+    return f"""
+            DROP TRIGGER IF EXISTS refresh_{name} ON {table};
+            DROP FUNCTION IF EXISTS refresh_{name}();
         """
-            )
-        )
 
-        # Add comments for clarity
-        conn.execute(
-            text(
-                """
-            COMMENT ON COLUMN users.unit_system IS 'User preference for unit system (METRIC/IMPERIAL)';
-            COMMENT ON COLUMN users.height_unit IS 'Unit for height measurements (CM/INCHES/FEET_INCHES)';
-            COMMENT ON COLUMN users.weight_unit IS 'Unit for weight measurements (KG/LBS)';
-        """
-            )
-        )
 
-        conn.commit()
-        print("✅ Updated users table with unit preferences")
+def incremental_table_sql(name, table, columns):
+    """SQL for a twin table of ``table`` kept in sync row by row
 
+    Each write only touches the matching twin row, so writers pay for the rows
+    they change rather than a re-scan of the whole table, and do not queue
+    behind one another the way concurrent materialized view refreshes do.
+    """
 
-def update_user_stats_table():
-    """Update user_stats table to support unit tracking"""
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    updates = ", ".join(
+        f"{column} = EXCLUDED.{column}" for column in columns if column != "id"
+    )
 
-    with engine.connect() as conn:
-        # Add unit columns
-        conn.execute(
-            text(
-                """
-            ALTER TABLE user_stats
-            ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG',
-            ADD COLUMN IF NOT EXISTS distance_unit distance_unit DEFAULT 'KM';
-        """
-            )
-        )
+    return f"""
+            CREATE TABLE {name} AS
+            SELECT {column_list}
+            FROM {table};
 
-        # Add comments
-        conn.execute(
-            text(
-                """
-            COMMENT ON COLUMN user_stats.weight_unit IS 'Unit for weight measurements in this record';
-            COMMENT ON COLUMN user_stats.distance_unit IS 'Unit for distance measurements in this record';
+            ALTER TABLE {name} ADD PRIMARY KEY (id);
+
+            CREATE OR REPLACE FUNCTION sync_{name}()
+            RETURNS trigger
+            LANGUAGE plpgsql
+            AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    DELETE FROM {name} WHERE id = OLD.id;
+                    RETURN NULL;
+                END IF;
+
+                INSERT INTO {name} ({column_list})
+                VALUES ({new_values})
+                ON CONFLICT (id) DO UPDATE SET {updates};
+                RETURN NULL;
+            END;
+            $$;
+
+            DROP TRIGGER IF EXISTS sync_{name} ON {table};
+            CREATE TRIGGER sync_{name}
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_{name}();
         """
-            )
-        )
 
-        conn.commit()
-        print("✅ Updated user_stats table with unit tracking")
 
+def create_views_for_metric_data(conn):
+    """Create pre-computed relations that always return metric data for algorithms
 
-def update_workout_exercises_table():
-    """Update workout_exercises table to support unit preferences"""
+    Each relation is a twin table of its base table, maintained incrementally
+    by a row trigger, so the hot write paths (registration, profile updates,
+    stats updates, logging sets) only pay for the rows they write.
+    """
 
-    with engine.connect() as conn:
-        # Add unit columns
-        conn.execute(
-            text(
-                """
-            ALTER TABLE workout_exercises
-            ADD COLUMN IF NOT EXISTS weight_unit weight_unit DEFAULT 'KG',
-            ADD COLUMN IF NOT EXISTS distance_unit distance_unit DEFAULT 'METERS';
-        """
+    conn.execute(
+        text(
+            drop_refresh_trigger_sql("users_metric", "users")
+            + drop_relation_sql("users_metric")
+            + incremental_table_sql("users_metric", "users", USERS_METRIC_COLUMNS)
+            + drop_refresh_trigger_sql("user_stats_metric", "user_stats")
+            + drop_relation_sql("user_stats_metric")
+            + incremental_table_sql(
+                "user_stats_metric", "user_stats", USER_STATS_METRIC_COLUMNS
             )
-        )
-
-        # Add comments
-        conn.execute(
-            text(
-                """
-            COMMENT ON COLUMN workout_exercises.weight_unit IS 'Unit for weight in this exercise';
-            COMMENT ON COLUMN workout_exercises.distance_unit IS 'Unit for distance in this exercise';
-        """
+            + drop_relation_sql("workout_exercises_metric")
+            + incremental_table_sql(
+                "workout_exercises_metric",
+                "workout_exercises",
+                WORKOUT_EXERCISES_METRIC_COLUMNS,
             )
         )
+    )
 
-        conn.commit()
-        print("✅ Updated workout_exercises table with unit support")
+    print("✅ Created metric views for algorithms")
 
 
-def create_unit_conversion_functions():
-    """Create PostgreSQL functions for unit conversions"""
+def create_exercise_search_indexes(conn):
+    """Create trigram indexes for exercise search"""
 
-    with engine.connect() as conn:
-        # Weight conversion functions
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION lbs_to_kg(lbs DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN lbs * 0.45359237;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
-        )
+    conn.execute(
+        text(
+            """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION kg_to_lbs(kg DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN kg * 2.20462262;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
+        CREATE INDEX IF NOT EXISTS exercises_name_trgm
+            ON exercises USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS exercises_desc_trgm
+            ON exercises USING gin (description gin_trgm_ops);
+    """
         )
-
-        # Height conversion functions
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION inches_to_cm(inches DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN inches * 2.54;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
+    )
+
+    print("✅ Created exercise search indexes")
+
+
+def convert_exercise_secondary_muscles_to_jsonb(conn):
+    """Store exercises.secondary_muscles as jsonb instead of JSON-encoded text"""
+
+    conn.execute(
+        text(
+            """
+        -- Same conversion as alembic revision 6b1d0e3f7a25: JSON-encoded lists
+        -- are cast as-is, comma-separated values are split into a list
+        CREATE FUNCTION pg_temp.secondary_muscles_to_jsonb(value text)
+        RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE
+        AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            RETURN value::jsonb;
+        EXCEPTION
+            WHEN invalid_text_representation THEN
+                RETURN to_jsonb(regexp_split_to_array(btrim(value), '\\s*,\\s*'));
+        END;
+        $$;
+
+        DO $$ BEGIN
+            IF (
+                SELECT data_type
+                FROM information_schema.columns
+                WHERE table_name = 'exercises' AND column_name = 'secondary_muscles'
+            ) <> 'jsonb' THEN
+                ALTER TABLE exercises
+                ALTER COLUMN secondary_muscles TYPE jsonb
+                USING pg_temp.secondary_muscles_to_jsonb(secondary_muscles);
+            END IF;
+        END $$;
+    """
         )
+    )
 
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION cm_to_inches(cm DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN cm / 2.54;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
-        )
+    print("✅ Converted exercises.secondary_muscles to jsonb")
 
-        # Distance conversion functions
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION miles_to_km(miles DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN miles * 1.609344;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
-        )
 
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE FUNCTION km_to_miles(km DOUBLE PRECISION)
-            RETURNS DOUBLE PRECISION AS $$
-            BEGIN
-                RETURN km / 1.609344;
-            END;
-            $$ LANGUAGE plpgsql;
-        """
-            )
-        )
+def create_workout_history_indexes(conn):
+    """Create covering indexes for per-exercise workout history lookups
 
-        conn.commit()
-        print("✅ Created unit conversion functions")
-
-
-def create_views_for_metric_data():
-    """Create views that always return metric data for algorithms"""
-
-    with engine.connect() as conn:
-        # View for users with metric units
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE VIEW users_metric AS
-            SELECT
-                id,
-                email,
-                username,
-                full_name,
-                is_active,
-                is_verified,
-                age,
-                CASE
-                    WHEN height_unit = 'INCHES' THEN inches_to_cm(height)
-                    WHEN height_unit = 'FEET_INCHES' THEN inches_to_cm(height * 12)
-                    ELSE height
-                END as height_cm,
-                CASE
-                    WHEN weight_unit = 'LBS' THEN lbs_to_kg(weight)
-                    ELSE weight
-                END as weight_kg,
-                fitness_goal,
-                experience_level,
-                unit_system,
-                height_unit,
-                weight_unit,
-                created_at,
-                updated_at
-            FROM users;
-        """
-            )
-        )
+    workouts.status, users.fitness_goal and users.experience_level are already
+    native enums (workoutstatus, fitnessgoal, experiencelevel) created by the
+    ORM, so they only need indexing here.
+    """
 
-        # View for user_stats with metric units
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE VIEW user_stats_metric AS
-            SELECT
-                id,
-                user_id,
-                date,
-                CASE
-                    WHEN weight_unit = 'LBS' THEN lbs_to_kg(weight)
-                    ELSE weight
-                END as weight_kg,
-                body_fat_percentage,
-                muscle_mass,
-                total_workouts,
-                total_weight_lifted,
-                CASE
-                    WHEN distance_unit = 'MILES' THEN miles_to_km(total_cardio_distance)
-                    ELSE total_cardio_distance
-                END as total_cardio_distance_km,
-                total_calories_burned,
-                personal_records,
-                weight_unit,
-                distance_unit
-            FROM user_stats;
-        """
-            )
-        )
+    conn.execute(
+        text(
+            """
+        CREATE INDEX IF NOT EXISTS ix_workout_exercises_exercise_workout
+            ON workout_exercises (exercise_id) INCLUDE (workout_id);
 
-        # View for workout_exercises with metric units
-        conn.execute(
-            text(
-                """
-            CREATE OR REPLACE VIEW workout_exercises_metric AS
-            SELECT
-                id,
-                workout_id,
-                exercise_id,
-                "order",
-                sets,
-                reps,
-                CASE
-                    WHEN weight_unit = 'LBS' THEN lbs_to_kg(CAST(weight AS DOUBLE PRECISION))
-                    ELSE CAST(weight AS DOUBLE PRECISION)
-                END as weight_kg,
-                duration,
-                CASE
-                    WHEN distance_unit = 'MILES' THEN miles_to_km(distance)
-                    ELSE distance
-                END as distance_meters,
-                speed,
-                incline,
-                rest_time,
-                actual_reps,
-                actual_weight,
-                notes,
-                weight_unit,
-                distance_unit
-            FROM workout_exercises;
-        """
-            )
+        -- Filter columns plus completed_at DESC, so history needs no sort step
+        DROP INDEX IF EXISTS ix_workouts_user_status_completed;
+        CREATE INDEX ix_workouts_user_status_completed
+            ON workouts (user_id, status, completed_at DESC) INCLUDE (id);
+    """
         )
+    )
 
-        conn.commit()
-        print("✅ Created metric views for algorithms")
+    print("✅ Created workout history indexes")
 
 
 def main():
@@ -379,36 +486,52 @@ def main():
     print("=" * 70)
 
     try:
-        # Create unit enums
-        print("\n1. Creating unit enums...")
-        create_unit_enums()
+        # One connection and one transaction, so a failure rolls back every step
+        with engine.begin() as conn:
+            # Create unit enums
+            print("\n1. Creating unit enums...")
+            create_unit_enums(conn)
+
+            # Update tables
+            print("\n2. Updating users table...")
+            update_users_table(conn)
+
+            print("\n3. Updating user_stats table...")
+            update_user_stats_table(conn)
+
+            print("\n4. Updating workout_exercises table...")
+            update_workout_exercises_table(conn)
 
-        # Update tables
-        print("\n2. Updating users table...")
-        update_users_table()
+            # Create conversion functions
+            print("\n5. Creating unit conversion functions...")
+            create_unit_conversion_functions(conn)
 
-        print("\n3. Updating user_stats table...")
-        update_user_stats_table()
+            # Create metric views
+            print("\n6. Creating metric views for algorithms...")
+            create_views_for_metric_data(conn)
 
-        print("\n4. Updating workout_exercises table...")
-        update_workout_exercises_table()
+            # Create search indexes
+            print("\n7. Creating exercise search indexes...")
+            create_exercise_search_indexes(conn)
 
-        # Create conversion functions
-        print("\n5. Creating unit conversion functions...")
-        create_unit_conversion_functions()
+            print("\n8. Converting exercise secondary muscles to jsonb...")
+            convert_exercise_secondary_muscles_to_jsonb(conn)
 
-        # Create metric views
-        print("\n6. Creating metric views for algorithms...")
-        create_views_for_metric_data()
+            print("\n9. Creating workout history indexes...")
+            create_workout_history_indexes(conn)
 
         print("\n" + "=" * 70)
         print("🎉 Database schema updated successfully!")
         print("\n📋 Changes Made:")
         print("   ✅ Added unit_system, height_unit, weight_unit to users table")
+        print("   ✅ Added generated metric columns (height_cm, weight_kg, distance_meters)")
         print("   ✅ Added weight_unit, distance_unit to user_stats table")
         print("   ✅ Added weight_unit, distance_unit to workout_exercises table")
         print("   ✅ Created unit conversion functions (lbs↔kg, inches↔cm, miles↔km)")
-        print("   ✅ Created metric views for all algorithms")
+        print("   ✅ Created incrementally maintained metric tables for all algorithms")
+        print("   ✅ Created pg_trgm search indexes on exercises")
+        print("   ✅ Converted exercises.secondary_muscles to jsonb")
+        print("   ✅ Created covering indexes for workout history lookups")
         print("\n🔧 Usage:")
         print(
             "   • Use metric views (users_metric, user_stats_metric, etc.) for algorithms"
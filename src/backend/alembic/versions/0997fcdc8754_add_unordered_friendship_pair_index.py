@@ -0,0 +1,31 @@
+"""add unordered friendship pair index
+
+Revision ID: 0997fcdc8754
+Revises: b2dc40388dd8
+Create Date: 2026-10-17 09:41:07.562914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0997fcdc8754"
+down_revision: Union[str, None] = "b2dc40388dd8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One friendship per pair of users in either direction; send_friend_request
+    # inserts with ON CONFLICT DO NOTHING against it
+    op.execute(
+        "CREATE UNIQUE INDEX ux_friendships_pair "
+        "ON friendships (least(user_id, friend_id), greatest(user_id, friend_id))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_friendships_pair", table_name="friendships")
@@ -0,0 +1,43 @@
+"""add workout history index
+
+Revision ID: 2a8f6c0e4d93
+Revises: 9e7c2a4d5b18
+Create Date: 2026-10-17 15:38:27.405916
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2a8f6c0e4d93"
+down_revision: Union[str, None] = "9e7c2a4d5b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers get_exercise_history's filter and its completed_at DESC order;
+    # databases set up by update_schema_units.py already have it
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workouts_user_status_completed",
+            "workouts",
+            ["user_id", "status", sa.text("completed_at DESC")],
+            unique=False,
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workouts_user_status_completed",
+            table_name="workouts",
+            postgresql_concurrently=True,
+        )
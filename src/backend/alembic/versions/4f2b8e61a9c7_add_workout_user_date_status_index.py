@@ -0,0 +1,40 @@
+"""add workout user date status index
+
+Revision ID: 4f2b8e61a9c7
+Revises: c5e1a7d93b20
+Create Date: 2026-10-17 14:02:51.617390
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2b8e61a9c7"
+down_revision: Union[str, None] = "c5e1a7d93b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Workout lists scan one user's scheduled_date range in date order; build
+    # the index concurrently so writes to workouts are not blocked meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workouts_user_date_status",
+            "workouts",
+            ["user_id", "scheduled_date", "status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workouts_user_date_status",
+            table_name="workouts",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,62 @@
+"""convert secondary muscles to jsonb
+
+Revision ID: 6b1d0e3f7a25
+Revises: 4f2b8e61a9c7
+Create Date: 2026-10-17 15:10:42.208113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b1d0e3f7a25"
+down_revision: Union[str, None] = "4f2b8e61a9c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The model reads secondary_muscles as JSON, so legacy text must become
+    # jsonb. JSON-encoded lists are cast as-is; anything else (comma-separated
+    # values from the CSV importer) is split into a list rather than failing
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.secondary_muscles_to_jsonb(value text)
+        RETURNS jsonb
+        LANGUAGE plpgsql IMMUTABLE
+        AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            RETURN value::jsonb;
+        EXCEPTION
+            WHEN invalid_text_representation THEN
+                RETURN to_jsonb(regexp_split_to_array(btrim(value), '\\s*,\\s*'));
+        END;
+        $$;
+
+        DO $$ BEGIN
+            IF (
+                SELECT data_type
+                FROM information_schema.columns
+                WHERE table_name = 'exercises' AND column_name = 'secondary_muscles'
+            ) <> 'jsonb' THEN
+                ALTER TABLE exercises
+                ALTER COLUMN secondary_muscles TYPE jsonb
+                USING pg_temp.secondary_muscles_to_jsonb(secondary_muscles);
+            END IF;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE exercises "
+        "ALTER COLUMN secondary_muscles TYPE varchar "
+        "USING secondary_muscles::text"
+    )
@@ -0,0 +1,42 @@
+"""add workout exercise history index
+
+Revision ID: 7d3b9f1a6e40
+Revises: 2a8f6c0e4d93
+Create Date: 2026-10-17 15:44:03.128860
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3b9f1a6e40"
+down_revision: Union[str, None] = "2a8f6c0e4d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets per-exercise history join to workouts without visiting the heap;
+    # databases set up by update_schema_units.py already have it
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_workout_exercises_exercise_workout",
+            "workout_exercises",
+            ["exercise_id"],
+            unique=False,
+            postgresql_include=["workout_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_workout_exercises_exercise_workout",
+            table_name="workout_exercises",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,35 @@
+"""add username trigram index
+
+Revision ID: 8d4a491f3eef
+Revises: 0997fcdc8754
+Create Date: 2026-10-17 12:58:19.204736
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4a491f3eef"
+down_revision: Union[str, None] = "0997fcdc8754"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # search_users matches ILIKE '%...%', which only a trigram index can serve
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_users_username_trgm",
+        "users",
+        ["username"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"username": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username_trgm", table_name="users")
@@ -0,0 +1,38 @@
+"""add exercise search trigram indexes
+
+Revision ID: 9e7c2a4d5b18
+Revises: 6b1d0e3f7a25
+Create Date: 2026-10-17 15:24:09.771542
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e7c2a4d5b18"
+down_revision: Union[str, None] = "6b1d0e3f7a25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # get_exercises searches name and description with ILIKE '%...%'; the
+    # names match update_schema_units.py so databases it already set up are
+    # left as they are
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS exercises_name_trgm "
+        "ON exercises USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS exercises_desc_trgm "
+        "ON exercises USING gin (description gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("exercises_desc_trgm", table_name="exercises")
+    op.drop_index("exercises_name_trgm", table_name="exercises")
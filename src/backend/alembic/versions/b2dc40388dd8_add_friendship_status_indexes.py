@@ -0,0 +1,40 @@
+"""add friendship status indexes
+
+Revision ID: b2dc40388dd8
+Revises: 713f5af58064
+Create Date: 2026-10-17 09:12:44.318203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2dc40388dd8"
+down_revision: Union[str, None] = "713f5af58064"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Friend lists and pending requests filter on one side of the friendship
+    # plus its status
+    op.create_index(
+        "ix_friendships_friend_status",
+        "friendships",
+        ["friend_id", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_friendships_user_status",
+        "friendships",
+        ["user_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_friendships_user_status", table_name="friendships")
+    op.drop_index("ix_friendships_friend_status", table_name="friendships")
@@ -0,0 +1,35 @@
+"""add user block pair constraint
+
+Revision ID: c5e1a7d93b20
+Revises: 8d4a491f3eef
+Create Date: 2026-10-17 13:21:36.840215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a7d93b20"
+down_revision: Union[str, None] = "8d4a491f3eef"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # block_user inserts with ON CONFLICT (blocker_id, blocked_id) DO NOTHING;
+    # drop duplicate blocks first so the constraint can be created
+    op.execute(
+        "DELETE FROM user_blocks a USING user_blocks b "
+        "WHERE a.blocker_id = b.blocker_id AND a.blocked_id = b.blocked_id "
+        "AND a.id > b.id"
+    )
+    op.create_unique_constraint(
+        "_blocker_blocked_uc", "user_blocks", ["blocker_id", "blocked_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("_blocker_blocked_uc", "user_blocks", type_="unique")
@@ -1,22 +1,13 @@
 # backend/app/api/__init__.py
 """
 API package initialization
+
+Router modules are imported lazily on first attribute access (PEP 562), so
+importing ``app.api`` does not pull in every endpoint module and its
+dependencies.
 """
 
-from app.api import (
-    auth,
-    exercises,
-    recommendations,
-    social,
-    users,
-    workouts,
-    challenges,
-    accountability,
-    subscriptions,
-    community,
-    privacy,
-    safety,
-)
+import importlib
 
 __all__ = [
     "auth",
@@ -32,3 +23,17 @@ __all__ = [
     "privacy",
     "safety",
 ]
+
+_LAZY_MODULES = frozenset(__all__)
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_MODULES)
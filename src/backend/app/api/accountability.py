@@ -1,8 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.auth import get_current_user
-from app.database import get_db
-from app.models.user import User
-from sqlalchemy.orm import Session
+from app.api.auth import get_current_user_id
 
 router = APIRouter()
 
@@ -10,8 +7,7 @@ router = APIRouter()
 @router.post("/partnerships")
 def create_accountability_partnership(
     partnership_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Create accountability partnership"""
     return {"message": "Accountability partnership created"}
@@ -19,8 +15,7 @@ def create_accountability_partnership(
 
 @router.get("/partners")
 def get_accountability_partners(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Get accountability partners"""
     return {"partners": []}
@@ -29,8 +24,7 @@ def get_accountability_partners(
 @router.post("/checkins")
 def create_accountability_checkin(
     checkin_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Create accountability check-in"""
     return {"message": "Accountability check-in created"}
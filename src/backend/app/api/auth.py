@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -48,33 +49,61 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> dict:
+    """Decode an access token, rejecting it unless it names a user"""
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+):
+    """Get current authenticated user"""
+    username: str = _decode_token(token)["sub"]
 
     user = db.query(User).filter(User.username == username).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
+def get_current_user_id(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> int:
+    """Get the authenticated user's id without loading the user
+
+    Tokens issued by login carry the id in the "uid" claim; tokens without it
+    fall back to looking the id up by username. Either way the user must
+    still exist, so deleting a user revokes their tokens.
+    """
+    payload = _decode_token(token)
+    uid = payload.get("uid")
+    if uid is None:
+        user_id = db.scalar(select(User.id).where(User.username == payload["sub"]))
+    else:
+        user_id = db.scalar(select(User.id).where(User.id == uid))
+    if user_id is None:
+        raise _credentials_exception()
+    return user_id
+
+
 @router.post("/register", response_model=UserResponse, status_code=201)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
     existing_user = (
@@ -113,7 +142,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     """Login user and return access token"""
@@ -128,7 +157,7 @@ async def login(
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id}, expires_delta=access_token_expires
     )
 
     logger.info(f"User logged in: {user.username}")
@@ -3,6 +3,7 @@
 Challenges API endpoints
 """
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Optional
 from sqlalchemy.orm import Session
@@ -12,26 +13,36 @@ from app.api.auth import get_current_user
 from app.models.user import User
 from app.database import get_db
 
-# Dependency function for ChallengeService
 
+# Dummy dependencies for testing
+class DummyRepo:
+    async def get_user_challenges(self, user_id):
+        return []
 
-def get_challenge_service() -> ChallengeService:
-    # Provide dummy dependencies for testing
-    class DummyRepo:
-        async def get_user_challenges(self, user_id):
-            return []
 
-    class DummyML:
-        pass
+class DummyML:
+    pass
+
+
+class DummyNotif:
+    pass
+
 
-    class DummyNotif:
-        pass
+# ChallengeService holds no per-request state, so one instance serves every request
+_challenge_service = ChallengeService(DummyRepo(), DummyML(), DummyNotif())
 
-    return ChallengeService(DummyRepo(), DummyML(), DummyNotif())
+
+# Dependency function for ChallengeService
+def get_challenge_service() -> ChallengeService:
+    return _challenge_service
 
 
 router = APIRouter(tags=["challenges"])
 
+# Personalized challenges per (user id, profile version); a profile update
+# changes updated_at and so misses the cache
+_personalized_cache = TTLCache(maxsize=10_000, ttl=300)
+
 
 @router.get("/", response_model=List[ChallengeResponse])
 async def get_challenges(
@@ -57,8 +68,13 @@ async def get_personalized_challenges(
     current_user: User = Depends(get_current_user),
 ):
     """Get personalized challenges for the current user"""
+    key = (current_user.id, current_user.updated_at)
+    cached = _personalized_cache.get(key)
+    if cached is not None:
+        return cached
+
     # Stub implementation
-    return {
+    result = {
         "challenges": [
             {
                 "id": 1,
@@ -68,6 +84,8 @@ async def get_personalized_challenges(
             }
         ]
     }
+    _personalized_cache[key] = result
+    return result
 
 
 @router.get("/{challenge_id}", response_model=ChallengeResponse)
@@ -1,14 +1,23 @@
+import threading
+
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_id
 from app.models.user import User
 
 router = APIRouter()
 
+# Recommendations per (user id, profile version); a profile update changes
+# updated_at and so misses the cache. Sync routes run in a threadpool, so
+# access is guarded by a lock.
+_recommendations_cache = TTLCache(maxsize=10_000, ttl=300)
+_recommendations_cache_lock = threading.Lock()
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_community(
     community_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Create a new community"""
     # Stub implementation
@@ -16,7 +25,7 @@ def create_community(
         "id": 1,
         "name": community_data.get("name", "Test Community"),
         "description": community_data.get("description", ""),
-        "created_by": current_user.id,
+        "created_by": current_user_id,
         "category": community_data.get("category", "strength"),
         "privacy_level": community_data.get("privacy_level", "public"),
     }
@@ -25,7 +34,7 @@ def create_community(
 @router.post("/{community_id}/join")
 def join_community(
     community_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Join a community"""
     # Stub implementation
@@ -37,6 +46,12 @@ def get_community_recommendations(
     current_user: User = Depends(get_current_user),
 ):
     """Get personalized community recommendations"""
+    key = (current_user.id, current_user.updated_at)
+    with _recommendations_cache_lock:
+        cached = _recommendations_cache.get(key)
+    if cached is not None:
+        return cached
+
     # Stub implementation
     communities = [
         {
@@ -46,12 +61,16 @@ def get_community_recommendations(
             "match_score": 0.85,
         }
     ]
-    return {"recommendations": communities, "communities": communities}
+    result = {"recommendations": communities, "communities": communities}
+
+    with _recommendations_cache_lock:
+        _recommendations_cache[key] = result
+    return result
 
 
 @router.get("/matching")
 def community_matching_algorithm(
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get community matching algorithm results"""
     # Stub implementation
@@ -65,7 +84,7 @@ def community_matching_algorithm(
 @router.get("/{community_id}/challenges")
 def get_community_challenges(
     community_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get challenges for a specific community (stub)"""
     return {
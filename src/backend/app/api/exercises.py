@@ -3,16 +3,26 @@
 Exercise management endpoints
 """
 
-import json
+from datetime import datetime, timedelta
 from typing import Optional
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from sqlalchemy import and_, or_
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, delete, insert, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
 from app.database import get_db
-from app.models import Exercise, User
+from app.models import (
+    Equipment,
+    Exercise,
+    MuscleGroup,
+    User,
+    Workout,
+    WorkoutExercise,
+    WorkoutStatus,
+)
 from app.schemas.exercise import (
     ExerciseCreate,
     ExerciseResponse,
@@ -21,6 +31,53 @@ from app.schemas.exercise import (
 
 router = APIRouter()
 
+# Both lists come from static enums, so build them once and let clients cache them
+MUSCLE_GROUPS = [mg.value for mg in MuscleGroup]
+EQUIPMENT_TYPES = [eq.value for eq in Equipment]
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _parse_set_values(
+    values: list[Optional[str]], dtype
+) -> tuple[np.ndarray, np.ndarray]:
+    """Parse per-set CSV strings such as "60,65,70" in one batch
+
+    Returns the flattened values and the number of sets on each row.
+    """
+    tokens = [[v for v in (value or "").split(",") if v.strip()] for value in values]
+    counts = np.array([len(row) for row in tokens], dtype=np.intp)
+    flat = np.array([v for row in tokens for v in row], dtype=dtype)
+    return flat, counts
+
+
+def _personal_records(
+    weight_values: list[Optional[str]], rep_values: list[Optional[str]]
+) -> tuple[float, int, float]:
+    """Max weight, max reps and total volume from per-session set CSV strings"""
+    weights, weight_counts = _parse_set_values(weight_values, np.float64)
+    reps, rep_counts = _parse_set_values(rep_values, np.int64)
+    max_weight = float(weights.max()) if weights.size else 0
+    max_reps = int(reps.max()) if reps.size else 0
+
+    # Volume per session is its total reps times its own average weight
+    sessions = len(weight_values)
+    rows = np.arange(sessions)
+    weight_sums = np.bincount(
+        np.repeat(rows, weight_counts), weights=weights, minlength=sessions
+    )
+    rep_sums = np.bincount(
+        np.repeat(rows, rep_counts), weights=reps, minlength=sessions
+    )
+    mean_weights = np.divide(
+        weight_sums,
+        weight_counts,
+        out=np.zeros(sessions),
+        where=weight_counts > 0,
+    )
+    total_volume = float(rep_sums @ mean_weights)
+
+    return max_weight, max_reps, total_volume
+
 
 def exercise_to_response(exercise):
     data = {c.name: getattr(exercise, c.name) for c in exercise.__table__.columns}
@@ -29,7 +86,7 @@ def exercise_to_response(exercise):
 
 
 @router.get("/", response_model=list[ExerciseResponse])
-async def get_exercises(
+def get_exercises(
     muscle_group: Optional[str] = Query(None),
     equipment: Optional[str] = Query(None),
     exercise_type: Optional[str] = Query(None),
@@ -39,7 +96,7 @@ async def get_exercises(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
-) -> list[dict]:
+) -> ORJSONResponse:
     """
     Get exercises with optional filters (public endpoint)
     """
@@ -62,6 +119,8 @@ async def get_exercises(
         query = query.filter(Exercise.difficulty <= difficulty_max)
 
     if search:
+        # Substring match; on PostgreSQL the trigram GIN indexes on name and
+        # description serve it
         query = query.filter(
             or_(
                 Exercise.name.ilike(f"%{search}%"),
@@ -69,37 +128,34 @@ async def get_exercises(
             )
         )
 
-    # Get total count before pagination
-    total = query.count()
-
     # Apply pagination
     exercises = query.offset(skip).limit(limit).all()
 
-    return [exercise_to_response(e) for e in exercises]
+    # Rows come straight from the table, so skip response_model re-validation
+    # and let orjson encode the page directly
+    return ORJSONResponse([exercise_to_response(e) for e in exercises])
 
 
 @router.get("/muscle-groups", response_model=list[str])
-async def get_muscle_groups() -> list[str]:
+async def get_muscle_groups(response: Response) -> list[str]:
     """
     Get all available muscle groups (public endpoint)
     """
-    from app.models import MuscleGroup
-
-    return [mg.value for mg in MuscleGroup]
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return MUSCLE_GROUPS
 
 
 @router.get("/equipment", response_model=list[str])
-async def get_equipment_types() -> list[str]:
+async def get_equipment_types(response: Response) -> list[str]:
     """
     Get all available equipment types (public endpoint)
     """
-    from app.models import Equipment
-
-    return [eq.value for eq in Equipment]
+    response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return EQUIPMENT_TYPES
 
 
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
-async def get_exercise(exercise_id: int, db: Session = Depends(get_db)) -> dict:
+def get_exercise(exercise_id: int, db: Session = Depends(get_db)) -> dict:
     """
     Get a specific exercise by ID (public endpoint)
     """
@@ -112,7 +168,7 @@ async def get_exercise(exercise_id: int, db: Session = Depends(get_db)) -> dict:
 
 
 @router.post("/", response_model=ExerciseResponse, status_code=201)
-async def create_exercise(
+def create_exercise(
     exercise_data: ExerciseCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -130,18 +186,18 @@ async def create_exercise(
             status_code=400, detail="Exercise with this name already exists"
         )
 
-    exercise = Exercise(**exercise_data.dict(exclude={"secondary_muscles"}))
-    if exercise_data.secondary_muscles:
-        exercise.secondary_muscles = json.dumps(exercise_data.secondary_muscles)
-    db.add(exercise)
+    # RETURNING hands back the stored row, so no refresh SELECT is needed
+    exercise = db.scalars(
+        insert(Exercise).values(**exercise_data.dict()).returning(Exercise)
+    ).one()
+    response = exercise_to_response(exercise)
     db.commit()
-    db.refresh(exercise)
 
-    return exercise_to_response(exercise)
+    return response
 
 
 @router.put("/{exercise_id}", response_model=ExerciseResponse)
-async def update_exercise(
+def update_exercise(
     exercise_id: int,
     exercise_update: ExerciseUpdate,
     current_user: User = Depends(get_current_user),
@@ -150,27 +206,30 @@ async def update_exercise(
     """
     Update an exercise (authenticated endpoint)
     """
-    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
+    update_data = exercise_update.dict(exclude_unset=True)
+    if update_data:
+        # RETURNING hands back the updated row, so no refresh SELECT is needed
+        statement = (
+            update(Exercise)
+            .where(Exercise.id == exercise_id)
+            .values(**update_data)
+            .returning(Exercise)
+        )
+    else:
+        statement = select(Exercise).where(Exercise.id == exercise_id)
+    exercise = db.scalars(statement).one_or_none()
 
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
-    # Update fields
-    update_data = exercise_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if field == "secondary_muscles" and value is not None:
-            exercise.secondary_muscles = json.dumps(value)
-        else:
-            setattr(exercise, field, value)
-
+    response = exercise_to_response(exercise)
     db.commit()
-    db.refresh(exercise)
 
-    return exercise_to_response(exercise)
+    return response
 
 
 @router.delete("/{exercise_id}", status_code=204)
-async def delete_exercise(
+def delete_exercise(
     exercise_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -178,82 +237,69 @@ async def delete_exercise(
     """
     Delete an exercise (authenticated endpoint)
     """
-    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
-    if not exercise:
+    # RETURNING reports whether the row existed, so no SELECT is needed first
+    deleted_id = db.scalars(
+        delete(Exercise).where(Exercise.id == exercise_id).returning(Exercise.id)
+    ).one_or_none()
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Exercise not found")
-    db.delete(exercise)
     db.commit()
     return Response(status_code=204)
 
 
 @router.get("/{exercise_id}/history")
-async def get_exercise_history(
+def get_exercise_history(
     exercise_id: int,
     days: int = Query(30, ge=1, le=365),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> dict:
+) -> ORJSONResponse:
     """
     Get user's history with a specific exercise (authenticated endpoint)
     """
-    from datetime import datetime, timedelta
-
-    from app.models import Workout, WorkoutExercise
-
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
     history = (
-        db.query(WorkoutExercise)
+        db.query(WorkoutExercise, Workout.completed_at)
         .join(Workout)
         .filter(
             and_(
                 WorkoutExercise.exercise_id == exercise_id,
                 Workout.user_id == current_user.id,
                 Workout.completed_at >= cutoff_date,
-                Workout.status == "completed",
+                Workout.status == WorkoutStatus.COMPLETED,
             )
         )
         .order_by(Workout.completed_at.desc())
         .all()
     )
 
+    history_data = [
+        {
+            "date": completed_at,
+            "sets": record.sets,
+            "reps": record.actual_reps or record.reps,
+            "weight": record.actual_weight or record.weight,
+            "notes": record.notes,
+        }
+        for record, completed_at in history
+    ]
+
     # Calculate personal records
-    max_weight = 0
-    max_reps = 0
-    total_volume = 0
-
-    history_data = []
-    for record in history:
-        if record.actual_weight:
-            weights = [float(w) for w in record.actual_weight.split(",") if w]
-            if weights:
-                max_weight = max(max_weight, max(weights))
-
-        if record.actual_reps:
-            reps = [int(r) for r in record.actual_reps.split(",") if r]
-            if reps:
-                max_reps = max(max_reps, max(reps))
-                total_volume += sum(reps) * (
-                    sum(weights) / len(weights) if weights else 0
-                )
-
-        history_data.append(
-            {
-                "date": record.workout.completed_at,
-                "sets": record.sets,
-                "reps": record.actual_reps or record.reps,
-                "weight": record.actual_weight or record.weight,
-                "notes": record.notes,
-            }
-        )
+    max_weight, max_reps, total_volume = _personal_records(
+        [record.actual_weight for record, _ in history],
+        [record.actual_reps for record, _ in history],
+    )
 
-    return {
-        "exercise_id": exercise_id,
-        "total_sessions": len(history),
-        "personal_records": {
-            "max_weight": max_weight,
-            "max_reps": max_reps,
-            "total_volume": total_volume,
-        },
-        "history": history_data,
-    }
+    return ORJSONResponse(
+        {
+            "exercise_id": exercise_id,
+            "total_sessions": len(history),
+            "personal_records": {
+                "max_weight": max_weight,
+                "max_reps": max_reps,
+                "total_volume": total_volume,
+            },
+            "history": history_data,
+        }
+    )
@@ -3,74 +3,193 @@
 Recommendations API - Updated for stateless ML models
 """
 
-from typing import Any
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-
-from app.database import get_db
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, load_only
+
+from app.database import SessionLocal, get_db
 from app.models import Exercise, User
 from app.services.data_service import DataService
+from app.services.ml.exercise_scorer import exercise_scorer
 from app.services.ml_client import ml_client
 from app.api.auth import get_current_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Columns needed to format an exercise recommendation
+EXERCISE_DETAIL_COLUMNS = load_only(
+    Exercise.id,
+    Exercise.name,
+    Exercise.primary_muscle,
+    Exercise.equipment,
+    Exercise.difficulty,
+)
+
+# Similar users per (user id, n_recommendations, similarity model version).
+# The version comes from the ML service, so a retrain or reload there, or in
+# another worker, moves every worker onto fresh keys. Sync routes run in a
+# threadpool, so access is guarded by a lock.
+_similar_users_cache = TTLCache(maxsize=10_000, ttl=900)
+_similar_users_cache_lock = threading.Lock()
+
+# How long a worker trusts the last similarity model version it read
+SIMILARITY_VERSION_TTL = 30
+_similarity_version_cache = TTLCache(maxsize=1, ttl=SIMILARITY_VERSION_TTL)
+
+
+def _similarity_model_version() -> Optional[str]:
+    """Current similarity model version, None if the ML service can't say"""
+    with _similar_users_cache_lock:
+        if "version" in _similarity_version_cache:
+            return _similarity_version_cache["version"]
+
+    try:
+        status = ml_client.get_model_status()
+    except Exception as e:
+        logger.warning(f"Failed to read similarity model version: {e}")
+        return None
+    version = status.get("user_similarity_model", {}).get("version")
+
+    with _similar_users_cache_lock:
+        _similarity_version_cache["version"] = version
+    return version
+
+
+def _clear_similar_users_cache() -> None:
+    with _similar_users_cache_lock:
+        _similar_users_cache.clear()
+        _similarity_version_cache.clear()
+
+
+# Only one request per worker refits the scorer; the others keep scoring
+# with the previous fit meanwhile
+_exercise_scorer_refit_lock = threading.Lock()
+
+
+def _fit_exercise_scorer(db: Session, version: Optional[str]) -> None:
+    data_service = DataService(db)
+    # Same column order as DataService.get_user_interaction_vector
+    exercise_ids = [eid for (eid,) in db.query(Exercise.id).order_by(Exercise.id)]
+    exercise_scorer.fit(
+        data_service.get_user_exercise_interactions(), exercise_ids, version=version
+    )
+
+
+def _refit_exercise_scorer_if_stale(db: Session) -> None:
+    """Refit the scorer when the ML models have moved to a new version
+
+    Training or loading models through another worker changes the version,
+    so every worker catches up on its next recommendation request.
+    """
+    version = _similarity_model_version()
+    if version is None or version == exercise_scorer.version:
+        return
+    if not _exercise_scorer_refit_lock.acquire(blocking=False):
+        return
+    try:
+        if version != exercise_scorer.version:
+            _fit_exercise_scorer(db, version)
+    finally:
+        _exercise_scorer_refit_lock.release()
+
+
+def _fit_exercise_scorer_from_db() -> None:
+    db = SessionLocal()
+    try:
+        _fit_exercise_scorer(db, _similarity_model_version())
+    finally:
+        db.close()
+
+
+async def warm_exercise_scorer() -> None:
+    """Fit the in-process scorer at startup
+
+    Every worker fits its own scorer from the database, so none of them stays
+    cold (and silently falls back to the ML service) until a recommendation
+    request notices a new model version. Failing only costs the warm start.
+    """
+    try:
+        await asyncio.to_thread(_fit_exercise_scorer_from_db)
+    except Exception as e:
+        logger.warning(f"Failed to fit exercise scorer at startup: {e}")
+
 
 @router.get("/exercises/{user_id}")
-async def get_exercise_recommendations(
+def get_exercise_recommendations(
     user_id: int, n_recommendations: int = 10, db: Session = Depends(get_db)
-) -> list[dict[str, Any]]:
+) -> ORJSONResponse:
     """Get exercise recommendations for a user"""
     try:
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Get user's interaction vector
+        # Get user's interaction vector, None for an unknown user
         data_service = DataService(db)
         user_interactions = data_service.get_user_interaction_vector(user_id)
+        if user_interactions is None:
+            raise HTTPException(status_code=404, detail="User not found")
 
-        # Get recommendations from ML service
-        response = ml_client.get_exercise_recommendations(
-            user_id=user_id,
-            user_interactions=user_interactions,
-            n_recommendations=n_recommendations,
+        # Score in-process when the local model can answer, otherwise ask the
+        # ML service
+        _refit_exercise_scorer_if_stale(db)
+        recommendations = exercise_scorer.recommend(
+            user_interactions, n_recommendations, user_id=user_id
+        )
+        if recommendations is None:
+            response = ml_client.get_exercise_recommendations(
+                user_id=user_id,
+                user_interactions=user_interactions,
+                n_recommendations=n_recommendations,
+            )
+            recommendations = response.get("recommendations", [])
+
+        # The database stays the source of truth for exercise details, so
+        # renamed or deleted exercises are reflected before the next retrain
+        exercises = (
+            db.query(Exercise)
+            .options(EXERCISE_DETAIL_COLUMNS)
+            .filter(Exercise.id.in_([rec["exercise_id"] for rec in recommendations]))
+            .all()
+        )
+        details = {
+            exercise.id: {
+                "exercise_id": exercise.id,
+                "name": exercise.name,
+                "primary_muscle": (
+                    exercise.primary_muscle.value if exercise.primary_muscle else None
+                ),
+                "equipment": exercise.equipment.value if exercise.equipment else None,
+                "difficulty": exercise.difficulty,
+            }
+            for exercise in exercises
+        }
+
+        # The IN query returns rows in no particular order; walking the
+        # ranked recommendations and looking each one up by id restores the
+        # ranking in one pass and drops exercises deleted since scoring.
+        # Rows are plain str/int/float values, so skip response-model
+        # validation and let orjson encode them directly
+        return ORJSONResponse(
+            [
+                {
+                    **details[rec["exercise_id"]],
+                    "predicted_rating": rec["predicted_rating"],
+                }
+                for rec in recommendations
+                if details.get(rec["exercise_id"])
+            ]
         )
 
-        # Get exercise details for recommendations
-        recommendations = response.get("recommendations", [])
-        exercise_ids = [rec["exercise_id"] for rec in recommendations]
-
-        exercises = db.query(Exercise).filter(Exercise.id.in_(exercise_ids)).all()
-        exercise_map = {ex.id: ex for ex in exercises}
-
-        # Format response
-        result = []
-        for rec in recommendations:
-            exercise_id = rec["exercise_id"]
-            if exercise_id in exercise_map:
-                exercise = exercise_map[exercise_id]
-                result.append(
-                    {
-                        "exercise_id": exercise_id,
-                        "name": exercise.name,
-                        "primary_muscle": (
-                            exercise.primary_muscle.value
-                            if exercise.primary_muscle
-                            else None
-                        ),
-                        "equipment": (
-                            exercise.equipment.value if exercise.equipment else None
-                        ),
-                        "difficulty": exercise.difficulty,
-                        "predicted_rating": rec["predicted_rating"],
-                    }
-                )
-
-        return result
-
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error getting recommendations: {e!s}"
@@ -78,20 +197,25 @@ async def get_exercise_recommendations(
 
 
 @router.get("/similar-users/{user_id}")
-async def get_similar_users(
+def get_similar_users(
     user_id: int, n_recommendations: int = 5, db: Session = Depends(get_db)
-) -> list[dict[str, Any]]:
+) -> ORJSONResponse:
     """Get similar users based on user features"""
-    try:
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+    # Without a known model version nothing is read from or written to the cache
+    version = _similarity_model_version()
+    key = (user_id, n_recommendations, version) if version else None
+    if key is not None:
+        with _similar_users_cache_lock:
+            cached = _similar_users_cache.get(key)
+        if cached is not None:
+            return ORJSONResponse(cached)
 
-        # Get user's feature vector
+    try:
+        # Get user's feature vector, None for an unknown user
         data_service = DataService(db)
         user_features = data_service.get_user_features(user_id)
-
+        if user_features is None:
+            raise HTTPException(status_code=404, detail="User not found")
         if not user_features:
             raise HTTPException(
                 status_code=400, detail="Unable to extract user features"
@@ -135,8 +259,13 @@ async def get_similar_users(
                     }
                 )
 
-        return result
+        if key is not None:
+            with _similar_users_cache_lock:
+                _similar_users_cache[key] = result
+        return ORJSONResponse(result)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error getting similar users: {e!s}"
@@ -144,7 +273,7 @@ async def get_similar_users(
 
 
 @router.post("/train-models")
-async def train_ml_models(db: Session = Depends(get_db)) -> dict[str, str]:
+def train_ml_models(db: Session = Depends(get_db)) -> dict[str, str]:
     """Train ML models with current data"""
     try:
         # Get all data for training
@@ -156,28 +285,37 @@ async def train_ml_models(db: Session = Depends(get_db)) -> dict[str, str]:
                 status_code=400, detail="Insufficient data for training"
             )
 
-        # Train user similarity model
-        ml_client.train_user_similarity_model(
-            users_data=users_data,
-            interactions_data=interactions_data,
-            exercise_ids=exercise_ids,
-        )
-
-        # Train exercise recommender model
-        ml_client.train_exercise_recommender(
-            users_data=users_data,
-            interactions_data=interactions_data,
-            exercise_ids=exercise_ids,
+        # Train the user similarity and exercise recommender models
+        # concurrently; both calls mostly wait on the ML service
+        training_data = {
+            "users_data": users_data,
+            "interactions_data": interactions_data,
+            "exercise_ids": exercise_ids,
+        }
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            trainings = [
+                executor.submit(ml_client.train_user_similarity_model, **training_data),
+                executor.submit(ml_client.train_exercise_recommender, **training_data),
+            ]
+            for training in trainings:
+                training.result()
+
+        # Refit the in-process scorer on the same data, under the new version
+        _clear_similar_users_cache()
+        exercise_scorer.fit(
+            interactions_data, exercise_ids, version=_similarity_model_version()
         )
 
         return {"message": "ML models trained successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error training models: {e!s}")
 
 
 @router.get("/ml-status")
-async def get_ml_service_status() -> dict[str, Any]:
+def get_ml_service_status() -> dict[str, Any]:
     """Get ML service status and model information"""
     try:
         status = ml_client.get_model_status()
@@ -187,7 +325,7 @@ async def get_ml_service_status() -> dict[str, Any]:
 
 
 @router.post("/save-models")
-async def save_ml_models() -> dict[str, str]:
+def save_ml_models() -> dict[str, str]:
     """Save trained ML models to disk"""
     try:
         ml_client.save_models()
@@ -197,54 +335,67 @@ async def save_ml_models() -> dict[str, str]:
 
 
 @router.post("/load-models")
-async def load_ml_models() -> dict[str, str]:
+def load_ml_models() -> dict[str, str]:
     """Load trained ML models from disk"""
     try:
         ml_client.load_models()
+        _clear_similar_users_cache()
         return {"message": "Models loaded successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading models: {e!s}")
 
 
+# Onboarding recommendations are static for now; encode once and let clients
+# revalidate with the content-derived ETag
+ONBOARDING_RECOMMENDATIONS = {
+    "message": "Personalized recommendations",
+    "recommendations": [
+        "Complete your first workout",
+        "Join a fitness community",
+        "Set up accountability partnerships",
+    ],
+    "challenges": [
+        {
+            "id": 1,
+            "name": "7-Day Starter Challenge",
+            "description": "Complete a workout every day for a week.",
+        },
+        {
+            "id": 2,
+            "name": "Community Joiner",
+            "description": "Join your first community group.",
+        },
+    ],
+    "communities": [
+        {
+            "id": 1,
+            "name": "Beginners United",
+            "description": "A welcoming group for new members.",
+        },
+        {
+            "id": 2,
+            "name": "Strength Seekers",
+            "description": "For those focused on strength training.",
+        },
+    ],
+    "friends_suggestions": [
+        {"id": 1, "username": "fit_jane", "mutual_friends": 3},
+        {"id": 2, "username": "workout_mike", "mutual_friends": 2},
+    ],
+}
+ONBOARDING_BODY = orjson.dumps(ONBOARDING_RECOMMENDATIONS)
+ONBOARDING_ETAG = f'"{hashlib.sha256(ONBOARDING_BODY).hexdigest()[:16]}"'
+
+
 @router.get("/onboarding")
 def get_onboarding_recommendations(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """Stub: Get personalized recommendations for onboarding"""
-    return {
-        "message": "Personalized recommendations",
-        "recommendations": [
-            "Complete your first workout",
-            "Join a fitness community",
-            "Set up accountability partnerships",
-        ],
-        "challenges": [
-            {
-                "id": 1,
-                "name": "7-Day Starter Challenge",
-                "description": "Complete a workout every day for a week.",
-            },
-            {
-                "id": 2,
-                "name": "Community Joiner",
-                "description": "Join your first community group.",
-            },
-        ],
-        "communities": [
-            {
-                "id": 1,
-                "name": "Beginners United",
-                "description": "A welcoming group for new members.",
-            },
-            {
-                "id": 2,
-                "name": "Strength Seekers",
-                "description": "For those focused on strength training.",
-            },
-        ],
-        "friends_suggestions": [
-            {"id": 1, "username": "fit_jane", "mutual_friends": 3},
-            {"id": 2, "username": "workout_mike", "mutual_friends": 2},
-        ],
-    }
+    headers = {"ETag": ONBOARDING_ETAG, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == ONBOARDING_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=ONBOARDING_BODY, media_type="application/json", headers=headers
+    )
@@ -4,26 +4,118 @@ Social features API endpoints
 """
 
 import logging
+import secrets
 from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.api.auth import get_current_user
-from app.database import get_db
+from functools import lru_cache
+
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Response,
+    status,
+)
+from redis.exceptions import RedisError
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+
+from app.api.auth import get_current_user, get_current_user_id
+from app.api.users import USER_RESPONSE_COLUMNS, user_response_rows
+from app.core.config import get_external_services_config
+from app.database import get_db, redis_client
 from app.models.friendship import Friendship
 from app.models.user import User
 from app.schemas.user import UserResponse
 from app.models.safety import UserBlock, UserReport
 from app.models.friend_invitation import FriendInvitation
+from app.services.external.email_service import EmailService
+from app.services.external.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Encoded friend lists and safety status are cached in Redis, shared by all
+# workers. Handlers that change them delete the affected keys; the TTL bounds
+# how long friends' own profile edits can go unseen.
+SOCIAL_CACHE_TTL = 60
+
+# Any friendship between users :a and :b, in either direction. Built once at
+# import; callers only bind the two ids
+FRIENDSHIP_PAIR = (
+    select(Friendship.id)
+    .where(
+        or_(
+            and_(
+                Friendship.user_id == bindparam("a"),
+                Friendship.friend_id == bindparam("b"),
+            ),
+            and_(
+                Friendship.user_id == bindparam("b"),
+                Friendship.friend_id == bindparam("a"),
+            ),
+        )
+    )
+    .limit(1)
+)
+
+
+def _friends_key(user_id: int) -> str:
+    return f"friends:{user_id}"
+
+
+def _friend_requests_key(user_id: int) -> str:
+    return f"friend_requests:{user_id}"
+
+
+def _safety_status_key(user_id: int) -> str:
+    return f"safety_status:{user_id}"
+
+
+def _cached_json(key: str, build) -> Response:
+    """Serve a JSON body from Redis, building and storing it on a miss
+
+    Redis being unavailable only costs the cache: the body is built from the
+    database as if it were a miss.
+    """
+    try:
+        body = redis_client.get(key)
+    except RedisError as e:
+        logger.debug(f"Redis unavailable, not caching {key}: {e}")
+        return Response(content=orjson.dumps(build()), media_type="application/json")
+
+    if body is None:
+        body = orjson.dumps(build())
+        try:
+            redis_client.set(key, body, ex=SOCIAL_CACHE_TTL)
+        except RedisError as e:
+            logger.debug(f"Failed to cache {key}: {e}")
+    return Response(content=body, media_type="application/json")
+
+
+def _invalidate(*keys: str) -> None:
+    try:
+        redis_client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate {keys}: {e}")
+
 
 @router.post("/friends/request/{username}")
-async def send_friend_request(
+def send_friend_request(
     username: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -35,49 +127,72 @@ async def send_friend_request(
             detail="Cannot send friend request to yourself",
         )
 
-    # Find target user
-    target_user = db.query(User).filter(User.username == username).first()
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-
-    # Check if friendship already exists
-    existing_friendship = (
-        db.query(Friendship)
-        .filter(
-            (
-                (Friendship.user_id == current_user.id)
-                & (Friendship.friend_id == target_user.id)
+    if db.get_bind().dialect.name == "postgresql":
+        # Resolve the target and insert in one statement; ux_friendships_pair
+        # makes either direction of an existing pair a conflict, so the
+        # insert doubles as the existence check
+        friendship = db.execute(
+            pg_insert(Friendship)
+            .from_select(
+                ["user_id", "friend_id", "status"],
+                select(literal(current_user.id), User.id, literal("pending")).where(
+                    User.username == username
+                ),
             )
-            | (
-                (Friendship.user_id == target_user.id)
-                & (Friendship.friend_id == current_user.id)
+            .on_conflict_do_nothing()
+            .returning(Friendship.id, Friendship.created_at, Friendship.friend_id)
+        ).first()
+        if friendship is None:
+            # Only the failure path pays for telling the two cases apart
+            if db.scalar(select(User.id).where(User.username == username)) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Friendship request already exists",
+            )
+        db.commit()
+        target_user_id = friendship.friend_id
+    else:
+        # Find target user
+        target_user_id = db.scalar(select(User.id).where(User.username == username))
+        if target_user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
-        )
-        .first()
-    )
 
-    if existing_friendship:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Friendship request already exists",
+        # Check if friendship already exists
+        existing_friendship = db.scalar(
+            FRIENDSHIP_PAIR, {"a": current_user.id, "b": target_user_id}
         )
 
-    # Create friendship request
-    friendship = Friendship(
-        user_id=current_user.id, friend_id=target_user.id, status="pending"
-    )
+        if existing_friendship is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Friendship request already exists",
+            )
 
-    db.add(friendship)
-    db.commit()
+        # Create friendship request
+        friendship = db.execute(
+            insert(Friendship)
+            .values(user_id=current_user.id, friend_id=target_user_id, status="pending")
+            .returning(Friendship.id, Friendship.created_at)
+        ).first()
+        db.commit()
+
+    _invalidate(_friend_requests_key(target_user_id))
 
     logger.info(f"Friend request sent from {current_user.username} to {username}")
-    return {"message": "Friend request sent successfully"}
+    return {
+        "message": "Friend request sent successfully",
+        "friendship_id": friendship.id,
+        "created_at": friendship.created_at,
+    }
 
 
 @router.put("/friends/accept/{friendship_id}")
-async def accept_friend_request(
+def accept_friend_request(
     friendship_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -99,14 +214,21 @@ async def accept_friend_request(
         )
 
     friendship.status = "accepted"
+    friendship.is_accepted = True
+    friendship.accepted_at = datetime.utcnow()
     db.commit()
+    _invalidate(
+        _friends_key(current_user.id),
+        _friends_key(friendship.user_id),
+        _friend_requests_key(current_user.id),
+    )
 
     logger.info(f"Friend request accepted by {current_user.username}")
     return {"message": "Friend request accepted"}
 
 
 @router.put("/friends/reject/{friendship_id}")
-async def reject_friend_request(
+def reject_friend_request(
     friendship_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -129,60 +251,158 @@ async def reject_friend_request(
 
     db.delete(friendship)
     db.commit()
+    _invalidate(_friend_requests_key(current_user.id))
 
     logger.info(f"Friend request rejected by {current_user.username}")
     return {"message": "Friend request rejected"}
 
 
 @router.get("/friends", response_model=list[UserResponse])
-async def get_friends(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+def get_friends(
+    current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)
 ):
     """Get current user's friends"""
-    friendships = (
-        db.query(Friendship)
-        .filter(
-            (
-                (Friendship.user_id == current_user.id)
-                | (Friendship.friend_id == current_user.id)
-            ),
-            Friendship.status == "accepted",
-        )
-        .all()
-    )
 
-    friend_ids = []
-    for friendship in friendships:
-        if friendship.user_id == current_user.id:
-            friend_ids.append(friendship.friend_id)
-        else:
-            friend_ids.append(friendship.user_id)
+    def load_friends():
+        # Join from whichever side of the friendship the current user is on
+        return db.execute(
+            select(*USER_RESPONSE_COLUMNS)
+            .join(
+                Friendship,
+                or_(
+                    and_(
+                        Friendship.user_id == current_user_id,
+                        Friendship.friend_id == User.id,
+                    ),
+                    and_(
+                        Friendship.friend_id == current_user_id,
+                        Friendship.user_id == User.id,
+                    ),
+                ),
+            )
+            .where(Friendship.status == "accepted")
+        )
 
-    friends = db.query(User).filter(User.id.in_(friend_ids)).all()
-    return friends
+    return _cached_json(
+        _friends_key(current_user_id), lambda: user_response_rows(load_friends())
+    )
 
 
 @router.get("/friends/requests", response_model=list[UserResponse])
-async def get_friend_requests(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+def get_friend_requests(
+    current_user_id: int = Depends(get_current_user_id), db: Session = Depends(get_db)
 ):
     """Get pending friend requests for current user"""
-    pending_friendships = (
-        db.query(Friendship)
-        .filter(Friendship.friend_id == current_user.id, Friendship.status == "pending")
-        .all()
+
+    def load_requesters():
+        return db.execute(
+            select(*USER_RESPONSE_COLUMNS)
+            .join(Friendship, Friendship.user_id == User.id)
+            .where(
+                Friendship.friend_id == current_user_id,
+                Friendship.status == "pending",
+            )
+        )
+
+    return _cached_json(
+        _friend_requests_key(current_user_id),
+        lambda: user_response_rows(load_requesters()),
     )
 
-    requester_ids = [friendship.user_id for friendship in pending_friendships]
-    requesters = db.query(User).filter(User.id.in_(requester_ids)).all()
 
-    return requesters
+@router.get("/friends/suggestions")
+def get_friend_suggestions(
+    limit: int = 10,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """Suggest friends of friends, ranked by number of mutual friends"""
+    me = current_user_id
+    my_friends = (
+        select(
+            case(
+                (Friendship.user_id == me, Friendship.friend_id),
+                else_=Friendship.user_id,
+            ).label("friend_id")
+        )
+        .where(
+            or_(Friendship.user_id == me, Friendship.friend_id == me),
+            Friendship.status == "accepted",
+        )
+        .cte("my_friends")
+    )
+
+    # Every accepted friendship of one of my friends points at a candidate
+    their_friendship = aliased(Friendship)
+    candidate_id = case(
+        (
+            their_friendship.user_id == my_friends.c.friend_id,
+            their_friendship.friend_id,
+        ),
+        else_=their_friendship.user_id,
+    )
+    mutual_counts = (
+        select(
+            candidate_id.label("user_id"),
+            func.count().label("mutual_friends"),
+        )
+        .select_from(my_friends)
+        .join(
+            their_friendship,
+            or_(
+                their_friendship.user_id == my_friends.c.friend_id,
+                their_friendship.friend_id == my_friends.c.friend_id,
+            ),
+        )
+        .where(
+            their_friendship.status == "accepted",
+            candidate_id != me,
+            candidate_id.not_in(select(my_friends.c.friend_id)),
+        )
+        .group_by(candidate_id)
+        .subquery()
+    )
+
+    suggestions = db.execute(
+        select(User.id, User.username, mutual_counts.c.mutual_friends)
+        .join(mutual_counts, mutual_counts.c.user_id == User.id)
+        .order_by(mutual_counts.c.mutual_friends.desc(), User.id)
+        .limit(limit)
+    )
+    return [
+        {"id": user_id, "username": username, "mutual_friends": mutual_friends}
+        for user_id, username, mutual_friends in suggestions
+    ]
 
 
 # Friend Invitation System Endpoints
+@lru_cache(maxsize=1)
+def _email_service() -> EmailService:
+    return EmailService(config=get_external_services_config(), logger=logger)
+
+
+@lru_cache(maxsize=1)
+def _notification_service() -> NotificationService:
+    return NotificationService(config=get_external_services_config(), logger=logger)
+
+
+async def _deliver_invitation(
+    invitation_type: str, recipient: str, invitation_code: str, message: str
+) -> None:
+    """Send an invitation by email or SMS; failures are logged by the services"""
+    text = f"{message}\n\nJoin with invitation code {invitation_code}".lstrip()
+    if invitation_type == "email":
+        await _email_service().send_email(
+            recipient, "You're invited to Pulse Fitness", text
+        )
+    else:
+        await _notification_service().send_sms(recipient, text)
+
+
 @router.post("/invitations/send")
-async def send_friend_invitation(
+def send_friend_invitation(
     invitation_data: dict,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -206,8 +426,9 @@ async def send_friend_invitation(
     else:
         raise HTTPException(status_code=400, detail="Invalid invitation_type")
 
-    # Generate invitation code
-    invitation_code = f"inv_{current_user.id}_{int(datetime.utcnow().timestamp())}"
+    # Random, unguessable code; accept_friend_invitation looks it up through
+    # the unique index on invitation_code
+    invitation_code = secrets.token_urlsafe(16)
     status_value = "pending"
     # Create invitation record
     invitation = FriendInvitation(
@@ -222,6 +443,16 @@ async def send_friend_invitation(
     )
     db.add(invitation)
     db.commit()
+
+    # Deliver after the response is sent, so the request never waits on the
+    # email or SMS provider
+    background_tasks.add_task(
+        _deliver_invitation,
+        invitation_type,
+        invitee_email if invitation_type == "email" else invitee_phone,
+        invitation_code,
+        personalized_message,
+    )
     return {
         "message": "Invitation sent",
         "invitation_code": invitation_code,
@@ -231,51 +462,69 @@ async def send_friend_invitation(
 
 
 @router.post("/invitations/accept/{invitation_code}")
-async def accept_friend_invitation(
+def accept_friend_invitation(
     invitation_code: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Accept a friend invitation"""
-    # Find the invitation
-    invitation = (
-        db.query(FriendInvitation)
-        .filter(
+    accepted_at = datetime.utcnow()
+    # Claiming the invitation with a conditional UPDATE makes accepting it
+    # atomic: of two concurrent accepts only one gets the inviter back
+    claim = (
+        update(FriendInvitation)
+        .where(
             FriendInvitation.invitation_code == invitation_code,
             FriendInvitation.status == "pending",
         )
-        .first()
+        .values(status="accepted", accepted_at=accepted_at)
+        .returning(FriendInvitation.inviter_id)
     )
 
-    if not invitation:
+    if db.get_bind().dialect.name == "postgresql":
+        # Claim and befriend in one statement, with the UPDATE as a CTE
+        claimed = claim.cte("claimed")
+        inviter_id = db.scalar(
+            insert(Friendship)
+            .from_select(
+                ["user_id", "friend_id", "status", "is_accepted", "accepted_at"],
+                select(
+                    claimed.c.inviter_id,
+                    literal(current_user.id),
+                    literal("accepted"),
+                    literal(True),
+                    literal(accepted_at),
+                ),
+            )
+            .returning(Friendship.user_id)
+        )
+    else:
+        inviter_id = db.scalar(claim)
+        if inviter_id is not None:
+            db.execute(
+                insert(Friendship).values(
+                    user_id=inviter_id,
+                    friend_id=current_user.id,
+                    status="accepted",
+                    is_accepted=True,
+                    accepted_at=accepted_at,
+                )
+            )
+
+    if inviter_id is None:
         raise HTTPException(
             status_code=404, detail="Invitation not found or already used"
         )
 
-    # Create friendship
-    friendship = Friendship(
-        user_id=invitation.inviter_id,
-        friend_id=current_user.id,
-        status="accepted",
-        is_accepted=True,
-        accepted_at=datetime.utcnow(),
-    )
-
-    # Update invitation status
-    invitation.status = "accepted"
-    invitation.accepted_user_id = current_user.id
-    invitation.accepted_at = datetime.utcnow()
-
-    db.add(friendship)
     db.commit()
+    _invalidate(_friends_key(current_user.id), _friends_key(inviter_id))
 
     return {"status": "accepted"}
 
 
 @router.get("/invitations/status")
-async def get_invitation_status(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+def get_invitation_status(
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get invitation status dashboard"""
     # Stub implementation
@@ -286,10 +535,9 @@ async def get_invitation_status(
 
 
 @router.post("/invitations/import-contacts")
-async def import_contacts(
+def import_contacts(
     contacts_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Import contacts and find existing users"""
     # Stub implementation
@@ -301,10 +549,9 @@ async def import_contacts(
 
 # Community Management Endpoints
 @router.post("/communities/")
-async def create_community(
+def create_community(
     community_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Create a new community"""
     # Stub implementation
@@ -312,31 +559,25 @@ async def create_community(
         "id": 1,
         "name": community_data.get("name", "Test Community"),
         "description": community_data.get("description", ""),
-        "created_by": current_user.id,
+        "created_by": current_user_id,
         "category": community_data.get("category", "strength"),
         "privacy_level": community_data.get("privacy_level", "public"),
     }
 
 
 @router.post("/communities/{community_id}/join")
-async def join_community(
+def join_community(
     community_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Join a community"""
     # Stub implementation
     return {"status": "joined"}
 
 
-@router.get("/communities/recommendations")
-async def get_community_recommendations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """Get personalized community recommendations"""
-    # Stub implementation
-    return {
+# Stub payloads are static, so they are encoded once at import
+COMMUNITY_RECOMMENDATIONS_BODY = orjson.dumps(
+    {
         "recommendations": [
             {
                 "id": 1,
@@ -346,12 +587,23 @@ async def get_community_recommendations(
             }
         ]
     }
+)
+
+
+@router.get("/communities/recommendations")
+def get_community_recommendations(
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """Get personalized community recommendations"""
+    # Stub implementation
+    return Response(
+        content=COMMUNITY_RECOMMENDATIONS_BODY, media_type="application/json"
+    )
 
 
 @router.get("/communities/matching")
-async def community_matching_algorithm(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+def community_matching_algorithm(
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get community matching algorithm results"""
     # Stub implementation
@@ -364,90 +616,99 @@ async def community_matching_algorithm(
 
 # Privacy Controls Endpoints
 @router.post("/privacy/controls")
-async def set_privacy_controls(
+def set_privacy_controls(
     privacy_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Set privacy controls"""
     # Stub implementation
     return {"message": "Privacy controls updated successfully"}
 
 
-@router.get("/privacy/controls")
-async def get_privacy_controls(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """Get privacy controls"""
-    # Stub implementation
-    return {
+PRIVACY_CONTROLS_BODY = orjson.dumps(
+    {
         "profile_visibility": "public",
         "workout_visibility": "friends_only",
         "stats_visibility": "private",
     }
+)
+
+
+@router.get("/privacy/controls")
+def get_privacy_controls(
+    current_user_id: int = Depends(get_current_user_id),
+):
+    """Get privacy controls"""
+    # Stub implementation
+    return Response(content=PRIVACY_CONTROLS_BODY, media_type="application/json")
 
 
 @router.post("/privacy/account-type")
-async def account_type_management(
+def account_type_management(
     account_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Manage account type (public/private)"""
     # Stub implementation
     return {"message": "Account type updated successfully"}
 
 
+def insert_user_block(db: Session, blocker_id: int, blocked_user_id: int) -> bool:
+    """Record that blocker_id blocks blocked_user_id, False if already blocked
+
+    Raises 404 when the target user does not exist. Shared with the safety
+    router so both block endpoints behave the same.
+    """
+    # Selecting the target from users makes the insert its own existence check
+    target = select(literal(blocker_id), User.id).where(User.id == blocked_user_id)
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = (
+            pg_insert(UserBlock)
+            .from_select(["blocker_id", "blocked_id"], target)
+            .on_conflict_do_nothing(index_elements=["blocker_id", "blocked_id"])
+        )
+    else:
+        already_blocked = (
+            select(UserBlock.id)
+            .where(
+                UserBlock.blocker_id == blocker_id,
+                UserBlock.blocked_id == User.id,
+            )
+            .exists()
+        )
+        stmt = insert(UserBlock).from_select(
+            ["blocker_id", "blocked_id"], target.where(~already_blocked)
+        )
+    user_block = db.execute(stmt.returning(UserBlock.id)).first()
+
+    if user_block is None:
+        # Only the failure path pays for telling the two cases apart
+        if db.scalar(select(User.id).where(User.id == blocked_user_id)) is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return False
+
+    db.commit()
+    _invalidate(_safety_status_key(blocker_id))
+    return True
+
+
 # Safety and Moderation Endpoints
 @router.post("/safety/block")
-async def block_user(
+def block_user(
     block_data: dict,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Block a user"""
-    blocked_user_id = block_data.get("blocked_user_id")
-    block_reason = block_data.get("block_reason", "No reason provided")
-
-    # Check if user exists
-    blocked_user = db.query(User).filter(User.id == blocked_user_id).first()
-    if not blocked_user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Check if already blocked
-    existing_block = (
-        db.query(UserBlock)
-        .filter(
-            UserBlock.blocker_id == current_user.id,
-            UserBlock.blocked_id == blocked_user_id,
-        )
-        .first()
-    )
-
-    if existing_block:
+    if not insert_user_block(db, current_user.id, block_data.get("blocked_user_id")):
         return {"message": "User already blocked"}
-
-    # Create block record
-    user_block = UserBlock(
-        blocker_id=current_user.id,
-        blocked_id=blocked_user_id,
-        block_reason=block_reason,
-        block_type=block_data.get("block_type", "user"),
-    )
-
-    db.add(user_block)
-    db.flush()
-    db.commit()
-    db.refresh(user_block)
     return {"message": "User blocked successfully"}
 
 
 @router.post("/safety/report")
-async def report_content(
+def report_content(
     report_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Report content or user"""
     # Stub implementation
@@ -455,40 +716,56 @@ async def report_content(
 
 
 @router.get("/safety/status")
-async def get_safety_status(
-    current_user: User = Depends(get_current_user),
+def get_safety_status(
+    current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ):
     """Get safety status including blocked users"""
-    # Get blocked users
-    blocked_users = (
-        db.query(User)
-        .join(UserBlock)
-        .filter(UserBlock.blocker_id == current_user.id)
-        .all()
-    )
 
-    # Get reports made by user
-    user_reports = (
-        db.query(UserReport).filter(UserReport.reporter_id == current_user.id).all()
-    )
+    def build_status():
+        # One round trip: the report count is a one-row derived table, left
+        # joined to the blocked users so it is returned even with none
+        counts = select(
+            select(func.count(UserReport.id))
+            .where(UserReport.reporter_id == current_user_id)
+            .scalar_subquery()
+            .label("reports_made")
+        ).subquery()
+        blocked = (
+            select(User.id, User.username, User.email)
+            .join(UserBlock, UserBlock.blocked_id == User.id)
+            .where(UserBlock.blocker_id == current_user_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                counts.c.reports_made,
+                blocked.c.id,
+                blocked.c.username,
+                blocked.c.email,
+            )
+            .select_from(counts)
+            .outerjoin(blocked, true())
+        ).all()
 
-    return {
-        "blocked_users": [
-            {"user_id": user.id, "username": user.username, "email": user.email}
-            for user in blocked_users
-        ],
-        "reports_made": len(user_reports),
-        "safety_score": 95.0,  # Stub value
-    }
+        return {
+            "blocked_users": [
+                {"user_id": row.id, "username": row.username, "email": row.email}
+                for row in rows
+                if row.id is not None
+            ],
+            "reports_made": rows[0].reports_made,
+            "safety_score": 95.0,  # Stub value
+        }
+
+    return _cached_json(_safety_status_key(current_user_id), build_status)
 
 
 # Challenge System Endpoints
 @router.post("/challenges/{challenge_id}/join")
-async def join_challenge(
+def join_challenge(
     challenge_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Join a challenge"""
     # Stub implementation
@@ -496,11 +773,10 @@ async def join_challenge(
 
 
 @router.put("/challenges/{challenge_id}/progress")
-async def update_challenge_progress(
+def update_challenge_progress(
     challenge_id: int,
     progress_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Update challenge progress"""
     # Stub implementation
@@ -508,24 +784,27 @@ async def update_challenge_progress(
 
 
 # Premium Features Endpoints
+PREMIUM_FEATURES_BODY = orjson.dumps(
+    {
+        "features": ["Advanced Analytics", "Custom Workout Plans", "Priority Support"],
+        "is_premium": False,
+    }
+)
+
+
 @router.get("/premium/features")
-async def get_premium_features(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+def get_premium_features(
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Get premium features"""
     # Stub implementation
-    return {
-        "features": ["Advanced Analytics", "Custom Workout Plans", "Priority Support"],
-        "is_premium": False,
-    }
+    return Response(content=PREMIUM_FEATURES_BODY, media_type="application/json")
 
 
 @router.post("/premium/upgrade")
-async def upgrade_to_premium(
+def upgrade_to_premium(
     upgrade_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Upgrade to premium"""
     # Stub implementation
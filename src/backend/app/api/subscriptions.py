@@ -1,26 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.auth import get_current_user
-from app.database import get_db
-from app.models.user import User
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.api.auth import get_current_user_id
 
 router = APIRouter()
 
 
+PREMIUM_FEATURES_BODY = orjson.dumps(
+    {"features": ["advanced analytics", "priority support", "exclusive content"]}
+)
+
+
 @router.get("/features")
 def get_premium_features(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Get premium features"""
-    return {"features": ["advanced analytics", "priority support", "exclusive content"]}
+    return Response(content=PREMIUM_FEATURES_BODY, media_type="application/json")
 
 
 @router.post("/upgrade")
 def upgrade_to_premium(
     upgrade_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Upgrade to premium subscription"""
     return {"message": "Upgraded to premium"}
@@ -3,15 +3,19 @@
 Users API endpoints
 """
 
+import hashlib
 import logging
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_id
 from app.database import get_db
-from app.models.user import User
+from app.models.user import ExperienceLevel, FitnessGoal, User
 from app.models.user_stats import UserStats
 from app.schemas.user import UserResponse, UserStatsResponse, UserUpdate
 
@@ -19,61 +23,127 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Columns behind UserResponse, for read-only list endpoints that serialize
+# rows directly instead of hydrating User objects and validating each one
+USER_RESPONSE_COLUMNS = (
+    User.id,
+    User.email,
+    User.username,
+    User.full_name,
+    User.fitness_goal,
+    User.experience_level,
+    User.age,
+    User.height,
+    User.weight,
+    User.unit_system,
+    User.height_unit,
+    User.weight_unit,
+    User.is_active,
+    User.is_verified,
+    User.created_at,
+)
+
+
+# User columns PUT /profile may change, with the type each value is stored as
+PROFILE_UPDATE_FIELDS = {
+    "full_name": str,
+    "fitness_goal": FitnessGoal,
+    "experience_level": ExperienceLevel,
+}
+
+
+def user_response_rows(rows) -> list[dict]:
+    """UserResponse-shaped dicts from USER_RESPONSE_COLUMNS rows
+
+    Enums and datetimes are left as-is; orjson encodes them the same way the
+    schema would.
+    """
+    return [{**row._asdict(), "bio": None} for row in rows]
+
 
 # Test data endpoints (no authentication required)
+# Their payloads are static: encoded once at import and served with an ETag,
+# so clients and proxies can cache them
+TEST_DATA_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _static_body(payload: dict) -> tuple[bytes, str]:
+    """Encode a static payload, returning the body and its ETag"""
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+def _test_data_response(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": TEST_DATA_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Relative dates are fixed at startup
+TEST_PROFILE = _static_body(
+    UserResponse.model_validate(
+        {
+            "id": 1,
+            "username": "testuser",
+            "email": "test@example.com",
+            "full_name": "Test User",
+            "bio": "Fitness enthusiast working on strength and endurance",
+            "date_of_birth": datetime(1990, 5, 15).date(),
+            "gender": "male",
+            "height": 175.0,
+            "weight": 75.0,
+            "height_unit": "cm",
+            "weight_unit": "kg",
+            "fitness_goal": "muscle_gain",
+            "experience_level": "intermediate",
+            "unit_system": "metric",
+            "is_active": True,
+            "is_verified": True,
+            "created_at": datetime.now() - timedelta(days=30),
+            "updated_at": datetime.now(),
+        }
+    ).model_dump(mode="json")
+)
+
+
 @router.get("/test/profile", response_model=UserResponse)
-async def get_test_user_profile():
+async def get_test_user_profile(request: Request):
     """
     Get sample user profile for testing (no authentication required)
     """
-    return {
-        "id": 1,
-        "username": "testuser",
-        "email": "test@example.com",
-        "full_name": "Test User",
-        "bio": "Fitness enthusiast working on strength and endurance",
-        "date_of_birth": datetime(1990, 5, 15).date(),
-        "gender": "male",
-        "height": 175.0,
-        "weight": 75.0,
-        "height_unit": "cm",
-        "weight_unit": "kg",
-        "fitness_goal": "muscle_gain",
-        "experience_level": "intermediate",
-        "unit_system": "metric",
-        "is_active": True,
-        "is_verified": True,
-        "created_at": datetime.now() - timedelta(days=30),
-        "updated_at": datetime.now(),
-    }
+    return _test_data_response(request, *TEST_PROFILE)
+
+
+TEST_STATS = _static_body(
+    UserStatsResponse.model_validate(
+        {
+            "id": 1,
+            "user_id": 1,
+            "total_workouts": 45,
+            "total_exercises": 12,
+            "total_duration": 1935,  # 32 hours 15 minutes in minutes
+            "average_workout_duration": 43.0,
+            "favorite_exercise_type": "strength",
+            "strength_score": 75.5,
+            "cardio_score": 60.0,
+            "flexibility_score": 45.0,
+            "last_workout_date": datetime.now() - timedelta(days=1),
+        }
+    ).model_dump(mode="json")
+)
 
 
 @router.get("/test/stats", response_model=UserStatsResponse)
-async def get_test_user_stats():
+async def get_test_user_stats(request: Request):
     """
     Get sample user statistics for testing (no authentication required)
     """
-    return {
-        "id": 1,
-        "user_id": 1,
-        "total_workouts": 45,
-        "total_exercises": 12,
-        "total_duration": 1935,  # 32 hours 15 minutes in minutes
-        "average_workout_duration": 43.0,
-        "favorite_exercise_type": "strength",
-        "strength_score": 75.5,
-        "cardio_score": 60.0,
-        "flexibility_score": 45.0,
-        "last_workout_date": datetime.now() - timedelta(days=1),
-    }
+    return _test_data_response(request, *TEST_STATS)
 
 
-@router.get("/test/recommendations")
-async def get_test_recommendations():
-    """
-    Get sample workout recommendations for testing (no authentication required)
-    """
-    return {
+TEST_RECOMMENDATIONS = _static_body(
+    {
         "recommendations": [
             {
                 "id": 1,
@@ -108,14 +178,19 @@ async def get_test_recommendations():
         ],
         "reasoning": "Based on your recent workout patterns and fitness goals",
     }
+)
 
 
-@router.get("/test/community")
-async def get_test_community_data():
+@router.get("/test/recommendations")
+async def get_test_recommendations(request: Request):
     """
-    Get sample community data for testing (no authentication required)
+    Get sample workout recommendations for testing (no authentication required)
     """
-    return {
+    return _test_data_response(request, *TEST_RECOMMENDATIONS)
+
+
+TEST_COMMUNITY = _static_body(
+    {
         "friends": [
             {
                 "id": 2,
@@ -169,6 +244,15 @@ async def get_test_community_data():
             },
         ],
     }
+)
+
+
+@router.get("/test/community")
+async def get_test_community_data(request: Request):
+    """
+    Get sample community data for testing (no authentication required)
+    """
+    return _test_data_response(request, *TEST_COMMUNITY)
 
 
 @router.get("/profile", response_model=UserResponse)
@@ -178,35 +262,47 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
 
 
 @router.put("/profile", response_model=UserResponse)
-async def update_user_profile(
+def update_user_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Update current user's profile"""
-    # Update only provided fields
-    if user_update.full_name is not None:
-        current_user.full_name = user_update.full_name
-    if user_update.bio is not None:
-        current_user.bio = user_update.bio
-    if user_update.fitness_goal is not None:
-        current_user.fitness_goal = user_update.fitness_goal
-    if user_update.experience_level is not None:
-        current_user.experience_level = user_update.experience_level
-
+    # Update only provided fields, in one UPDATE ... RETURNING
+    fields = user_update.model_dump(
+        include=set(PROFILE_UPDATE_FIELDS), exclude_none=True
+    )
+    try:
+        patch = {
+            key: PROFILE_UPDATE_FIELDS[key](value) for key, value in fields.items()
+        }
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if not patch:
+        return current_user
+
+    user = db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(**patch)
+        .returning(*USER_RESPONSE_COLUMNS)
+    ).one()
     db.commit()
-    db.refresh(current_user)
 
     logger.info(f"User profile updated: {current_user.username}")
-    return current_user
+    return ORJSONResponse(user_response_rows([user])[0])
 
 
 @router.get("/stats", response_model=UserStatsResponse)
-async def get_user_stats(
+def get_user_stats(
     current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get current user's fitness statistics"""
-    stats = db.query(UserStats).filter(UserStats.user_id == current_user.id).first()
+    stats = db.scalars(
+        select(UserStats).where(UserStats.user_id == current_user.id).limit(1)
+    ).first()
 
     if not stats:
         # Create default stats if none exist
@@ -219,13 +315,15 @@ async def get_user_stats(
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user_by_id(
+def get_user_by_id(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get user by ID (public profile)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    # Primary-key lookup: served from the session's identity map when the
+    # user is already loaded (e.g. looking up yourself)
+    user = db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -236,27 +334,25 @@ async def get_user_by_id(
 
 
 @router.get("/search/{username}", response_model=list[UserResponse])
-async def search_users(
+def search_users(
     username: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Search users by username"""
-    users = (
-        db.query(User)
-        .filter(User.username.ilike(f"%{username}%"), User.id != current_user.id)
+    users = db.execute(
+        select(*USER_RESPONSE_COLUMNS)
+        .where(User.username.ilike(f"%{username}%"), User.id != current_user.id)
         .limit(10)
-        .all()
     )
 
-    return users
+    return ORJSONResponse(user_response_rows(users))
 
 
 @router.post("/fitness-assessment")
 def complete_fitness_assessment(
     assessment_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Complete fitness assessment for onboarding"""
     return {"message": "Fitness assessment completed"}
@@ -265,8 +361,7 @@ def complete_fitness_assessment(
 @router.post("/privacy-setup")
 def privacy_setup(
     privacy_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Set privacy preferences for onboarding"""
     return {"message": "Privacy preferences set"}
@@ -275,8 +370,7 @@ def privacy_setup(
 @router.post("/goals")
 def set_user_goals(
     goals_data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
 ):
     """Stub: Set user goals for onboarding"""
     return {"message": "User goals set"}
@@ -3,17 +3,25 @@
 Workout management endpoints
 """
 
-from datetime import date, datetime, timedelta
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import logging
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 
 from app.api.auth import get_current_user
-from app.database import get_db
+from app.api.exercises import exercise_to_response
+from app.database import get_db, redis_client
 from app.models import User, Workout, WorkoutExercise, WorkoutStatus
 from app.schemas.workout import (
     WorkoutCreate,
+    WorkoutExerciseResponse,
     WorkoutExerciseUpdate,
     WorkoutResponse,
     WorkoutStats,
@@ -21,15 +29,93 @@ from app.schemas.workout import (
 )
 from app.services.workout_service import WorkoutService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Stats only change when a workout is written; the TTL bounds how long a
+# workout can linger in a stats window after it has aged out of it
+WORKOUT_STATS_CACHE_TTL = 120
 
-# Test data endpoints (no authentication required)
-@router.get("/test/sample", response_model=list[WorkoutResponse])
-async def get_test_workouts() -> list[dict]:
+# Response fields read straight off the ORM objects
+WORKOUT_FIELDS = tuple(
+    name for name in WorkoutResponse.model_fields if name != "exercises"
+)
+WORKOUT_EXERCISE_FIELDS = tuple(
+    name for name in WorkoutExerciseResponse.model_fields if name != "exercise"
+)
+
+
+# Loads a workout's exercises and their catalogue entries in two IN-list
+# queries instead of a lazy load per workout and per exercise
+WORKOUT_EXERCISES_LOAD = selectinload(Workout.exercises).selectinload(
+    WorkoutExercise.exercise
+)
+
+
+def _reload_workout(db: Session, workout_id: int) -> Workout:
+    """Load a workout after commit with everything workout_to_response reads"""
+    return (
+        db.query(Workout)
+        .options(WORKOUT_EXERCISES_LOAD)
+        .filter(Workout.id == workout_id)
+        .one()
+    )
+
+
+def get_workout_service(db: Session = Depends(get_db)) -> WorkoutService:
+    """Dependency giving handlers a WorkoutService on the request's session"""
+    return WorkoutService(db)
+
+
+def _owned_workout_status(
+    db: Session, workout_id: int, user_id: int
+) -> Optional[WorkoutStatus]:
+    """Status of the user's workout, None if they have no such workout
+
+    Only consulted after a guarded write matched no row, to tell a missing
+    workout apart from one in the wrong state.
     """
-    Get sample workout data for testing (no authentication required)
+    return db.scalar(
+        select(Workout.status).where(
+            Workout.id == workout_id, Workout.user_id == user_id
+        )
+    )
+
+
+def _workout_stats_key(user_id: int) -> str:
+    # One hash per user with a field per window, so a write drops every
+    # window with a single DEL
+    return f"workout_stats:{user_id}"
+
+
+def _invalidate_workout_stats(user_id: int) -> None:
+    try:
+        redis_client.delete(_workout_stats_key(user_id))
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate workout stats for {user_id}: {e}")
+
+
+def workout_to_response(workout: Workout) -> dict:
+    """Shape a workout like WorkoutResponse without re-validating it
+
+    Rows come from the database, so read endpoints return these dicts through
+    ORJSONResponse, which encodes the enums and datetimes directly.
     """
+    data = {name: getattr(workout, name) for name in WORKOUT_FIELDS}
+    data["exercises"] = [
+        {
+            **{name: getattr(we, name) for name in WORKOUT_EXERCISE_FIELDS},
+            "exercise": exercise_to_response(we.exercise),
+        }
+        for we in workout.exercises
+    ]
+    return data
+
+
+# Test data endpoints (no authentication required)
+def _sample_workouts() -> list[dict]:
+    """Sample workouts scheduled relative to now"""
     return [
         {
             "id": 1,
@@ -212,12 +298,30 @@ async def get_test_workouts() -> list[dict]:
     ]
 
 
-@router.get("/test/stats", response_model=WorkoutStats)
-async def get_test_workout_stats() -> WorkoutStats:
+@lru_cache(maxsize=4)
+def _sample_workouts_body(
+    build: Callable[[], list[dict]],
+    today: date,  # noqa: ARG001 - cache key only, rolls the entry over daily
+) -> bytes:
+    """Encode sample workouts once a day, so their relative dates stay current"""
+    return orjson.dumps(
+        [WorkoutResponse.model_validate(w).model_dump(mode="json") for w in build()]
+    )
+
+
+@router.get("/test/sample", response_model=list[WorkoutResponse])
+async def get_test_workouts() -> Response:
     """
-    Get sample workout statistics for testing (no authentication required)
+    Get sample workout data for testing (no authentication required)
     """
-    return WorkoutStats(
+    return Response(
+        content=_sample_workouts_body(_sample_workouts, date.today()),
+        media_type="application/json",
+    )
+
+
+SAMPLE_WORKOUT_STATS_BODY = orjson.dumps(
+    WorkoutStats(
         total_workouts=12,
         completed_workouts=8,
         total_duration=390,  # 6 hours 30 minutes in minutes
@@ -236,14 +340,20 @@ async def get_test_workout_stats() -> WorkoutStats:
             "shoulders": 15,
             "arms": 10,
         },
-    )
+    ).model_dump(mode="json")
+)
 
 
-@router.get("/test/upcoming")
-async def get_test_upcoming_workouts() -> list[WorkoutResponse]:
+@router.get("/test/stats", response_model=WorkoutStats)
+async def get_test_workout_stats() -> Response:
     """
-    Get sample upcoming workouts for testing (no authentication required)
+    Get sample workout statistics for testing (no authentication required)
     """
+    return Response(content=SAMPLE_WORKOUT_STATS_BODY, media_type="application/json")
+
+
+def _sample_upcoming_workouts() -> list[dict]:
+    """Sample upcoming workouts scheduled relative to now"""
     return [
         {
             "id": 3,
@@ -284,12 +394,23 @@ async def get_test_upcoming_workouts() -> list[WorkoutResponse]:
     ]
 
 
+@router.get("/test/upcoming", response_model=list[WorkoutResponse])
+async def get_test_upcoming_workouts() -> Response:
+    """
+    Get sample upcoming workouts for testing (no authentication required)
+    """
+    return Response(
+        content=_sample_workouts_body(_sample_upcoming_workouts, date.today()),
+        media_type="application/json",
+    )
+
+
 @router.post("/", response_model=WorkoutResponse)
-async def create_workout(
+def create_workout(
     workout_data: WorkoutCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> Workout:
+) -> ORJSONResponse:
     """
     Create a new workout with exercises
     """
@@ -304,22 +425,25 @@ async def create_workout(
 
     db.add(workout)
     db.flush()  # Get workout ID without committing
-
-    # Add exercises
-    for exercise_data in workout_data.exercises:
-        workout_exercise = WorkoutExercise(
-            workout_id=workout.id, **exercise_data.dict()
+    workout_id = workout.id
+
+    # Add exercises as one batched INSERT
+    if workout_data.exercises:
+        db.execute(
+            insert(WorkoutExercise),
+            [
+                {"workout_id": workout_id, **exercise_data.model_dump()}
+                for exercise_data in workout_data.exercises
+            ],
         )
-        db.add(workout_exercise)
 
     db.commit()
-    db.refresh(workout)
 
-    return workout
+    return ORJSONResponse(workout_to_response(_reload_workout(db, workout_id)))
 
 
 @router.get("/", response_model=list[WorkoutResponse])
-async def get_workouts(
+def get_workouts(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     status: Optional[WorkoutStatus] = Query(None),
@@ -327,20 +451,27 @@ async def get_workouts(
     limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[Workout]:
+) -> ORJSONResponse:
     """
     Get user's workouts with optional filters
     """
-    query = db.query(Workout).filter(Workout.user_id == current_user.id)
+    query = (
+        db.query(Workout)
+        .options(WORKOUT_EXERCISES_LOAD)
+        .filter(Workout.user_id == current_user.id)
+    )
 
+    # scheduled_date is a timestamp, so the date filters bind as half-open
+    # timestamp bounds the index range scan can use as-is
     if start_date:
         query = query.filter(
-            Workout.scheduled_date >= datetime.combine(start_date, datetime.min.time())
+            Workout.scheduled_date >= datetime.combine(start_date, time.min)
         )
 
     if end_date:
         query = query.filter(
-            Workout.scheduled_date <= datetime.combine(end_date, datetime.max.time())
+            Workout.scheduled_date
+            < datetime.combine(end_date + timedelta(days=1), time.min)
         )
 
     if status:
@@ -350,38 +481,66 @@ async def get_workouts(
         query.order_by(Workout.scheduled_date.desc()).offset(skip).limit(limit).all()
     )
 
-    return workouts
+    return ORJSONResponse([workout_to_response(w) for w in workouts])
 
 
 @router.get("/stats", response_model=WorkoutStats)
-async def get_workout_stats(
+def get_workout_stats(
     days: int = Query(30, ge=1, le=365),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> WorkoutStats:
+    service: WorkoutService = Depends(get_workout_service),
+) -> Response:
     """
     Get workout statistics for the user
+
+    The encoded stats are cached in Redis per window and dropped whenever one
+    of the user's workouts is written. Redis being unavailable only costs the
+    cache.
     """
-    service = WorkoutService(db)
-    return service.get_user_stats(current_user, days)
+    key = _workout_stats_key(current_user.id)
+
+    def build() -> bytes:
+        stats = WorkoutStats(**service.get_user_stats(current_user, days))
+        return orjson.dumps(stats.model_dump(mode="json"))
 
+    try:
+        body = redis_client.hget(key, days)
+    except RedisError as e:
+        logger.debug(f"Redis unavailable, not caching {key}: {e}")
+        return Response(content=build(), media_type="application/json")
 
-@router.get("/upcoming")
-async def get_upcoming_workouts(
+    if body is None:
+        body = build()
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.hset(key, days, body)
+                pipe.expire(key, WORKOUT_STATS_CACHE_TTL)
+                pipe.execute()
+        except RedisError as e:
+            logger.debug(f"Failed to cache {key}: {e}")
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/upcoming", response_model=list[WorkoutResponse])
+def get_upcoming_workouts(
     days: int = Query(7, ge=1, le=30),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> list[WorkoutResponse]:
+) -> ORJSONResponse:
     """
     Get upcoming scheduled workouts
     """
-    end_date = datetime.utcnow() + timedelta(days=days)
+    # Both bounds come from one clock reading so the window is exactly `days`
+    now = datetime.utcnow()
+    end_date = now + timedelta(days=days)
 
     workouts = (
         db.query(Workout)
+        .options(WORKOUT_EXERCISES_LOAD)
         .filter(
             Workout.user_id == current_user.id,
-            Workout.scheduled_date >= datetime.utcnow(),
+            Workout.scheduled_date >= now,
             Workout.scheduled_date <= end_date,
             Workout.status == WorkoutStatus.PLANNED,
         )
@@ -389,20 +548,21 @@ async def get_upcoming_workouts(
         .all()
     )
 
-    return workouts
+    return ORJSONResponse([workout_to_response(w) for w in workouts])
 
 
 @router.get("/{workout_id}", response_model=WorkoutResponse)
-async def get_workout(
+def get_workout(
     workout_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> Workout:
+) -> ORJSONResponse:
     """
     Get a specific workout
     """
     workout = (
         db.query(Workout)
+        .options(WORKOUT_EXERCISES_LOAD)
         .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
         .first()
     )
@@ -410,131 +570,136 @@ async def get_workout(
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
 
-    return workout
+    return ORJSONResponse(workout_to_response(workout))
 
 
 @router.put("/{workout_id}", response_model=WorkoutResponse)
-async def update_workout(
+def update_workout(
     workout_id: int,
     workout_update: WorkoutUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> Workout:
+    service: WorkoutService = Depends(get_workout_service),
+) -> ORJSONResponse:
     """
     Update a workout
     """
-    workout = (
-        db.query(Workout)
-        .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
-        .first()
-    )
+    values = workout_update.dict(exclude_unset=True)
+    owned = (Workout.id == workout_id, Workout.user_id == current_user.id)
+
+    # Status changes stamp their timestamp only if it is not set yet, inside
+    # the same UPDATE so concurrent transitions cannot overwrite each other
+    now = datetime.utcnow()
+    if values.get("status") == WorkoutStatus.IN_PROGRESS:
+        values["started_at"] = func.coalesce(Workout.started_at, now)
+    elif values.get("status") == WorkoutStatus.COMPLETED:
+        values["completed_at"] = func.coalesce(Workout.completed_at, now)
+
+    if values:
+        statement = (
+            update(Workout)
+            .where(*owned)
+            .values(**values)
+            .returning(Workout.id, Workout.completed_at)
+        )
+    else:
+        statement = select(Workout.id, Workout.completed_at).where(*owned)
+    row = db.execute(statement).first()
 
-    if not workout:
+    if not row:
         raise HTTPException(status_code=404, detail="Workout not found")
 
-    # Update fields
-    update_data = workout_update.dict(exclude_unset=True)
-
-    # Handle status changes
-    if "status" in update_data:
-        if (
-            update_data["status"] == WorkoutStatus.IN_PROGRESS
-            and not workout.started_at
-        ):
-            workout.started_at = datetime.utcnow()
-        elif (
-            update_data["status"] == WorkoutStatus.COMPLETED
-            and not workout.completed_at
-        ):
-            workout.completed_at = datetime.utcnow()
-            # Calculate workout metrics
-            service = WorkoutService(db)
-            service.calculate_workout_metrics(workout)
-
-    for field, value in update_data.items():
-        setattr(workout, field, value)
+    if values.get("status") == WorkoutStatus.COMPLETED and row.completed_at == now:
+        # Calculate workout metrics for a newly completed workout
+        service.calculate_workout_metrics(_reload_workout(db, workout_id))
 
     db.commit()
-    db.refresh(workout)
+    _invalidate_workout_stats(current_user.id)
 
-    return workout
+    return ORJSONResponse(workout_to_response(_reload_workout(db, workout_id)))
 
 
-@router.post("/{workout_id}/start")
-async def start_workout(
+@router.post("/{workout_id}/start", response_model=WorkoutResponse)
+def start_workout(
     workout_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> WorkoutResponse:
+) -> ORJSONResponse:
     """
     Start a workout session
     """
-    workout = (
-        db.query(Workout)
-        .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
-        .first()
-    )
-
-    if not workout:
-        raise HTTPException(status_code=404, detail="Workout not found")
+    # The status guard in the WHERE clause makes the transition atomic
+    started_id = db.scalars(
+        update(Workout)
+        .where(
+            Workout.id == workout_id,
+            Workout.user_id == current_user.id,
+            Workout.status == WorkoutStatus.PLANNED,
+        )
+        .values(status=WorkoutStatus.IN_PROGRESS, started_at=datetime.utcnow())
+        .returning(Workout.id)
+    ).one_or_none()
 
-    if workout.status != WorkoutStatus.PLANNED:
+    if started_id is None:
+        if _owned_workout_status(db, workout_id, current_user.id) is None:
+            raise HTTPException(status_code=404, detail="Workout not found")
         raise HTTPException(
             status_code=400, detail="Workout already started or completed"
         )
 
-    workout.status = WorkoutStatus.IN_PROGRESS
-    workout.started_at = datetime.utcnow()
-
     db.commit()
-    db.refresh(workout)
 
-    return workout
+    return ORJSONResponse(workout_to_response(_reload_workout(db, workout_id)))
 
 
-@router.post("/{workout_id}/complete")
-async def complete_workout(
+@router.post("/{workout_id}/complete", response_model=WorkoutResponse)
+def complete_workout(
     workout_id: int,
     notes: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> WorkoutResponse:
+    service: WorkoutService = Depends(get_workout_service),
+) -> ORJSONResponse:
     """
     Complete a workout session
     """
-    workout = (
-        db.query(Workout)
-        .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
-        .first()
-    )
+    values = {"status": WorkoutStatus.COMPLETED, "completed_at": datetime.utcnow()}
+    if notes:
+        values["notes"] = notes
 
-    if not workout:
-        raise HTTPException(status_code=404, detail="Workout not found")
+    # Claim the completion atomically so user stats are only counted once
+    completed_id = db.scalars(
+        update(Workout)
+        .where(
+            Workout.id == workout_id,
+            Workout.user_id == current_user.id,
+            Workout.status != WorkoutStatus.COMPLETED,
+        )
+        .values(**values)
+        .returning(Workout.id)
+    ).one_or_none()
 
-    if workout.status == WorkoutStatus.COMPLETED:
+    if completed_id is None:
+        if _owned_workout_status(db, workout_id, current_user.id) is None:
+            raise HTTPException(status_code=404, detail="Workout not found")
         raise HTTPException(status_code=400, detail="Workout already completed")
 
-    workout.status = WorkoutStatus.COMPLETED
-    workout.completed_at = datetime.utcnow()
-
-    if notes:
-        workout.notes = notes
+    workout = _reload_workout(db, workout_id)
 
     # Calculate workout metrics
-    service = WorkoutService(db)
     service.calculate_workout_metrics(workout)
 
     # Update user stats
     service.update_user_stats(current_user, workout)
 
     db.commit()
-    db.refresh(workout)
+    _invalidate_workout_stats(current_user.id)
 
-    return workout
+    return ORJSONResponse(workout_to_response(_reload_workout(db, workout_id)))
 
 
 @router.put("/{workout_id}/exercises/{exercise_id}")
-async def update_workout_exercise(
+def update_workout_exercise(
     workout_id: int,
     exercise_id: int,
     exercise_update: WorkoutExerciseUpdate,
@@ -544,40 +709,39 @@ async def update_workout_exercise(
     """
     Update exercise performance data during workout
     """
-    # Verify workout ownership
-    workout = (
-        db.query(Workout)
-        .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
-        .first()
+    # Ownership is checked in the same statement as the write
+    owned_workout = select(Workout.id).where(
+        Workout.id == workout_id, Workout.user_id == current_user.id
+    )
+    where = (
+        WorkoutExercise.id == exercise_id,
+        WorkoutExercise.workout_id.in_(owned_workout),
     )
 
-    if not workout:
-        raise HTTPException(status_code=404, detail="Workout not found")
-
-    # Find workout exercise
-    workout_exercise = (
-        db.query(WorkoutExercise)
-        .filter(
-            WorkoutExercise.workout_id == workout_id, WorkoutExercise.id == exercise_id
+    update_data = exercise_update.dict(exclude_unset=True)
+    if update_data:
+        statement = (
+            update(WorkoutExercise)
+            .where(*where)
+            .values(**update_data)
+            .returning(WorkoutExercise.id)
         )
-        .first()
-    )
+    else:
+        statement = select(WorkoutExercise.id).where(*where)
+    updated_id = db.scalars(statement).one_or_none()
 
-    if not workout_exercise:
+    if updated_id is None:
+        if _owned_workout_status(db, workout_id, current_user.id) is None:
+            raise HTTPException(status_code=404, detail="Workout not found")
         raise HTTPException(status_code=404, detail="Exercise not found in workout")
 
-    # Update fields
-    update_data = exercise_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(workout_exercise, field, value)
-
     db.commit()
 
     return {"message": "Exercise updated successfully"}
 
 
 @router.delete("/{workout_id}")
-async def delete_workout(
+def delete_workout(
     workout_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -585,16 +749,22 @@ async def delete_workout(
     """
     Delete a workout
     """
-    workout = (
-        db.query(Workout)
-        .filter(Workout.id == workout_id, Workout.user_id == current_user.id)
-        .first()
+    owned = (Workout.id == workout_id, Workout.user_id == current_user.id)
+
+    # The exercises' foreign key has no ON DELETE CASCADE, so they go first
+    db.execute(
+        delete(WorkoutExercise).where(
+            WorkoutExercise.workout_id.in_(select(Workout.id).where(*owned))
+        )
     )
+    deleted_id = db.scalars(
+        delete(Workout).where(*owned).returning(Workout.id)
+    ).one_or_none()
 
-    if not workout:
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Workout not found")
 
-    db.delete(workout)
     db.commit()
+    _invalidate_workout_stats(current_user.id)
 
     return {"message": "Workout deleted successfully"}
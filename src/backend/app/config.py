@@ -3,9 +3,10 @@
 Configuration settings for Pulse Fitness App
 """
 
+from functools import lru_cache
 from typing import Optional
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -16,6 +17,11 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://pulse:pulse123@db:5432/pulse_fitness"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     # Security
     SECRET_KEY: str = "your-super-secret-key-here"
@@ -57,10 +63,15 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Frozen so the shared instance cannot drift between requests or threads
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
 
 
-# Create settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, reading the environment and .env once"""
+    return Settings()
+
+
+# Module-level alias for import-time callers (engine, CORS, auth)
+settings = get_settings()
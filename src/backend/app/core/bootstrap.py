@@ -11,6 +11,7 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import time
 import traceback
 
@@ -118,6 +119,7 @@ class ApplicationBootstrap:
             docs_url="/docs" if self.config.is_development() else None,
             redoc_url="/redoc" if self.config.is_development() else None,
             openapi_url="/openapi.json" if self.config.is_development() else None,
+            default_response_class=ORJSONResponse,
         )
 
         # Add lifespan events
@@ -32,8 +32,8 @@ class DatabaseConfig:
     """Database configuration"""
 
     url: str
-    pool_size: int = 10
-    max_overflow: int = 20
+    pool_size: int = 20
+    max_overflow: int = 10
     pool_timeout: int = 30
     pool_recycle: int = 3600
     echo: bool = False
@@ -317,8 +317,8 @@ class ConfigurationManager:
         """Get database configuration"""
         return DatabaseConfig(
             url=self.get("database_url"),
-            pool_size=self.get("database.pool_size", 10),
-            max_overflow=self.get("database.max_overflow", 20),
+            pool_size=self.get("database.pool_size", 20),
+            max_overflow=self.get("database.max_overflow", 10),
             pool_timeout=self.get("database.pool_timeout", 30),
             pool_recycle=self.get("database.pool_recycle", 3600),
             echo=self.get("database.echo", False),
@@ -533,6 +533,7 @@ def create_database_engine():
         max_overflow=config.max_overflow,
         pool_timeout=config.pool_timeout,
         pool_recycle=config.pool_recycle,
+        pool_pre_ping=True,
         echo=config.echo,
     )
 
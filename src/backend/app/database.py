@@ -3,8 +3,10 @@
 Database configuration and session management
 """
 
+import asyncio
 import logging
 
+import redis
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -13,12 +15,32 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create database engine
+# Pool sizing only applies to server databases; SQLite uses its own pools
+pool_options = (
+    {}
+    if settings.DATABASE_URL.startswith("sqlite")
+    else {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+)
+
+# Create database engine; pool_pre_ping already replaces connections the
+# server dropped, so recycling is only a backstop against long-lived sockets
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # compiled statement LRU
     echo=False,  # Set to True for SQL query logging
+    **pool_options,
+)
+
+# Shared cache for read-heavy endpoints; connects lazily on first command and
+# fails fast so callers can fall back to the database
+redis_client = redis.Redis.from_url(
+    settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
 )
 
 # Create session factory
@@ -45,3 +67,31 @@ def init_db():
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
+
+
+def _open_pooled_connection():
+    connection = engine.connect()
+    connection.exec_driver_sql("SELECT 1")
+    return connection
+
+
+async def warm_connection_pool():
+    """Open the pool's connections up front so early requests skip the handshake"""
+    if engine.dialect.name == "sqlite":
+        return
+
+    connections = await asyncio.gather(
+        *(
+            asyncio.to_thread(_open_pooled_connection)
+            for _ in range(settings.DB_POOL_SIZE)
+        ),
+        return_exceptions=True,
+    )
+    opened = 0
+    for connection in connections:
+        if isinstance(connection, Exception):
+            logger.warning(f"Failed to warm database connection: {connection}")
+        else:
+            connection.close()  # back to the pool, socket stays open
+            opened += 1
+    logger.info(f"Warmed {opened} database connections")
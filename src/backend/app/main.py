@@ -11,6 +11,7 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import (
     auth,
@@ -27,7 +28,7 @@ from app.api import (
     subscriptions,
 )
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, engine, warm_connection_pool
 from app.services.workout_service import import_exercise_database
 from app.core.bootstrap import create_app, get_bootstrap
 from app.core.config import get_config, get_logging_config
@@ -68,6 +69,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     try:
         # Create and bootstrap the application
         application = await create_app()
+        await warm_connection_pool()
+        await recommendations.warm_exercise_scorer()
         logger.info("Application started successfully")
         yield None  # Yield None instead of the application
     except Exception as e:
@@ -97,6 +100,7 @@ app = FastAPI(
     description="A social fitness app with ML-powered workout recommendations",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
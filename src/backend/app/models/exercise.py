@@ -5,13 +5,29 @@ Exercise model for exercise database
 
 import enum
 import json
+import re
 
-from sqlalchemy import Boolean, Column, Enum, Float, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, Enum, Float, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+def parse_secondary_muscles(value: str):
+    """Parse secondary muscles text the way migration 6b1d0e3f7a25 does
+
+    JSON is decoded as-is; anything else (comma-separated values from the CSV
+    importer) is split into a stripped list. Blank text means no value.
+    """
+    if not value.strip():
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return re.split(r"\s*,\s*", value.strip())
+
+
 class MuscleGroup(enum.Enum):
     CHEST = "chest"
     BACK = "back"
@@ -55,7 +71,8 @@ class Exercise(Base):
     name = Column(String, unique=True, nullable=False, index=True)
     description = Column(Text)
     primary_muscle = Column(Enum(MuscleGroup), nullable=False, index=True)
-    secondary_muscles = Column(String)  # JSON string of muscle groups
+    # List of muscle groups, decoded by the driver (jsonb on PostgreSQL)
+    secondary_muscles = Column(JSON().with_variant(JSONB(), "postgresql"))
     equipment = Column(Enum(Equipment), nullable=False, index=True)
     exercise_type = Column(Enum(ExerciseType), nullable=False)
     difficulty = Column(Integer)  # 1-5
@@ -75,9 +92,13 @@ class Exercise(Base):
 
     @property
     def secondary_muscles_list(self):
-        if self.secondary_muscles:
+        value = self.secondary_muscles
+        if isinstance(value, list):
+            return value
+        if value and isinstance(value, str):
+            # Legacy rows stored the list as JSON-encoded text
             try:
-                return json.loads(self.secondary_muscles)
+                return json.loads(value)
             except Exception:
                 return []
         return []
@@ -85,11 +106,11 @@ class Exercise(Base):
     @secondary_muscles_list.setter
     def secondary_muscles_list(self, value):
         if isinstance(value, list):
-            self.secondary_muscles = json.dumps(value)
-        elif isinstance(value, str):
             self.secondary_muscles = value
+        elif isinstance(value, str):
+            self.secondary_muscles = parse_secondary_muscles(value)
         else:
-            self.secondary_muscles = json.dumps([])
+            self.secondary_muscles = []
 
     def __repr__(self):
         return f"<Exercise(name='{self.name}', type='{self.exercise_type}')>"
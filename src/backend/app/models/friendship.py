@@ -9,9 +9,11 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     UniqueConstraint,
     String,
+    func,
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -38,8 +40,21 @@ class Friendship(Base):
         "User", foreign_keys=[friend_id], back_populates="received_friendships"
     )
 
-    # Ensure unique friendships
-    __table_args__ = (UniqueConstraint("user_id", "friend_id", name="_user_friend_uc"),)
+    __table_args__ = (
+        # Ensure unique friendships
+        UniqueConstraint("user_id", "friend_id", name="_user_friend_uc"),
+        # Friend lists and pending requests filter on one side plus status
+        Index("ix_friendships_friend_status", "friend_id", "status"),
+        Index("ix_friendships_user_status", "user_id", "status"),
+        # One friendship per pair regardless of direction (PostgreSQL only,
+        # send_friend_request relies on it for INSERT ... ON CONFLICT)
+        Index(
+            "ux_friendships_pair",
+            func.least(user_id, friend_id),
+            func.greatest(user_id, friend_id),
+            unique=True,
+        ).ddl_if(dialect="postgresql"),
+    )
 
     def __repr__(self):
         return f"<Friendship(user_id={self.user_id}, friend_id={self.friend_id}, accepted={self.is_accepted})>"
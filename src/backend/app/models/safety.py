@@ -8,6 +8,7 @@ from sqlalchemy import (
     Enum,
     Text,
     Boolean,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -38,3 +39,8 @@ class UserBlock(Base):
     blocker_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     blocked_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One block per pair; block_user inserts with ON CONFLICT DO NOTHING
+        UniqueConstraint("blocker_id", "blocked_id", name="_blocker_blocked_uc"),
+    )
@@ -6,7 +6,18 @@ Workout model for workout sessions
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -23,6 +34,25 @@ class Workout(Base):
     """Workout session model"""
 
     __tablename__ = "workouts"
+    __table_args__ = (
+        # Covers get_exercise_history's filter and its completed_at DESC order
+        Index(
+            "ix_workouts_user_status_completed",
+            "user_id",
+            "status",
+            text("completed_at DESC"),
+            postgresql_include=["id"],
+        ),
+        # get_workouts and get_upcoming_workouts filter one user's date range
+        # (optionally by status) and order by date, so the range scan walks
+        # the index in order and checks status without visiting the heap
+        Index(
+            "ix_workouts_user_date_status",
+            "user_id",
+            "scheduled_date",
+            "status",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
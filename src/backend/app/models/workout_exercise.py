@@ -5,7 +5,7 @@ WorkoutExercise model for exercises within workouts
 
 import enum
 
-from sqlalchemy import Column, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Enum, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -26,6 +26,14 @@ class WorkoutExercise(Base):
     """Exercise instance within a workout with unit support"""
 
     __tablename__ = "workout_exercises"
+    __table_args__ = (
+        # Lets per-exercise history join to workouts without visiting the heap
+        Index(
+            "ix_workout_exercises_exercise_workout",
+            "exercise_id",
+            postgresql_include=["workout_id"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False)
@@ -3,11 +3,12 @@ Data Service for converting database data to ML-ready vectors
 """
 
 import logging
-from typing import Any
+from typing import Any, Optional
 
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
-from app.models import Exercise, User, Workout, WorkoutExercise
+from app.models import Exercise, User, Workout, WorkoutExercise, WorkoutStatus
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +42,8 @@ class DataService:
 
     def get_exercises_data(self) -> list[dict[str, Any]]:
         """Extract exercise data for ML models"""
-        exercises = self.db.query(Exercise).all()
+        # Ordered by id, the column order of every interaction vector
+        exercises = self.db.query(Exercise).order_by(Exercise.id).all()
 
         exercises_data = []
         for exercise in exercises:
@@ -68,7 +70,7 @@ class DataService:
         workout_exercises = (
             self.db.query(WorkoutExercise, Workout)
             .join(Workout)
-            .filter(Workout.status == "completed")
+            .filter(Workout.status == WorkoutStatus.COMPLETED)
             .all()
         )
 
@@ -91,36 +93,48 @@ class DataService:
 
         return interactions
 
-    def get_user_interaction_vector(self, user_id: int) -> list[float]:
-        """Get interaction vector for a specific user"""
-        # Get all exercises
-        exercises = self.db.query(Exercise).all()
-        exercise_ids = [ex.id for ex in exercises]
-
-        # Get user's interactions
-        user_interactions = (
-            self.db.query(WorkoutExercise, Workout)
-            .join(Workout)
-            .filter(Workout.user_id == user_id, Workout.status == "completed")
+    def get_user_interaction_vector(self, user_id: int) -> Optional[list[float]]:
+        """Get interaction vector for a specific user, None if the user is unknown"""
+        # Outer join from the user so an existing user without completed
+        # workouts still yields one row (with a NULL exercise id)
+        user_exercise_ids = (
+            self.db.query(WorkoutExercise.exercise_id)
+            .select_from(User)
+            .outerjoin(
+                Workout,
+                and_(
+                    Workout.user_id == User.id,
+                    Workout.status == WorkoutStatus.COMPLETED,
+                ),
+            )
+            .outerjoin(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)
+            .filter(User.id == user_id)
             .all()
         )
+        if not user_exercise_ids:
+            return None
+
+        # Get all exercises, in the same order as get_exercises_data
+        exercise_ids = [
+            eid for (eid,) in self.db.query(Exercise.id).order_by(Exercise.id)
+        ]
 
         # Create interaction vector
         interaction_vector = [0.0] * len(exercise_ids)
         exercise_id_to_idx = {eid: idx for idx, eid in enumerate(exercise_ids)}
 
-        for we, workout in user_interactions:
-            if we.exercise_id in exercise_id_to_idx:
-                idx = exercise_id_to_idx[we.exercise_id]
+        for (exercise_id,) in user_exercise_ids:
+            if exercise_id in exercise_id_to_idx:
+                idx = exercise_id_to_idx[exercise_id]
                 interaction_vector[idx] = 1.0  # User has done this exercise
 
         return interaction_vector
 
-    def get_user_features(self, user_id: int) -> list[float]:
-        """Get feature vector for a specific user"""
+    def get_user_features(self, user_id: int) -> Optional[list[float]]:
+        """Get feature vector for a specific user, None if the user is unknown"""
         user = self.db.query(User).filter(User.id == user_id).first()
         if not user:
-            return []
+            return None
 
         # Create feature vector
         features = []
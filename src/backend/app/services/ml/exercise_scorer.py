@@ -0,0 +1,131 @@
+"""
+In-process exercise scoring over a user x exercise interaction matrix
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _ScorerState:
+    """Everything one fit produces"""
+
+    exercise_ids: np.ndarray
+    interactions: np.ndarray  # (n_users, n_exercises)
+    embeddings: np.ndarray  # L2-normalized rows
+    user_index: dict[int, int]
+    version: Optional[str]
+
+
+class ExerciseScorer:
+    """User-based collaborative filtering scored with cosine similarity
+
+    Fitted from the same data sent to the ML service for training. Each user's
+    interaction row is L2-normalized once at fit time, so scoring a request is
+    one matrix-vector product against the query user's interaction vector.
+    """
+
+    def __init__(self):
+        # Replaced as a whole by fit, so a concurrent recommend never sees
+        # arrays from two different fits
+        self._state: Optional[_ScorerState] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._state is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        """ML model version the scorer was fitted against, if known"""
+        return self._state.version if self._state is not None else None
+
+    def fit(
+        self,
+        interactions_data: list[dict[str, Any]],
+        exercise_ids: list[int],
+        version: Optional[str] = None,
+    ) -> None:
+        """Build the interaction matrix from (user_id, exercise_id) interactions"""
+        exercise_index = {eid: idx for idx, eid in enumerate(exercise_ids)}
+        user_ids = sorted({row["user_id"] for row in interactions_data})
+        user_index = {uid: idx for idx, uid in enumerate(user_ids)}
+
+        interactions = np.zeros((len(user_ids), len(exercise_ids)), dtype=np.float32)
+        for row in interactions_data:
+            col = exercise_index.get(row["exercise_id"])
+            if col is not None:
+                interactions[user_index[row["user_id"]], col] = 1.0
+
+        norms = np.linalg.norm(interactions, axis=1, keepdims=True)
+        embeddings = np.divide(
+            interactions, norms, out=np.zeros_like(interactions), where=norms > 0
+        )
+
+        self._state = _ScorerState(
+            exercise_ids=np.asarray(exercise_ids, dtype=np.int64),
+            interactions=interactions,
+            embeddings=embeddings,
+            user_index=user_index,
+            version=version,
+        )
+        logger.info(
+            f"Fitted exercise scorer on {len(user_ids)} users x "
+            f"{len(exercise_ids)} exercises"
+        )
+
+    def recommend(
+        self,
+        user_interactions: list[float],
+        n_recommendations: int,
+        user_id: Optional[int] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        """Top exercises the user has not done yet, weighted by similar users
+
+        Returns None when the scorer cannot answer (not fitted, exercise
+        catalog changed since fitting, or a user with no history) so the
+        caller can fall back to the ML service.
+        """
+        state = self._state
+        if state is None or n_recommendations <= 0:
+            return None
+
+        query = np.asarray(user_interactions, dtype=np.float32)
+        if query.shape != (state.exercise_ids.shape[0],):
+            return None
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+
+        similarities = state.embeddings @ (query / norm)
+        own_row = state.user_index.get(user_id)
+        if own_row is not None:
+            similarities[own_row] = 0.0
+        total_similarity = similarities.sum()
+        if total_similarity <= 0:
+            return None
+
+        scores = (similarities @ state.interactions) / total_similarity
+        scores[query > 0] = -np.inf
+
+        n = min(n_recommendations, int(np.count_nonzero(np.isfinite(scores))))
+        if n == 0:
+            return []
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "exercise_id": int(state.exercise_ids[idx]),
+                "predicted_rating": float(scores[idx]),
+            }
+            for idx in top
+        ]
+
+
+# Global in-process scorer, refitted whenever the ML model version changes
+exercise_scorer = ExerciseScorer()
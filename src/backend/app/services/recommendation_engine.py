@@ -9,7 +9,7 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 
-from app.models import Exercise, User, Workout
+from app.models import Exercise, User, Workout, WorkoutStatus
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +59,10 @@ class RecommendationEngine:
         """Get basic user statistics"""
         total_workouts = (
             self.db.query(Workout)
-            .filter(Workout.user_id == self.user.id, Workout.status == "completed")
+            .filter(
+                Workout.user_id == self.user.id,
+                Workout.status == WorkoutStatus.COMPLETED,
+            )
             .count()
         )
 
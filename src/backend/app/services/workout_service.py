@@ -13,7 +13,14 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import SessionLocal
-from app.models import Exercise, User, UserStats, Workout, WorkoutExercise
+from app.models import (
+    Exercise,
+    User,
+    UserStats,
+    Workout,
+    WorkoutExercise,
+    WorkoutStatus,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,7 +90,15 @@ class WorkoutService:
         )
 
         if not stats:
-            stats = UserStats(user_id=user.id, date=datetime.utcnow())
+            # Column defaults only apply on flush, so start the totals here
+            stats = UserStats(
+                user_id=user.id,
+                date=datetime.utcnow(),
+                total_workouts=0,
+                total_weight_lifted=0,
+                total_cardio_distance=0,
+                total_calories_burned=0,
+            )
             self.db.add(stats)
 
         # Update stats
@@ -135,7 +150,9 @@ class WorkoutService:
             .all()
         )
 
-        completed_workouts = [w for w in workouts if w.status == "completed"]
+        completed_workouts = [
+            w for w in workouts if w.status == WorkoutStatus.COMPLETED
+        ]
 
         # Calculate stats
         total_duration = sum(w.total_duration or 0 for w in completed_workouts)
@@ -218,7 +235,7 @@ def import_exercise_database():
                     name=row.get("name", ""),
                     description=row.get("description", ""),
                     primary_muscle=row.get("primary_muscle", "full_body"),
-                    secondary_muscles=row.get("secondary_muscles", ""),
+                    secondary_muscles_list=row.get("secondary_muscles", ""),
                     equipment=row.get("equipment", "none"),
                     exercise_type=row.get("exercise_type", "strength"),
                     difficulty=int(row.get("difficulty", 3)),
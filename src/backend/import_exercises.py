@@ -4,7 +4,6 @@ Script to import exercises from exercise_table_ext.csv into the database
 """
 
 import csv
-import json
 import logging
 import sys
 from pathlib import Path
@@ -340,7 +339,7 @@ def import_exercises():
                         name=row.get("Exercise Name", "").strip(),
                         description=row.get("Short Description", "").strip(),
                         primary_muscle=primary_muscle,
-                        secondary_muscles=json.dumps(secondary_muscles),
+                        secondary_muscles=secondary_muscles,
                         equipment=equipment,
                         exercise_type=exercise_type,
                         difficulty=difficulty,
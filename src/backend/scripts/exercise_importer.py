@@ -7,7 +7,6 @@ with proper mapping and validation.
 """
 
 import csv
-import json
 import logging
 import sys
 from contextlib import contextmanager
@@ -278,7 +277,7 @@ class ExerciseImporter:
                 name=row.get("Exercise Name", "").strip(),
                 description=row.get("Short Description", "").strip(),
                 primary_muscle=primary_muscle,
-                secondary_muscles=json.dumps(secondary_muscles),
+                secondary_muscles=secondary_muscles,
                 equipment=equipment,
                 exercise_type=exercise_type,
                 difficulty=difficulty,
@@ -2,7 +2,6 @@
 Pytest configuration and fixtures for backend tests
 """
 
-import json
 import os
 import sys
 from datetime import datetime, timedelta
@@ -123,7 +122,7 @@ def db_session(test_db):
             name="Push-ups",
             description="Classic bodyweight exercise for chest",
             primary_muscle=MuscleGroup.CHEST,
-            secondary_muscles=json.dumps(["Triceps", "Shoulders"]),
+            secondary_muscles=["Triceps", "Shoulders"],
             equipment=Equipment.BODYWEIGHT,
             exercise_type=ExerciseType.STRENGTH,
             difficulty=1,
@@ -138,7 +137,7 @@ def db_session(test_db):
             name="Squats",
             description="Lower body strength exercise",
             primary_muscle=MuscleGroup.LEGS,
-            secondary_muscles=json.dumps(["Glutes", "Core"]),
+            secondary_muscles=["Glutes", "Core"],
             equipment=Equipment.BODYWEIGHT,
             exercise_type=ExerciseType.STRENGTH,
             difficulty=1,
@@ -153,7 +152,7 @@ def db_session(test_db):
             name="Pull-ups",
             description="Upper body pulling exercise",
             primary_muscle=MuscleGroup.BACK,
-            secondary_muscles=json.dumps(["Biceps", "Shoulders"]),
+            secondary_muscles=["Biceps", "Shoulders"],
             equipment=Equipment.BODYWEIGHT,
             exercise_type=ExerciseType.STRENGTH,
             difficulty=3,
@@ -168,7 +167,7 @@ def db_session(test_db):
             name="Running",
             description="Cardiovascular exercise",
             primary_muscle=MuscleGroup.LEGS,
-            secondary_muscles=json.dumps(["Core"]),
+            secondary_muscles=["Core"],
             equipment=Equipment.NONE,
             exercise_type=ExerciseType.CARDIO,
             difficulty=2,
@@ -183,7 +182,7 @@ def db_session(test_db):
             name="Bench Press",
             description="Compound chest exercise",
             primary_muscle=MuscleGroup.CHEST,
-            secondary_muscles=json.dumps(["Triceps", "Shoulders"]),
+            secondary_muscles=["Triceps", "Shoulders"],
             equipment=Equipment.BARBELL,
             exercise_type=ExerciseType.STRENGTH,
             difficulty=2,
@@ -217,6 +216,82 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+class InMemoryRedis:
+    """The slice of the redis client API the response caches use
+
+    Each test gets its own instance, so cached responses never leak between
+    tests and the configured REDIS_URL is never touched. Expiry is recorded
+    in ttls but never enforced: no test outlives a TTL.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    @staticmethod
+    def _encode(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = self._encode(value)
+        self.ttls[key] = ex
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(self._encode(field))
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[self._encode(field)] = self._encode(value)
+        return 1
+
+    def expire(self, key, seconds):
+        if key not in self.data:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def pipeline(self):
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    """Buffers commands and runs them against InMemoryRedis on execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        return lambda *args, **kwargs: self.commands.append((method, args, kwargs))
+
+    def execute(self):
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    """Serve the Redis-backed response caches from a per-test in-memory store"""
+    client = InMemoryRedis()
+    for module in ("app.database", "app.api.social", "app.api.workouts"):
+        monkeypatch.setattr(f"{module}.redis_client", client)
+    return client
+
+
 @pytest.fixture
 def test_user_data():
     """Sample user data for testing"""
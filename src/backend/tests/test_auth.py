@@ -3,6 +3,7 @@ Unit tests for authentication endpoints
 """
 
 from fastapi import status
+from jose import jwt
 
 
 def test_register_user_success(client, test_user_data):
@@ -109,3 +110,50 @@ def test_get_current_user_no_token(client):
     response = client.get("/api/v1/auth/me")
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_update_user_profile(client, test_user_data):
+    """Test updating the current user's profile"""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    login_data = {
+        "username": test_user_data["username"],
+        "password": test_user_data["password"],
+    }
+    login_response = client.post("/api/v1/auth/login", data=login_data)
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = client.put(
+        "/api/v1/users/profile",
+        json={"full_name": "New Name", "fitness_goal": "muscle_gain"},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["full_name"] == "New Name"
+    assert data["fitness_goal"] == "muscle_gain"
+
+    response = client.get("/api/v1/users/profile", headers=headers)
+    assert response.json()["full_name"] == "New Name"
+
+    response = client.put(
+        "/api/v1/users/profile", json={"fitness_goal": "unknown"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_login_token_authenticates_by_user_id(client, test_user_data):
+    """Test that login tokens carry the user id for id-only endpoints"""
+    client.post("/api/v1/auth/register", json=test_user_data)
+    login_data = {
+        "username": test_user_data["username"],
+        "password": test_user_data["password"],
+    }
+    token = client.post("/api/v1/auth/login", data=login_data).json()["access_token"]
+    assert jwt.get_unverified_claims(token)["uid"] == 1
+
+    response = client.get(
+        "/api/v1/social/friends", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
@@ -29,3 +29,13 @@ def test_environment_switch(monkeypatch):
     monkeypatch.setenv("ENVIRONMENT", "development")
     config = ConfigurationManager()
     assert config.get_environment().value == "development"
+
+
+def test_settings_are_a_frozen_singleton():
+    from pydantic import ValidationError
+
+    from app.config import get_settings, settings
+
+    assert get_settings() is settings
+    with pytest.raises(ValidationError):
+        settings.DEBUG = True
@@ -0,0 +1,78 @@
+"""
+Unit tests for the in-process exercise scorer
+"""
+
+from app.api import recommendations
+from app.services.ml.exercise_scorer import ExerciseScorer
+
+
+def _interactions(pairs):
+    return [
+        {"user_id": user_id, "exercise_id": exercise_id}
+        for user_id, exercise_id in pairs
+    ]
+
+
+def test_recommend_before_fit_returns_none():
+    """An unfitted scorer defers to the ML service"""
+    scorer = ExerciseScorer()
+
+    assert scorer.recommend([1.0, 0.0], 5) is None
+
+
+def test_recommend_ranks_exercises_done_by_similar_users():
+    """Exercises done by the most similar users rank first; done ones are skipped"""
+    scorer = ExerciseScorer()
+    scorer.fit(
+        _interactions(
+            [
+                (1, 10),
+                (1, 20),
+                (2, 10),
+                (2, 20),
+                (2, 30),
+                (3, 40),
+            ]
+        ),
+        exercise_ids=[10, 20, 30, 40],
+    )
+
+    # User 1 has done 10 and 20; user 2 overlaps, user 3 does not
+    recommendations = scorer.recommend([1.0, 1.0, 0.0, 0.0], 5, user_id=1)
+
+    assert [rec["exercise_id"] for rec in recommendations] == [30, 40]
+    assert (
+        recommendations[0]["predicted_rating"] > recommendations[1]["predicted_rating"]
+    )
+
+
+def test_recommend_falls_back_when_catalog_changed():
+    """A vector from a different exercise catalog cannot be scored"""
+    scorer = ExerciseScorer()
+    scorer.fit(_interactions([(1, 10)]), exercise_ids=[10, 20])
+
+    assert scorer.recommend([1.0, 0.0, 0.0], 5) is None
+    assert scorer.recommend([0.0, 0.0], 5) is None
+
+
+def test_fit_records_model_version():
+    """Each fit replaces the scorer state, including its model version"""
+    scorer = ExerciseScorer()
+    scorer.fit(_interactions([(1, 10), (2, 20)]), exercise_ids=[10, 20], version="v1")
+    assert scorer.version == "v1"
+
+    scorer.fit(_interactions([(1, 10)]), exercise_ids=[10, 20, 30], version="v2")
+    assert scorer.version == "v2"
+    assert scorer.recommend([1.0, 0.0], 5) is None
+
+
+def test_stale_scorer_refits_on_new_model_version(db_session, monkeypatch):
+    """A worker refits its scorer once the ML models move to a new version"""
+    scorer = ExerciseScorer()
+    scorer.fit([], exercise_ids=[], version="v1")
+    monkeypatch.setattr(recommendations, "exercise_scorer", scorer)
+    monkeypatch.setattr(recommendations, "_similarity_model_version", lambda: "v2")
+
+    recommendations._refit_exercise_scorer_if_stale(db_session)
+
+    assert scorer.version == "v2"
@@ -6,6 +6,8 @@ import uuid
 
 from fastapi import status
 
+from app.models.exercise import Exercise
+
 
 def test_get_exercises(client):
     """Test getting all exercises (public endpoint)"""
@@ -39,6 +41,30 @@ def test_get_exercises_with_filters(client):
         assert exercise["equipment"] == "Bodyweight"
 
 
+def test_search_exercises_by_substring(client):
+    """Test that search matches partial words (public endpoint)"""
+    name = client.get("/api/v1/exercises").json()[0]["name"]
+
+    response = client.get("/api/v1/exercises", params={"search": name[:3].lower()})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert name in [exercise["name"] for exercise in response.json()]
+
+
+def test_secondary_muscles_from_csv_text():
+    """CSV importer text is split into a list, as the jsonb migration does"""
+    exercise = Exercise()
+
+    exercise.secondary_muscles_list = "Triceps, Shoulders"
+    assert exercise.secondary_muscles == ["Triceps", "Shoulders"]
+
+    exercise.secondary_muscles_list = '["Core"]'
+    assert exercise.secondary_muscles == ["Core"]
+
+    exercise.secondary_muscles_list = " "
+    assert exercise.secondary_muscles_list == []
+
+
 def test_get_exercise_by_id(client):
     """Test getting exercise by ID (public endpoint)"""
     # First get all exercises to get an ID
@@ -153,3 +179,56 @@ def test_delete_exercise_authenticated(client, test_user_data, test_exercise_dat
     # Verify exercise is deleted
     get_response = client.get(f"/api/v1/exercises/{exercise_id}")
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_exercise_history_personal_records(client, db_session):
+    """Test personal records computed from per-set weights and reps"""
+    from datetime import datetime, timedelta
+
+    from app.models import Exercise, Workout, WorkoutExercise, WorkoutStatus
+    from tests.conftest import create_test_user, get_test_token
+
+    user = create_test_user(db_session, "history@example.com", "historyuser")
+    exercise = db_session.query(Exercise).filter(Exercise.name == "Push-ups").first()
+    now = datetime.utcnow()
+
+    sessions = [
+        ("60,65,70", "10,8,6", now - timedelta(days=1)),
+        (None, "12", now - timedelta(days=2)),
+        ("100", None, now - timedelta(days=3)),
+    ]
+    for actual_weight, actual_reps, completed_at in sessions:
+        workout = Workout(
+            user_id=user.id,
+            name="Push day",
+            scheduled_date=completed_at,
+            completed_at=completed_at,
+            status=WorkoutStatus.COMPLETED,
+        )
+        db_session.add(workout)
+        db_session.flush()
+        db_session.add(
+            WorkoutExercise(
+                workout_id=workout.id,
+                exercise_id=exercise.id,
+                order=1,
+                sets=3,
+                actual_weight=actual_weight,
+                actual_reps=actual_reps,
+            )
+        )
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+    response = client.get(f"/api/v1/exercises/{exercise.id}/history", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_sessions"] == 3
+    assert data["personal_records"] == {
+        "max_weight": 100.0,
+        "max_reps": 12,
+        # Only the first session has both reps and weights: 24 reps at 65 avg
+        "total_volume": 1560.0,
+    }
+    assert [entry["weight"] for entry in data["history"]] == ["60,65,70", None, "100"]
@@ -0,0 +1,25 @@
+"""
+Unit tests for recommendation endpoints
+"""
+
+from fastapi import status
+
+from app.api import recommendations
+
+
+def test_exercise_recommendations_unknown_user(client):
+    """An unknown user is a 404, not a wrapped 500"""
+    response = client.get("/api/v1/recommendations/exercises/9999")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "User not found"
+
+
+def test_similar_users_unknown_user(client, monkeypatch):
+    """An unknown user is a 404, not a wrapped 500"""
+    monkeypatch.setattr(recommendations, "_similarity_model_version", lambda: None)
+
+    response = client.get("/api/v1/recommendations/similar-users/9999")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "User not found"
@@ -14,6 +14,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.api.auth import create_access_token
 from app.main import app
 from app.models.user import User
 from app.models.friendship import Friendship
@@ -58,6 +59,25 @@ class TestFriendInvitationSystem:
         assert data["status"] == "pending"
         assert data["invitation_type"] == "email"
 
+    def test_friend_invitation_delivered_in_background(
+        self, client: TestClient, db_session: Session, caplog
+    ):
+        """The invitation email is sent after the response, with its code"""
+        user = create_test_user(db_session, "inviter@test.com", "inviter")
+
+        with caplog.at_level("INFO", logger="app.api.social"):
+            response = client.post(
+                "/api/v1/social/invitations/send",
+                headers={"Authorization": f"Bearer {get_test_token(user)}"},
+                json={
+                    "invitee_email": "friend@example.com",
+                    "invitation_type": "email",
+                },
+            )
+
+        assert response.status_code == 200
+        assert "Email sent to friend@example.com" in caplog.text
+
     def test_send_friend_invitation_sms(self, client: TestClient, db_session: Session):
         """Test sending friend invitation via SMS"""
         user = create_test_user(db_session, "inviter@test.com", "inviter")
@@ -107,6 +127,15 @@ class TestFriendInvitationSystem:
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "accepted"
+        friendship = db_session.query(Friendship).one()
+        assert (friendship.user_id, friendship.friend_id) == (user1.id, user2.id)
+
+        # The code cannot be used twice
+        response = client.post(
+            f"/api/v1/social/invitations/accept/{invitation_code}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 404
 
     def test_get_invitation_status(self, client: TestClient, db_session: Session):
         """Test getting invitation status dashboard"""
@@ -145,6 +174,63 @@ class TestFriendInvitationSystem:
         assert "existing_users" in data
         assert "new_invitations" in data
 
+    def test_send_friend_request_returns_created_row(
+        self, client: TestClient, db_session: Session
+    ):
+        """A friend request returns its id; a reverse duplicate is rejected"""
+        sender = create_test_user(db_session, "sender@test.com", "sender")
+        receiver = create_test_user(db_session, "receiver@test.com", "receiver")
+
+        response = client.post(
+            "/api/v1/social/friends/request/receiver",
+            headers={"Authorization": f"Bearer {get_test_token(sender)}"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        friendship = db_session.query(Friendship).one()
+        assert data["friendship_id"] == friendship.id
+        assert data["created_at"] is not None
+
+        response = client.post(
+            "/api/v1/social/friends/request/sender",
+            headers={"Authorization": f"Bearer {get_test_token(receiver)}"},
+        )
+        assert response.status_code == 400
+
+    def test_friend_suggestions_count_mutual_friends(
+        self, client: TestClient, db_session: Session
+    ):
+        """Friends of friends are suggested, ranked by mutual friend count"""
+        me = create_test_user(db_session, "me@test.com", "me")
+        friend1 = create_test_user(db_session, "friend1@test.com", "friend1")
+        friend2 = create_test_user(db_session, "friend2@test.com", "friend2")
+        both = create_test_user(db_session, "both@test.com", "both")
+        one = create_test_user(db_session, "one@test.com", "one")
+        for user_id, friend_id in [
+            (me.id, friend1.id),
+            (friend2.id, me.id),
+            (friend1.id, both.id),
+            (both.id, friend2.id),
+            (friend2.id, one.id),
+            (friend1.id, friend2.id),
+        ]:
+            db_session.add(
+                Friendship(user_id=user_id, friend_id=friend_id, status="accepted")
+            )
+        db_session.commit()
+
+        response = client.get(
+            "/api/v1/social/friends/suggestions",
+            headers={"Authorization": f"Bearer {get_test_token(me)}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": both.id, "username": "both", "mutual_friends": 2},
+            {"id": one.id, "username": "one", "mutual_friends": 1},
+        ]
+
 
 class TestCommunityManagement:
     """Test community management features"""
@@ -309,6 +395,110 @@ class TestSafetyAndModeration:
         data = response.json()
         assert "message" in data
 
+        response = client.post(
+            "/api/v1/safety/block",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"blocked_user_id": user2.id},
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "User already blocked"
+        assert db_session.query(UserBlock).count() == 1
+
+        response = client.post(
+            "/api/v1/safety/block",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"blocked_user_id": 9999},
+        )
+        assert response.status_code == 404
+
+    def test_social_block_user(self, client: TestClient, db_session: Session):
+        """Test blocking through the social API and the resulting safety status"""
+        user1 = create_test_user(db_session, "user1@test.com", "user1")
+        user2 = create_test_user(db_session, "user2@test.com", "user2")
+        headers = {"Authorization": f"Bearer {get_test_token(user1)}"}
+
+        response = client.get("/api/v1/social/safety/status", headers=headers)
+        assert response.json()["blocked_users"] == []
+        assert response.json()["reports_made"] == 0
+
+        response = client.post(
+            "/api/v1/social/safety/block",
+            headers=headers,
+            json={"blocked_user_id": user2.id},
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "User blocked successfully"
+
+        response = client.post(
+            "/api/v1/social/safety/block",
+            headers=headers,
+            json={"blocked_user_id": user2.id},
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "User already blocked"
+        assert db_session.query(UserBlock).count() == 1
+
+        response = client.get("/api/v1/social/safety/status", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [blocked["user_id"] for blocked in data["blocked_users"]] == [user2.id]
+        assert data["reports_made"] == 0
+
+        response = client.post(
+            "/api/v1/social/safety/block",
+            headers=headers,
+            json={"blocked_user_id": 9999},
+        )
+        assert response.status_code == 404
+
+    def test_deleted_user_token_cannot_write(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test that a token for a deleted user is rejected by write endpoints"""
+        user = create_test_user(db_session, "gone@test.com", "gone")
+        other = create_test_user(db_session, "other@test.com", "other")
+        token = create_access_token({"sub": user.username, "uid": user.id})
+        db_session.delete(user)
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for path, payload in [
+            ("/api/v1/safety/block", {"blocked_user_id": other.id}),
+            ("/api/v1/social/safety/block", {"blocked_user_id": other.id}),
+            (
+                "/api/v1/social/invitations/send",
+                {"invitation_type": "email", "invitee_email": "x@test.com"},
+            ),
+            ("/api/v1/social/invitations/accept/some-code", None),
+        ]:
+            response = client.post(path, headers=headers, json=payload)
+            assert response.status_code == 401, path
+        assert db_session.query(UserBlock).count() == 0
+
+    def test_deleted_user_token_cannot_read(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test that id-only routes reject a token for a deleted user"""
+        user = create_test_user(db_session, "gone@test.com", "gone")
+        headers = {
+            "Authorization": "Bearer "
+            + create_access_token({"sub": user.username, "uid": user.id})
+        }
+
+        response = client.get("/api/v1/safety/status", headers=headers)
+        assert response.status_code == 200
+
+        db_session.delete(user)
+        db_session.commit()
+
+        for path in [
+            "/api/v1/safety/status",
+            "/api/v1/social/safety/status",
+            "/api/v1/privacy/controls",
+        ]:
+            response = client.get(path, headers=headers)
+            assert response.status_code == 401, path
+
     def test_report_content(self, client: TestClient, db_session: Session):
         """Test reporting content"""
         user = create_test_user(db_session, "reporter@test.com", "reporter")
@@ -617,6 +807,37 @@ class TestIntegrationScenarios:
         assert "communities" in data
         assert "friends_suggestions" in data
 
+    def test_onboarding_recommendations_revalidate_with_etag(
+        self, client: TestClient, db_session: Session
+    ):
+        """Onboarding recommendations answer 304 for a matching ETag"""
+        user = create_test_user(db_session, "etag@test.com", "etaguser")
+        headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+
+        response = client.get("/api/v1/recommendations/onboarding", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = client.get(
+            "/api/v1/recommendations/onboarding",
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_user_test_data_is_cacheable(self, client: TestClient):
+        """Sample user data is publicly cacheable and revalidates by ETag"""
+        response = client.get("/api/v1/users/test/profile")
+        assert response.status_code == 200
+        assert response.json()["username"] == "testuser"
+        assert response.headers["cache-control"] == "public, max-age=3600"
+
+        response = client.get(
+            "/api/v1/users/test/profile",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
     def test_friend_invitation_workflow(self, client: TestClient, db_session: Session):
         """Test complete friend invitation workflow"""
         # Create two users
@@ -0,0 +1,276 @@
+"""
+Unit tests for workout endpoints
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import status
+
+from app.models import (
+    Equipment,
+    Exercise,
+    ExerciseType,
+    MuscleGroup,
+    Workout,
+    WorkoutExercise,
+    WorkoutStatus,
+)
+from app.services.data_service import DataService
+from tests.conftest import create_test_user, get_test_token
+
+
+def create_workout(db_session, user, scheduled_date, **kwargs):
+    """Create a workout with one bench press exercise"""
+    exercise = db_session.query(Exercise).filter(Exercise.name == "Bench Press").first()
+    if exercise is None:
+        exercise = Exercise(
+            name="Bench Press",
+            primary_muscle=MuscleGroup.CHEST,
+            equipment=Equipment.BARBELL,
+            exercise_type=ExerciseType.STRENGTH,
+            difficulty=3,
+        )
+        db_session.add(exercise)
+        db_session.flush()
+
+    workout = Workout(
+        user_id=user.id,
+        name="Upper Body",
+        scheduled_date=scheduled_date,
+        status=kwargs.pop("status", WorkoutStatus.PLANNED),
+        **kwargs,
+    )
+    db_session.add(workout)
+    db_session.flush()
+    db_session.add(
+        WorkoutExercise(
+            workout_id=workout.id,
+            exercise_id=exercise.id,
+            order=1,
+            sets=3,
+            reps="10",
+            weight="60",
+        )
+    )
+    db_session.commit()
+    return workout
+
+
+def test_get_workouts(client, db_session):
+    """Test listing workouts with their exercises"""
+    user = create_test_user(db_session, "lifter@example.com", "lifter")
+    workout = create_workout(db_session, user, datetime.utcnow())
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+
+    response = client.get("/api/v1/workouts/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [w["id"] for w in data] == [workout.id]
+    assert data[0]["status"] == "planned"
+    exercise = data[0]["exercises"][0]
+    assert exercise["weight_unit"] == "KG"
+    assert exercise["exercise"]["name"] == "Bench Press"
+
+
+def test_get_workout_not_found_for_other_user(client, db_session):
+    """Test that a workout is only visible to its owner"""
+    owner = create_test_user(db_session, "owner@example.com", "owner")
+    other = create_test_user(db_session, "other@example.com", "other")
+    workout = create_workout(db_session, owner, datetime.utcnow())
+
+    response = client.get(
+        f"/api/v1/workouts/{workout.id}",
+        headers={"Authorization": f"Bearer {get_test_token(owner)}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Upper Body"
+
+    response = client.get(
+        f"/api/v1/workouts/{workout.id}",
+        headers={"Authorization": f"Bearer {get_test_token(other)}"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_upcoming_workouts(client, db_session):
+    """Test that only planned workouts in the window are upcoming"""
+    user = create_test_user(db_session, "planner@example.com", "planner")
+    now = datetime.utcnow()
+    upcoming = create_workout(db_session, user, now + timedelta(days=2))
+    create_workout(db_session, user, now + timedelta(days=20))
+    create_workout(
+        db_session, user, now + timedelta(days=1), status=WorkoutStatus.COMPLETED
+    )
+
+    response = client.get(
+        "/api/v1/workouts/upcoming",
+        headers={"Authorization": f"Bearer {get_test_token(user)}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [w["id"] for w in response.json()] == [upcoming.id]
+
+
+def test_create_start_and_complete_workout(client, db_session):
+    """Test the workout lifecycle responses"""
+    user = create_test_user(db_session, "athlete@example.com", "athlete")
+    exercise_id = (
+        create_workout(db_session, user, datetime.utcnow()).exercises[0].exercise_id
+    )
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+
+    response = client.post(
+        "/api/v1/workouts/",
+        headers=headers,
+        json={
+            "name": "Push day",
+            "scheduled_date": datetime.utcnow().isoformat(),
+            "exercises": [
+                {"exercise_id": exercise_id, "order": 1, "sets": 3, "reps": "8"},
+                {"exercise_id": exercise_id, "order": 2, "sets": 2, "reps": "12"},
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    workout = response.json()
+    assert workout["status"] == "planned"
+    assert [e["order"] for e in workout["exercises"]] == [1, 2]
+    assert workout["exercises"][0]["exercise"]["id"] == exercise_id
+
+    response = client.post(f"/api/v1/workouts/{workout['id']}/start", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "in_progress"
+    assert response.json()["started_at"] is not None
+
+    response = client.post(
+        f"/api/v1/workouts/{workout['id']}/complete", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "completed"
+
+    response = client.post(
+        f"/api/v1/workouts/{workout['id']}/complete", headers=headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_sample_workouts_are_preencoded(client):
+    """Test that the sample payloads keep their response shape"""
+    response = client.get("/api/v1/workouts/test/sample")
+    assert response.status_code == status.HTTP_200_OK
+    workouts = response.json()
+    assert workouts[0]["exercises"][0]["exercise"]["name"]
+    assert client.get("/api/v1/workouts/test/sample").content == response.content
+
+    response = client.get("/api/v1/workouts/test/upcoming")
+    assert response.status_code == status.HTTP_200_OK
+    assert all(w["status"] == "planned" for w in response.json())
+
+    response = client.get("/api/v1/workouts/test/stats")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_workouts"] == 12
+
+
+def test_update_and_delete_workout(client, db_session):
+    """Test guarded single-statement writes on a workout"""
+    user = create_test_user(db_session, "editor@example.com", "editor")
+    other = create_test_user(db_session, "intruder@example.com", "intruder")
+    workout = create_workout(db_session, user, datetime.utcnow())
+    workout_id = workout.id
+    exercise_id = workout.exercises[0].id
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+    other_headers = {"Authorization": f"Bearer {get_test_token(other)}"}
+
+    response = client.put(
+        f"/api/v1/workouts/{workout_id}/exercises/{exercise_id}",
+        headers=headers,
+        json={"actual_reps": "10,10,8", "actual_weight": "60,60,60"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.put(
+        f"/api/v1/workouts/{workout_id}/exercises/{exercise_id}",
+        headers=other_headers,
+        json={"actual_reps": "1"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Workout not found"
+
+    response = client.put(
+        f"/api/v1/workouts/{workout_id}",
+        headers=headers,
+        json={"name": "Heavy Upper", "status": "in_progress"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Heavy Upper"
+    assert response.json()["started_at"] is not None
+
+    response = client.put(
+        f"/api/v1/workouts/{workout_id}", headers=headers, json={"status": "completed"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["completed_at"] is not None
+    assert response.json()["total_volume"] == 1680
+
+    response = client.post(f"/api/v1/workouts/{workout_id}/start", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.delete(f"/api/v1/workouts/{workout_id}", headers=other_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = client.delete(f"/api/v1/workouts/{workout_id}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert db_session.query(WorkoutExercise).count() == 0
+    response = client.get(f"/api/v1/workouts/{workout_id}", headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_workouts_date_filters(client, db_session):
+    """Test that date filters include whole days at both ends"""
+    user = create_test_user(db_session, "filter@example.com", "filter")
+    late = create_workout(db_session, user, datetime(2026, 3, 10, 23, 30))
+    early = create_workout(db_session, user, datetime(2026, 3, 5, 0, 0))
+    create_workout(db_session, user, datetime(2026, 3, 11, 0, 0))
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+
+    response = client.get(
+        "/api/v1/workouts/",
+        headers=headers,
+        params={"start_date": "2026-03-05", "end_date": "2026-03-10"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [w["id"] for w in response.json()] == [late.id, early.id]
+
+
+def test_get_workout_stats_reflects_completion(client, db_session, response_cache):
+    """Test that completing a workout refreshes the cached stats"""
+    user = create_test_user(db_session, "stats@example.com", "stats")
+    workout = create_workout(db_session, user, datetime.utcnow())
+    headers = {"Authorization": f"Bearer {get_test_token(user)}"}
+
+    response = client.get("/api/v1/workouts/stats", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_workouts"] == 0
+    assert f"workout_stats:{user.id}" in response_cache.data
+
+    client.post(f"/api/v1/workouts/{workout.id}/start", headers=headers)
+    client.post(f"/api/v1/workouts/{workout.id}/complete", headers=headers)
+    assert f"workout_stats:{user.id}" not in response_cache.data
+
+    response = client.get("/api/v1/workouts/stats", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()
+    assert stats["total_workouts"] == 1
+    assert stats["completed_workouts"] == 1
+    assert stats["favorite_exercises"][0]["name"] == "Bench Press"
+
+
+def test_completed_workouts_feed_interaction_vector(db_session):
+    """Test that completed workouts count as exercise interactions"""
+    user = create_test_user(db_session, "vector@example.com", "vector")
+    create_workout(db_session, user, datetime.utcnow(), status=WorkoutStatus.COMPLETED)
+    create_workout(db_session, user, datetime.utcnow())
+    data_service = DataService(db_session)
+
+    assert sum(data_service.get_user_interaction_vector(user.id)) == 1.0
+    assert len(data_service.get_user_exercise_interactions()) == 1
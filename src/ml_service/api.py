@@ -2,6 +2,7 @@
 ML Service API - Stateless implementation
 """
 
+import uuid
 from typing import Any, Optional
 
 import numpy as np
@@ -28,6 +29,10 @@ exercise_recommender = ExerciseRecommender(
 )
 feature_processor = FeatureProcessor(config)
 
+# Changes whenever the similarity model is retrained or reloaded, so clients
+# caching its answers can tell when they went stale
+user_similarity_version: Optional[str] = None
+
 
 # Pydantic models for API
 class UserFeatures(BaseModel):
@@ -67,7 +72,9 @@ async def train_user_similarity_model(data: TrainingData):
         user_features = feature_processor.fit_user_features(data.users_data)
 
         # Train the model
+        global user_similarity_version
         user_similarity_model.fit(user_features, user_ids)
+        user_similarity_version = uuid.uuid4().hex
 
         return {"message": "User similarity model trained successfully"}
     except Exception as e:
@@ -156,6 +163,7 @@ async def get_model_status():
     return {
         "user_similarity_model": {
             "trained": user_similarity_model.is_fitted,
+            "version": user_similarity_version,
             "config": config_loader.get_model_config("user_similarity"),
         },
         "exercise_recommender": {
@@ -193,8 +201,10 @@ async def load_models():
         load_path = persistence_config.get("load_path", "/app/models")
 
         # Try to load models
+        global user_similarity_version
         try:
             user_similarity_model.load_model(f"{load_path}/user_similarity_model.pkl")
+            user_similarity_version = uuid.uuid4().hex
         except FileNotFoundError:
             pass  # Model not saved yet
 
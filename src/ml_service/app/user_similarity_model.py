@@ -13,7 +13,7 @@ import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -39,8 +39,14 @@ class UserSimilarityModel:
         self.pca = PCA(n_components=5)
         self.user_features = {}
 
-    def extract_user_features(self, user: User, db: Session) -> np.ndarray:
-        """Extract feature vector for a user using metric units"""
+    def extract_user_features(
+        self, user: User, db: Session, workout_features: list | None = None
+    ) -> np.ndarray:
+        """Extract feature vector for a user using metric units
+
+        ``workout_features`` can be passed in when the workout aggregates were
+        already loaded in bulk with :meth:`load_workout_features`.
+        """
         features = []
 
         # Basic profile features (always in metric units)
@@ -67,68 +73,68 @@ class UserSimilarityModel:
         )
 
         # Workout pattern features - using metric views for consistency
-        try:
-            # Get workout count
-            result = db.execute(
-                text(
-                    """
-                SELECT COUNT(*) as workout_count
-                FROM workouts
-                WHERE user_id = :user_id
-            """
-                ),
-                {"user_id": user.id},
-            )
-            workout_count = result.fetchone().workout_count
-            features.append(workout_count)
+        if workout_features is None:
+            workout_features = self.load_workout_features(db, [user.id])[user.id]
+        features.extend(workout_features)
 
-            # Get average workout duration (in minutes)
-            result = db.execute(
-                text(
-                    """
-                SELECT AVG(total_duration) as avg_duration
-                FROM workouts
-                WHERE user_id = :user_id AND total_duration IS NOT NULL
-            """
-                ),
-                {"user_id": user.id},
-            )
-            avg_duration = result.fetchone().avg_duration or 0
-            features.append(avg_duration)
+        return np.array(features)
+
+    def load_workout_features(
+        self, db: Session, user_ids: list[int]
+    ) -> dict[int, list[float]]:
+        """Workout pattern features for many users in two grouped queries
 
-            # Get total weight lifted (in kg from metric view)
+        Returns ``[workout_count, avg_duration, total_weight_kg,
+        total_cardio_distance_km]`` per user id, zeros for users without data.
+        """
+        workout_features = {user_id: [0, 0, 0, 0] for user_id in user_ids}
+        if not user_ids:
+            return workout_features
+
+        try:
+            # Workout count and average duration (in minutes)
             result = db.execute(
                 text(
                     """
-                SELECT COALESCE(SUM(total_weight_lifted_kg), 0) as total_weight
-                FROM user_stats_metric
-                WHERE user_id = :user_id
+                SELECT user_id,
+                       COUNT(*) AS workout_count,
+                       AVG(total_duration) AS avg_duration
+                FROM workouts
+                WHERE user_id IN :user_ids
+                GROUP BY user_id
             """
-                ),
-                {"user_id": user.id},
+                ).bindparams(bindparam("user_ids", expanding=True)),
+                {"user_ids": user_ids},
             )
-            total_weight_lifted = result.fetchone().total_weight or 0
-            features.append(total_weight_lifted)
+            for row in result:
+                features = workout_features[row.user_id]
+                features[0] = row.workout_count
+                features[1] = row.avg_duration or 0
 
-            # Get total cardio distance (in km from metric view)
+            # Total weight lifted and cardio distance (metric view)
             result = db.execute(
                 text(
                     """
-                SELECT COALESCE(SUM(total_cardio_distance_km), 0) as total_distance
+                SELECT user_id,
+                       COALESCE(SUM(total_weight_lifted_kg), 0) AS total_weight,
+                       COALESCE(SUM(total_cardio_distance_km), 0) AS total_distance
                 FROM user_stats_metric
-                WHERE user_id = :user_id
+                WHERE user_id IN :user_ids
+                GROUP BY user_id
             """
-                ),
-                {"user_id": user.id},
+                ).bindparams(bindparam("user_ids", expanding=True)),
+                {"user_ids": user_ids},
             )
-            total_cardio_distance = result.fetchone().total_distance or 0
-            features.append(total_cardio_distance)
+            for row in result:
+                features = workout_features[row.user_id]
+                features[2] = row.total_weight or 0
+                features[3] = row.total_distance or 0
 
         except Exception as e:
             logger.error(f"Error getting workout features: {e}")
-            features.extend([0, 0, 0, 0])
+            workout_features = {user_id: [0, 0, 0, 0] for user_id in user_ids}
 
-        return np.array(features)
+        return workout_features
 
     def train(self, db: Session = None):
         """Train the similarity model using metric data"""
@@ -159,6 +165,9 @@ class UserSimilarityModel:
         # Extract features for all users
         feature_matrix = []
         user_ids = []
+        workout_features = self.load_workout_features(
+            db, [user_data.id for user_data in users_data]
+        )
 
         for user_data in users_data:
             try:
@@ -178,7 +187,9 @@ class UserSimilarityModel:
                     ),  # Already in kg from metric view
                 )
 
-                features = self.extract_user_features(user, db)
+                features = self.extract_user_features(
+                    user, db, workout_features[user.id]
+                )
                 feature_matrix.append(features)
                 user_ids.append(user.id)
                 self.user_features[user.id] = features
@@ -222,6 +233,9 @@ class UserSimilarityModel:
                 )
                 other_users_data = result.fetchall()
 
+            workout_features = self.load_workout_features(
+                db, [other_user_data.id for other_user_data in other_users_data]
+            )
             similarities = []
 
             for other_user_data in other_users_data:
@@ -242,7 +256,9 @@ class UserSimilarityModel:
                         ),  # Already in kg from metric view
                     )
 
-                    other_features = self.extract_user_features(other_user, db)
+                    other_features = self.extract_user_features(
+                        other_user, db, workout_features[other_user.id]
+                    )
                     other_features_scaled = self.scaler.transform([other_features])
 
                     # Calculate cosine similarity
@@ -7,7 +7,6 @@ from typing import Any
 
 import joblib
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
 
 
@@ -20,6 +19,7 @@ class UserSimilarityModel:
         self.config = config
         self.scaler = StandardScaler()
         self.user_features = None
+        self.user_embeddings = None  # L2-normalized rows of user_features
         self.user_ids = None
         self.is_fitted = False
 
@@ -32,9 +32,18 @@ class UserSimilarityModel:
             user_ids: List of user IDs corresponding to features
         """
         self.user_features = self.scaler.fit_transform(user_features)
+        self.user_embeddings = self._normalize_rows(self.user_features)
         self.user_ids = user_ids
         self.is_fitted = True
 
+    @staticmethod
+    def _normalize_rows(features: np.ndarray) -> np.ndarray:
+        """L2-normalize each row so cosine similarity is a dot product"""
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return np.divide(
+            features, norms, out=np.zeros_like(features, dtype=float), where=norms > 0
+        )
+
     def find_similar_users(
         self, user_features: np.ndarray, user_id: int, n_recommendations: int = None
     ) -> list[tuple[int, float]]:
@@ -58,23 +67,21 @@ class UserSimilarityModel:
         # Scale the input features
         user_features_scaled = self.scaler.transform(user_features.reshape(1, -1))
 
-        # Calculate similarities
-        similarities = cosine_similarity(user_features_scaled, self.user_features)[0]
-
-        # Create pairs of (user_id, similarity)
-        user_similarities = list(zip(self.user_ids, similarities))
+        # Calculate similarities against the normalized user rows
+        similarities = (
+            self.user_embeddings @ self._normalize_rows(user_features_scaled)[0]
+        )
 
         # Filter out the user themselves and below threshold
         threshold = self.config.get("min_similarity_threshold", 0.3)
-        filtered_similarities = [
-            (uid, sim)
-            for uid, sim in user_similarities
-            if uid != user_id and sim >= threshold
-        ]
+        user_ids = np.asarray(self.user_ids)
+        candidates = np.flatnonzero((similarities >= threshold) & (user_ids != user_id))
 
         # Sort by similarity and return top N
-        filtered_similarities.sort(key=lambda x: x[1], reverse=True)
-        return filtered_similarities[:n_recommendations]
+        top = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        return [
+            (user_ids[idx].item(), similarities[idx]) for idx in top[:n_recommendations]
+        ]
 
     def get_user_similarity_matrix(self) -> np.ndarray:
         """
@@ -86,7 +93,7 @@ class UserSimilarityModel:
         if not self.is_fitted:
             raise ValueError("Model must be fitted before getting similarity matrix")
 
-        return cosine_similarity(self.user_features)
+        return self.user_embeddings @ self.user_embeddings.T
 
     def save_model(self, filepath: str) -> None:
         """Save the fitted model"""
@@ -109,6 +116,7 @@ class UserSimilarityModel:
         model_data = joblib.load(filepath)
         self.scaler = model_data["scaler"]
         self.user_features = model_data["user_features"]
+        self.user_embeddings = self._normalize_rows(self.user_features)
         self.user_ids = model_data["user_ids"]
         self.config = model_data["config"]
         self.is_fitted = True